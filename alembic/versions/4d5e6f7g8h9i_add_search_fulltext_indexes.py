@@ -0,0 +1,40 @@
+"""add FULLTEXT indexes for public search
+
+Revision ID: 4d5e6f7g8h9i
+Revises: 3c4d5e6f7g8h
+Create Date: 2026-10-17 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d5e6f7g8h9i'
+down_revision = '3c4d5e6f7g8h'
+branch_labels = None
+depends_on = None
+
+
+# Must match SearchEntity.fields in app/services/search/documents.py
+FULLTEXT_INDEXES = {
+    'ft_colleges_search': ('colleges', ['name', 'short_description']),
+    'ft_pages_search': ('pages', ['title']),
+    'ft_courses_search': ('courses', ['name', 'department', 'overview']),
+    'ft_faculty_search': ('faculty', ['name', 'designation']),
+}
+
+
+def upgrade() -> None:
+    # FULLTEXT is MySQL-only; other databases use the in-process search backend.
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, (table, columns) in FULLTEXT_INDEXES.items():
+        op.create_index(name, table, columns, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, (table, _) in FULLTEXT_INDEXES.items():
+        op.drop_index(name, table_name=table)
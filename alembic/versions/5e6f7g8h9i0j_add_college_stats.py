@@ -0,0 +1,66 @@
+"""add college_stats summary table
+
+Revision ID: 5e6f7g8h9i0j
+Revises: 4d5e6f7g8h9i
+Create Date: 2026-10-17 11:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e6f7g8h9i0j'
+down_revision = '4d5e6f7g8h9i'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'college_stats',
+        sa.Column('college_id', sa.Integer(), sa.ForeignKey('colleges.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('pages_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('courses_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_courses_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('faculty_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_faculty_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('facilities_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('activities_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latest_placement_year', sa.Integer(), nullable=True),
+        sa.Column('latest_highest_package', sa.Float(), nullable=True),
+        sa.Column('latest_average_package', sa.Float(), nullable=True),
+        sa.Column('latest_placement_percentage', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+    # Backfill; afterwards the table is maintained by app.services.college_stats.
+    op.execute(
+        """
+        INSERT INTO college_stats (
+            college_id, pages_count, courses_count, active_courses_count,
+            faculty_count, active_faculty_count, facilities_count, activities_count,
+            latest_placement_year, latest_highest_package, latest_average_package,
+            latest_placement_percentage, updated_at
+        )
+        SELECT
+            c.id,
+            (SELECT COUNT(*) FROM pages p WHERE p.college_id = c.id),
+            (SELECT COUNT(*) FROM courses co WHERE co.college_id = c.id),
+            (SELECT COUNT(*) FROM courses co WHERE co.college_id = c.id AND co.is_active = 1),
+            (SELECT COUNT(*) FROM faculty f WHERE f.college_id = c.id),
+            (SELECT COUNT(*) FROM faculty f WHERE f.college_id = c.id AND f.is_active = 1),
+            (SELECT COUNT(*) FROM facilities fa WHERE fa.college_id = c.id),
+            (SELECT COUNT(*) FROM activities a WHERE a.college_id = c.id),
+            (SELECT pl.year FROM placements pl WHERE pl.college_id = c.id ORDER BY pl.year DESC, pl.id DESC LIMIT 1),
+            (SELECT pl.highest_package FROM placements pl WHERE pl.college_id = c.id ORDER BY pl.year DESC, pl.id DESC LIMIT 1),
+            (SELECT pl.average_package FROM placements pl WHERE pl.college_id = c.id ORDER BY pl.year DESC, pl.id DESC LIMIT 1),
+            (SELECT pl.placement_percentage FROM placements pl WHERE pl.college_id = c.id ORDER BY pl.year DESC, pl.id DESC LIMIT 1),
+            CURRENT_TIMESTAMP
+        FROM colleges c
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('college_stats')
@@ -0,0 +1,57 @@
+"""add materialized path columns to colleges and pages
+
+Revision ID: 6f7g8h9i0j1k
+Revises: 5e6f7g8h9i0j
+Create Date: 2026-10-17 13:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f7g8h9i0j1k'
+down_revision = '5e6f7g8h9i0j'
+branch_labels = None
+depends_on = None
+
+
+def _backfill(bind, table, parent_column):
+    rows = bind.execute(sa.text(f"SELECT id, {parent_column} FROM {table}")).all()
+    parents = dict(rows)
+    paths = {}
+    for start in parents:
+        chain = []
+        node_id = start
+        while node_id in parents and node_id not in paths and node_id not in chain:
+            chain.append(node_id)
+            node_id = parents[node_id]
+        base = "/" if node_id in chain else paths.get(node_id, "/")
+        for chain_id in reversed(chain):
+            base = f"{base}{chain_id}/"
+            paths[chain_id] = base
+    if paths:
+        bind.execute(
+            sa.text(f"UPDATE {table} SET path = :path WHERE id = :id"),
+            [{"id": node_id, "path": path} for node_id, path in paths.items()],
+        )
+
+
+def upgrade() -> None:
+    op.add_column('colleges', sa.Column('path', sa.String(length=255), nullable=True))
+    op.add_column('pages', sa.Column('path', sa.String(length=255), nullable=True))
+
+    # Afterwards the paths are maintained by app.services.tree_paths.
+    bind = op.get_bind()
+    _backfill(bind, 'colleges', 'parent_id')
+    _backfill(bind, 'pages', 'parent_page_id')
+
+    op.create_index('ix_colleges_path', 'colleges', ['path'])
+    op.create_index('ix_pages_path', 'pages', ['path'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pages_path', table_name='pages')
+    op.drop_index('ix_colleges_path', table_name='colleges')
+    op.drop_column('pages', 'path')
+    op.drop_column('colleges', 'path')
@@ -0,0 +1,88 @@
+"""add effective_pages inheritance snapshot
+
+Revision ID: 7g8h9i0j1k2l
+Revises: 6f7g8h9i0j1k
+Create Date: 2026-10-17 15:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7g8h9i0j1k2l'
+down_revision = '6f7g8h9i0j1k'
+branch_labels = None
+depends_on = None
+
+
+def _ids(path):
+    return [int(part) for part in path.strip("/").split("/")] if path else []
+
+
+def _backfill(bind):
+    """Same resolution as app.services.effective_pages.refresh_effective_pages."""
+    colleges = bind.execute(sa.text("SELECT id, parent_id, path FROM colleges")).all()
+    pages = bind.execute(sa.text(
+        "SELECT id, college_id, slug, is_active, is_inheritable, parent_page_id, path "
+        "FROM pages WHERE college_id IS NOT NULL ORDER BY id"
+    )).all()
+    with_sections = set(bind.execute(sa.text("SELECT DISTINCT page_id FROM page_sections")).scalars())
+
+    by_college = {}
+    for page in pages:
+        by_college.setdefault(page.college_id, []).append(page)
+
+    def content_page_id(page):
+        if page.parent_page_id is None or page.id in with_sections:
+            return page.id
+        chain = _ids(page.path)[-2::-1] if page.path else [page.parent_page_id]
+        return next((source_id for source_id in chain if source_id in with_sections), page.id)
+
+    rows = []
+    for college in colleges:
+        ancestors = _ids(college.path)[-2::-1] if college.path else [p for p in [college.parent_id] if p]
+        claimed = set()
+        for depth, owner_id in enumerate([college.id, *ancestors]):
+            for page in by_college.get(owner_id, ()):
+                if page.slug in claimed:
+                    continue
+                if depth == 0:
+                    claimed.add(page.slug)
+                    if not page.is_active:
+                        continue
+                elif not (page.is_active and page.is_inheritable):
+                    continue
+                claimed.add(page.slug)
+                rows.append({
+                    "college_id": college.id,
+                    "slug": page.slug,
+                    "page_id": page.id,
+                    "content_page_id": content_page_id(page),
+                    "depth": depth,
+                })
+    if rows:
+        bind.execute(
+            sa.text(
+                "INSERT INTO effective_pages (college_id, slug, page_id, content_page_id, depth) "
+                "VALUES (:college_id, :slug, :page_id, :content_page_id, :depth)"
+            ),
+            rows,
+        )
+
+
+def upgrade() -> None:
+    op.create_table(
+        'effective_pages',
+        sa.Column('college_id', sa.Integer(), sa.ForeignKey('colleges.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('slug', sa.String(length=255), primary_key=True),
+        sa.Column('page_id', sa.Integer(), sa.ForeignKey('pages.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('content_page_id', sa.Integer(), sa.ForeignKey('pages.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False, server_default='0'),
+    )
+    # Afterwards the snapshot is maintained by app.services.effective_pages.
+    _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_table('effective_pages')
@@ -0,0 +1,25 @@
+"""add activities (college_id, event_date, id) index for keyset pagination
+
+Revision ID: 8h9i0j1k2l3m
+Revises: 7g8h9i0j1k2l
+Create Date: 2026-10-17 18:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8h9i0j1k2l3m'
+down_revision = '7g8h9i0j1k2l'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_activities_college_event_date', 'activities', ['college_id', 'event_date', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_activities_college_event_date', table_name='activities')
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Request, Depends
-from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
+from fastapi.responses import JSONResponse, RedirectResponse
+from starlette.concurrency import run_in_threadpool
+from app.core.templates import templates
+import csv
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 from app.core.database import get_db
 from app.models.college import College
 from app.schemas.schema import (
@@ -27,6 +29,10 @@ from app.schemas.schema import (
     SharedSectionItem,
 )
 from app.utils.security import verify_password, hash_password
+from app.services.page_assembly import invalidate_pages, invalidate_all_pages, invalidate_shared_sections
+from app.services.dashboard import get_dashboard_stats
+from app.services.uploads import UploadError, check_upload_size, has_upload, save_upload
+from app.services.provisioning import parse_college_specs, provision_colleges
 
 router = APIRouter()
 
@@ -61,9 +67,6 @@ def _ensure_default_admin(db: Session):
         db.add(admin_user)
         db.commit()
 
-# Resolve templates directory relative to project root
-templates_dir = Path(__file__).resolve().parents[3] / "templet"
-templates = Jinja2Templates(directory=str(templates_dir))
 
 @router.get("/", include_in_schema=False)
 def admin_index(request: Request, db: Session = Depends(get_db)):
@@ -78,68 +81,21 @@ def admin_index(request: Request, db: Session = Depends(get_db)):
         _ensure_default_admin(db)
         
         college_id = request.query_params.get("college_id")
-        
-        # Fetch all colleges with stats
-        colleges = db.query(College).order_by(College.id.desc()).all()
-        
-        # Add counts to colleges
-        for college in colleges:
-            college.pages_count = db.query(Page).filter(Page.college_id == college.id).count()
-            college.courses_count = db.query(Course).filter(Course.college_id == college.id).count()
-            college.faculty_count = db.query(Faculty).filter(Faculty.college_id == college.id).count()
-
-        # Fetch all pages with college info
-        pages = db.query(Page).order_by(Page.id.desc()).limit(10).all()
-        for page in pages:
-            if page.college_id:
-                college = db.query(College).filter(College.id == page.college_id).first()
-                page.college_name = college.name if college else None
-            else:
-                page.college_name = None
-
-        # Dashboard statistics
-        stats = {
-            "total_colleges": db.query(College).count(),
-            "total_faculty": db.query(Faculty).count(),
-            "total_applications": db.query(Application).count(),
-            "total_pages": db.query(Page).count(),
-            "total_courses": db.query(Course).count(),
-            "total_enquiries": db.query(Enquiry).count(),
-        }
 
-        # Count facilities and placements
-        facilities_count = db.query(Facility).count()
-        placements_count = db.query(Placement).count()
-
-        # Recent applications (most recent 5)
-        recent_apps = []
-        apps = db.query(Application).order_by(Application.created_at.desc()).limit(5).all()
-        for a in apps:
-            program = None
-            if a.course_id:
-                course = db.query(Course).filter(Course.id == a.course_id).first()
-                program = course.name if course else "-"
-            recent_apps.append(
-                {
-                    "id": a.id,
-                    "name": a.name,
-                    "email": a.email,
-                    "course_name": program or "-",
-                    "status": a.status or "pending",
-                    "applied_at": a.created_at.strftime("%b %d, %Y") if a.created_at else "",
-                }
-            )
+        # Per-college and global counts come from a few grouped queries
+        # and are cached briefly (see app.services.dashboard).
+        dashboard = get_dashboard_stats(db)
 
         return templates.TemplateResponse(
             "admin/index.html",
             {
                 "request": request,
-                "colleges": colleges[:10],  # Limit to 10 for dashboard
-                "pages": pages,
-                "stats": stats,
-                "recent_applications": recent_apps,
-                "facilities_count": facilities_count,
-                "placements_count": placements_count,
+                "colleges": dashboard["colleges"][:10],  # Limit to 10 for dashboard
+                "pages": dashboard["pages"],
+                "stats": dashboard["stats"],
+                "recent_applications": dashboard["recent_applications"],
+                "facilities_count": dashboard["facilities_count"],
+                "placements_count": dashboard["placements_count"],
                 "selected_college_id": college_id or "",
             },
         )
@@ -351,6 +307,7 @@ async def update_shared_section(request: Request, section_id: int, db: Session =
     section.is_active = bool(form.get("is_active"))
     db.add(section)
     db.commit()
+    invalidate_shared_sections(section_id)
     return RedirectResponse(url="/admin/cms/shared-sections", status_code=303)
 
 
@@ -362,6 +319,7 @@ def delete_shared_section(request: Request, section_id: int, db: Session = Depen
     if section:
         db.delete(section)
         db.commit()
+        invalidate_shared_sections(section_id)
     return RedirectResponse(url="/admin/cms/shared-sections", status_code=303)
 
 
@@ -406,6 +364,7 @@ async def create_shared_section_item(request: Request, section_id: int, db: Sess
     )
     db.add(item)
     db.commit()
+    invalidate_shared_sections(section_id)
     return RedirectResponse(url=f"/admin/cms/shared-sections/{section_id}/items", status_code=303)
 
 
@@ -438,6 +397,7 @@ async def update_shared_section_item(request: Request, section_id: int, item_id:
     item.sort_order = int(form.get("sort_order") or 0)
     db.add(item)
     db.commit()
+    invalidate_shared_sections(section_id)
     return RedirectResponse(url=f"/admin/cms/shared-sections/{section_id}/items", status_code=303)
 
 
@@ -449,6 +409,7 @@ def delete_shared_section_item(request: Request, section_id: int, item_id: int,
     if item:
         db.delete(item)
         db.commit()
+        invalidate_shared_sections(section_id)
     return RedirectResponse(url=f"/admin/cms/shared-sections/{section_id}/items", status_code=303)
 
 
@@ -1226,6 +1187,8 @@ async def update_college(request: Request, college_id: int, db: Session = Depend
     college.parent_id = parent_id
     db.add(college)
     db.commit()
+    # college name is embedded in every page payload of this college
+    invalidate_all_pages()
     return RedirectResponse(url="/admin/colleges", status_code=303)
 
 @router.post("/colleges/{college_id}/delete", include_in_schema=False)
@@ -1237,8 +1200,37 @@ def delete_college(college_id: int, db: Session = Depends(get_db)):
     if college:
         db.delete(college)
         db.commit()
+        invalidate_all_pages()
     return RedirectResponse(url="/admin/colleges", status_code=303)
 
+@router.post("/colleges/provision", include_in_schema=False)
+async def provision_colleges_route(request: Request, db: Session = Depends(get_db)):
+    """
+    Bulk onboarding: a JSON list of colleges, or a CSV upload in the `file`
+    form field (same columns as scripts/provision_colleges.py). Returns the
+    provisioning report as JSON.
+    """
+    if isinstance(_require_login(request), RedirectResponse):
+        return _require_login(request)
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            records = await request.json()
+        else:
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None:
+                return JSONResponse({"status": "error", "detail": "Upload a CSV file in the 'file' field"}, status_code=400)
+            text = (await upload.read()).decode("utf-8-sig")
+            records = csv.DictReader(text.splitlines())
+        # Many batched statements; keep them off the event loop.
+        report = await run_in_threadpool(provision_colleges, db, parse_college_specs(records))
+    except (ValueError, TypeError, AttributeError) as e:
+        return JSONResponse({"status": "error", "detail": str(e)}, status_code=400)
+    except IntegrityError as e:
+        # e.g. a subdomain already used by another college
+        return JSONResponse({"status": "error", "detail": str(e.orig)}, status_code=409)
+    return JSONResponse({"status": "success", "data": report})
+
 # Pages: list, new, edit, delete
 @router.get("/pages", include_in_schema=False)
 def list_pages(request: Request, db: Session = Depends(get_db)):
@@ -1293,14 +1285,25 @@ def new_page_section_form(request: Request, page_id: int, db: Session = Depends(
     page = db.query(Page).filter(Page.id == page_id).first()
     return templates.TemplateResponse(
         "admin/section_form.html",
-        {"request": request, "action": "create", "page": page, "section": None},
+        {"request": request, "action": "create", "page": page, "section": None,
+         "error": request.session.pop("upload_error", None)},
     )
 
 
+def _upload_error(request: Request, e: UploadError):
+    """Send the admin back to the submitted form, which shows the error once."""
+    request.session["upload_error"] = str(e)
+    return RedirectResponse(url=request.url.path, status_code=303)
+
+
 @router.post("/pages/{page_id}/sections/new", include_in_schema=False)
 async def create_page_section(request: Request, page_id: int, db: Session = Depends(get_db)):
     if isinstance(_require_login(request), RedirectResponse):
         return _require_login(request)
+    try:
+        check_upload_size(request)
+    except UploadError as e:
+        return _upload_error(request, e)
     form = await request.form()
     
     section_type = form.get("section_type") or "CONTENT"
@@ -1325,27 +1328,15 @@ async def create_page_section(request: Request, page_id: int, db: Session = Depe
     # Handle hero image file upload
     hero_images_list = None
     hero_image_file = form.get("hero_image")
-    if hero_image_file and hasattr(hero_image_file, 'filename') and hero_image_file.filename:
-        import os
-        from pathlib import Path
-        
-        # Create uploads directory if it doesn't exist
-        upload_dir = Path("templet/static/uploads/hero")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique filename
-        file_ext = os.path.splitext(hero_image_file.filename)[1]
-        import time
-        filename = f"hero_{int(time.time())}{file_ext}"
-        file_path = upload_dir / filename
-        
-        # Save the file
-        with open(file_path, "wb") as f:
-            content = await hero_image_file.read()
-            f.write(content)
-        
+    if has_upload(hero_image_file):
+        # Streamed to a content-addressed file off the event loop
+        try:
+            hero_url = await save_upload(hero_image_file, "hero")
+        except UploadError as e:
+            return _upload_error(request, e)
+
         # Store the URL in hero_images list
-        hero_images_list = [f"/static/uploads/hero/{filename}"]
+        hero_images_list = [hero_url]
         extra_data['images'] = hero_images_list
 
     section = PageSection(
@@ -1364,6 +1355,7 @@ async def create_page_section(request: Request, page_id: int, db: Session = Depe
     db.add(section)
     db.commit()
     db.refresh(section)
+    invalidate_pages(page_id)
     
     return RedirectResponse(url=f"/admin/pages/{page_id}/sections", status_code=303)
 
@@ -1377,7 +1369,8 @@ def edit_page_section_form(request: Request, page_id: int, section_id: int, db:
     print(f"DEBUG: Loading section {section_id}, extra_data: {section.extra_data if section else 'N/A'}")
     return templates.TemplateResponse(
         "admin/section_form.html",
-        {"request": request, "action": "edit", "page": page, "section": section},
+        {"request": request, "action": "edit", "page": page, "section": section,
+         "error": request.session.pop("upload_error", None)},
     )
 
 
@@ -1385,6 +1378,10 @@ def edit_page_section_form(request: Request, page_id: int, section_id: int, db:
 async def update_page_section(request: Request, page_id: int, section_id: int, db: Session = Depends(get_db)):
     if isinstance(_require_login(request), RedirectResponse):
         return _require_login(request)
+    try:
+        check_upload_size(request)
+    except UploadError as e:
+        return _upload_error(request, e)
     form = await request.form()
     section = db.query(PageSection).filter(PageSection.id == section_id).first()
     if not section:
@@ -1433,27 +1430,15 @@ async def update_page_section(request: Request, page_id: int, section_id: int, d
     
     # Handle new hero image upload
     hero_image_file = form.get("hero_image")
-    if hero_image_file and hasattr(hero_image_file, 'filename') and hero_image_file.filename:
-        import os
-        from pathlib import Path
-        
-        # Create uploads directory if it doesn't exist
-        upload_dir = Path("templet/static/uploads/hero")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique filename
-        file_ext = os.path.splitext(hero_image_file.filename)[1]
-        import time
-        filename = f"hero_{int(time.time())}{file_ext}"
-        file_path = upload_dir / filename
-        
-        # Save the file
-        with open(file_path, "wb") as f:
-            content = await hero_image_file.read()
-            f.write(content)
-        
+    if has_upload(hero_image_file):
+        # Streamed to a content-addressed file off the event loop
+        try:
+            hero_url = await save_upload(hero_image_file, "hero")
+        except UploadError as e:
+            return _upload_error(request, e)
+
         # Store the URL in hero_images list
-        hero_images_list = [f"/static/uploads/hero/{filename}"]
+        hero_images_list = [hero_url]
         extra_data['images'] = hero_images_list
     
     # Update section
@@ -1476,6 +1461,7 @@ async def update_page_section(request: Request, page_id: int, section_id: int, d
     )
     db.execute(stmt)
     db.commit()
+    invalidate_pages(page_id, section.page_id)
     print(f"DEBUG: Section updated and committed")
     return RedirectResponse(url=f"/admin/pages/{page_id}/sections", status_code=303)
 
@@ -1486,8 +1472,10 @@ def delete_page_section(request: Request, page_id: int, section_id: int, db: Ses
         return _require_login(request)
     section = db.query(PageSection).filter(PageSection.id == section_id).first()
     if section:
+        owner_page_id = section.page_id
         db.delete(section)
         db.commit()
+        invalidate_pages(page_id, owner_page_id)
     return RedirectResponse(url=f"/admin/pages/{page_id}/sections", status_code=303)
 
 
@@ -1498,7 +1486,8 @@ def new_section_item_form(request: Request, page_id: int, section_id: int, db: S
     section = db.query(PageSection).filter(PageSection.id == section_id).first()
     return templates.TemplateResponse(
         "admin/section_item_form.html",
-        {"request": request, "action": "create", "section": section, "item": None, "page_id": page_id},
+        {"request": request, "action": "create", "section": section, "item": None, "page_id": page_id,
+         "error": request.session.pop("upload_error", None)},
     )
 
 
@@ -1510,7 +1499,8 @@ def edit_section_item_form(request: Request, page_id: int, section_id: int, item
     item = db.query(SectionItem).filter(SectionItem.id == item_id).first()
     return templates.TemplateResponse(
         "admin/section_item_form.html",
-        {"request": request, "action": "edit", "section": section, "item": item, "page_id": page_id},
+        {"request": request, "action": "edit", "section": section, "item": item, "page_id": page_id,
+         "error": request.session.pop("upload_error", None)},
     )
 
 
@@ -1518,31 +1508,21 @@ def edit_section_item_form(request: Request, page_id: int, section_id: int, item
 async def create_section_item(request: Request, page_id: int, section_id: int, db: Session = Depends(get_db)):
     if isinstance(_require_login(request), RedirectResponse):
         return _require_login(request)
+    try:
+        check_upload_size(request)
+    except UploadError as e:
+        return _upload_error(request, e)
     form = await request.form()
     
     # Handle image file upload
     image_url = form.get("image_url") or None
     image_file = form.get("image_file")
-    if image_file and hasattr(image_file, 'filename') and image_file.filename:
-        import os
-        from pathlib import Path
-        
-        # Create uploads directory
-        upload_dir = Path("templet/static/uploads/items")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique filename
-        file_ext = os.path.splitext(image_file.filename)[1]
-        import time
-        filename = f"item_{int(time.time())}{file_ext}"
-        file_path = upload_dir / filename
-        
-        # Save the file
-        with open(file_path, "wb") as f:
-            content = await image_file.read()
-            f.write(content)
-        
-        image_url = f"/static/uploads/items/{filename}"
+    if has_upload(image_file):
+        # Streamed to a content-addressed file off the event loop
+        try:
+            image_url = await save_upload(image_file, "items")
+        except UploadError as e:
+            return _upload_error(request, e)
     
     item = SectionItem(
         section_id=section_id,
@@ -1558,6 +1538,7 @@ async def create_section_item(request: Request, page_id: int, section_id: int, d
     )
     db.add(item)
     db.commit()
+    invalidate_pages(page_id)
     return RedirectResponse(url=f"/admin/pages/{page_id}/sections", status_code=303)
 
 
@@ -1565,6 +1546,10 @@ async def create_section_item(request: Request, page_id: int, section_id: int, d
 async def update_section_item(request: Request, page_id: int, section_id: int, item_id: int, db: Session = Depends(get_db)):
     if isinstance(_require_login(request), RedirectResponse):
         return _require_login(request)
+    try:
+        check_upload_size(request)
+    except UploadError as e:
+        return _upload_error(request, e)
     form = await request.form()
     item = db.query(SectionItem).filter(SectionItem.id == item_id).first()
     if not item:
@@ -1573,26 +1558,12 @@ async def update_section_item(request: Request, page_id: int, section_id: int, i
     # Handle image file upload
     image_url = form.get("image_url") or item.image_url
     image_file = form.get("image_file")
-    if image_file and hasattr(image_file, 'filename') and image_file.filename:
-        import os
-        from pathlib import Path
-        
-        # Create uploads directory
-        upload_dir = Path("templet/static/uploads/items")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique filename
-        file_ext = os.path.splitext(image_file.filename)[1]
-        import time
-        filename = f"item_{int(time.time())}{file_ext}"
-        file_path = upload_dir / filename
-        
-        # Save the file
-        with open(file_path, "wb") as f:
-            content = await image_file.read()
-            f.write(content)
-        
-        image_url = f"/static/uploads/items/{filename}"
+    if has_upload(image_file):
+        # Streamed to a content-addressed file off the event loop
+        try:
+            image_url = await save_upload(image_file, "items")
+        except UploadError as e:
+            return _upload_error(request, e)
     
     item.title = form.get("title") or None
     item.subtitle = form.get("subtitle") or None
@@ -1604,6 +1575,7 @@ async def update_section_item(request: Request, page_id: int, section_id: int, i
     item.sort_order = int(form.get("sort_order") or 0)
     db.add(item)
     db.commit()
+    invalidate_pages(page_id)
     return RedirectResponse(url=f"/admin/pages/{page_id}/sections", status_code=303)
 
 
@@ -1615,6 +1587,7 @@ def delete_section_item(request: Request, page_id: int, section_id: int, item_id
     if item:
         db.delete(item)
         db.commit()
+        invalidate_pages(page_id)
     return RedirectResponse(url=f"/admin/pages/{page_id}/sections", status_code=303)
 
 @router.get("/pages/new", include_in_schema=False)
@@ -1836,6 +1809,7 @@ async def update_page(request: Request, page_id: int, db: Session = Depends(get_
             db.commit()
         except Exception:
             pass
+    invalidate_pages(page_id)
     
     redirect_url = f"/admin/pages?college_id={college_id}" if college_id else "/admin/pages"
     return RedirectResponse(url=redirect_url, status_code=303)
@@ -1849,6 +1823,7 @@ def delete_page(request: Request, page_id: int, db: Session = Depends(get_db)):
     if page:
         db.delete(page)
         db.commit()
+        invalidate_pages(page_id)
     redirect_url = f"/admin/pages?college_id={college_id}" if college_id else "/admin/pages"
     return RedirectResponse(url=redirect_url, status_code=303)
 
@@ -1946,6 +1921,7 @@ async def update_page_seo(request: Request, page_id: int, db: Session = Depends(
         db.add(seo)
     
     db.commit()
+    invalidate_pages(page_id)
     redirect_url = f"/admin/page/{page_id}/seo?college_id={college_id}" if college_id else f"/admin/page/{page_id}/seo"
     return RedirectResponse(url=redirect_url, status_code=303)
 
@@ -5,8 +5,7 @@ These are examples you should integrate into your existing admin.py
 
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
+from app.core.templates import templates
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.college import College
@@ -23,9 +22,6 @@ from app.utils.college_context import (
     create_standard_pages_for_college,
 )
 
-templates_dir = Path(__file__).resolve().parents[3] / "templet"
-templates = Jinja2Templates(directory=str(templates_dir))
-
 
 def get_selected_college(request: Request, db: Session = Depends(get_db)):
     """
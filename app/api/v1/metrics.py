@@ -0,0 +1,49 @@
+"""
+Internal runtime metrics (per worker process).
+Exposes in-process cache and connection pool counters so cache and pool
+sizing can be tuned from data. They reveal cache keys and pool state, so
+only a logged-in admin session may read them.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.core.db_metrics import pool_metrics
+from app.services.dashboard import dashboard_cache
+from app.services.fragment_cache import fragment_cache, fragment_stats
+from app.services.page_assembly import page_cache, shared_section_cache
+from app.services.search import search_results
+
+
+def _require_admin(request: Request):
+    if not request.session.get("admin_user"):
+        raise HTTPException(status_code=401, detail="Admin login required")
+
+
+router = APIRouter(dependencies=[Depends(_require_admin)])
+
+
+@router.get("/cache")
+def cache_metrics():
+    """
+    Hit/miss counters for the in-process response caches of this worker.
+    """
+    return {
+        "status": "success",
+        "data": {
+            "pages": page_cache.stats(),
+            "shared_sections": shared_section_cache.stats(),
+            "fragments": {**fragment_cache.stats(), "by_section_type": fragment_stats.stats()},
+            "dashboard": dashboard_cache.stats(),
+            "search": search_results.stats(),
+        }
+    }
+
+
+@router.get("/pool")
+def pool_metrics_view():
+    """
+    Connection pool usage for each database engine of this worker: checkouts,
+    checkout wait time, overflow in use, invalidations and connection lifetime.
+    """
+    return {
+        "status": "success",
+        "data": [metrics.stats() for metrics in pool_metrics.values()],
+    }
@@ -3,11 +3,13 @@ Public API routes for frontend website consumption.
 These routes are publicly accessible without authentication.
 """
 from fastapi import APIRouter, Query, HTTPException, Depends, Request
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
+from app.core.templates import template_env, templates
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, get_async_read_db
+from app.core.http_cache import CachedRoute
 from app.models.college import College
 from app.schemas.schema import (
     Page,
@@ -16,16 +18,23 @@ from app.schemas.schema import (
     Placement,
     Activity,
     Facility,
-    Admission,
     Application,
     Enquiry,
-    SEOMeta,
-    PageSection,
-    SectionItem,
     CoursePage,
 )
+from app.services.college_summary import get_college_summary
+from app.services.effective_pages import resolve_page
+from app.services.fragment_cache import render_fragments
+from app.services.page_assembly import (
+    aget_page_payload,
+    get_page_payload,
+    load_home_page,
+    sections_with_shared,
+)
+from app.services.search import ENTITIES_BY_NAME, search_index, search_results, suggest_index
+from app.utils.pagination import DEFAULT_LIMIT, MAX_LIMIT, SortKey, paginate, page_results
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional
 
 
 # =====================================
@@ -48,24 +57,46 @@ class EnquirySubmitRequest(BaseModel):
     message: Optional[str] = None
     college_id: Optional[int] = None
 
-router = APIRouter()
+# GET responses carry ETag / Cache-Control and honour If-None-Match.
+router = APIRouter(route_class=CachedRoute)
+
+# Keyset orderings for the list endpoints (?cursor=&limit=); each ends in the
+# primary key so the order is total.
+COLLEGE_ORDER = (SortKey(College.name, "name"), SortKey(College.id, "id"))
+PAGE_ORDER = (SortKey(Page.title, "title"), SortKey(Page.id, "id"))
+COURSE_ORDER = (SortKey(Course.name, "name"), SortKey(Course.id, "id"))
+FACULTY_ORDER = (SortKey(Faculty.name, "name"), SortKey(Faculty.id, "id"))
+PLACEMENT_ORDER = (
+    SortKey(Placement.year, "year", descending=True),
+    SortKey(Placement.id, "id", descending=True),
+)
+FACILITY_ORDER = (SortKey(Facility.id, "id"),)
+ACTIVITY_ORDER = (
+    # Undated activities sort last; ix_activities_college_event_date serves the seek
+    SortKey(Activity.event_date, "event_date", descending=True, nulls_last=True),
+    SortKey(Activity.id, "id", descending=True),
+)
 
-# Resolve templates directory relative to project root for server-side rendering
-templates_dir = Path(__file__).resolve().parents[3] / "templet"
-templates = Jinja2Templates(directory=str(templates_dir))
 
 # =====================================
 # COLLEGES - Public Routes
 # =====================================
 
 @router.get("/colleges")
-def list_colleges(db: Session = Depends(get_db)):
+async def list_colleges(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
-    Get all active colleges for navigation/directory.
+    Get active colleges for navigation/directory, one page at a time.
     """
-    colleges = db.query(College).filter(College.is_active == True).order_by(College.name).all()
+    stmt = paginate(select(College).where(College.is_active == True), COLLEGE_ORDER, cursor, limit)
+    result = await db.execute(stmt)
+    colleges, next_cursor = page_results(result.scalars().all(), COLLEGE_ORDER, limit)
     return {
         "status": "success",
+        "next_cursor": next_cursor,
         "data": [
             {
                 "id": c.id,
@@ -81,75 +112,19 @@ def list_colleges(db: Session = Depends(get_db)):
 
 
 @router.get("/colleges/{college_id}")
-def get_college_details(college_id: int, db: Session = Depends(get_db)):
+def get_college_details(college_id: int, db: Session = Depends(get_read_db)):
     """
     Get college with key stats and information for display.
     """
-    college = db.query(College).filter(College.id == college_id, College.is_active == True).first()
-    if not college:
+    # Counts are SQL aggregates and previews are LIMITed queries, so this
+    # stays constant-cost however many faculty or activities a college has.
+    summary = get_college_summary(db, college_id)
+    if summary is None:
         raise HTTPException(status_code=404, detail="College not found")
-    
-    # Get related data
-    courses = db.query(Course).filter(Course.college_id == college_id, Course.is_active == True).all()
-    faculty = db.query(Faculty).filter(Faculty.college_id == college_id, Faculty.is_active == True).all()
-    placements = db.query(Placement).filter(Placement.college_id == college_id).all()
-    facilities = db.query(Facility).filter(Facility.college_id == college_id).all()
-    activities = db.query(Activity).filter(Activity.college_id == college_id).all()
-    admission = db.query(Admission).filter(Admission.college_id == college_id).first()
-    
+
     return {
         "status": "success",
-        "data": {
-            "id": college.id,
-            "name": college.name,
-            "slug": college.slug,
-            "description": college.short_description,
-            "logo": college.logo_url,
-            "theme_color": college.theme_primary_color,
-            "stats": {
-                "courses": len(courses),
-                "faculty": len(faculty),
-                "facilities": len(facilities),
-                "events": len(activities),
-            },
-            "courses": [
-                {
-                    "id": c.id,
-                    "name": c.name,
-                    "slug": c.slug,
-                    "level": c.level,
-                    "department": c.department,
-                }
-                for c in courses[:10]  # Limit to 10
-            ],
-            "faculty": [
-                {
-                    "id": f.id,
-                    "name": f.name,
-                    "designation": f.designation,
-                    "photo": f.photo_url,
-                }
-                for f in faculty[:8]  # Limit to 8
-            ],
-            "facilities": [
-                {
-                    "id": f.id,
-                    "name": f.name,
-                    "image": f.image_url,
-                }
-                for f in facilities[:6]
-            ],
-            "placements": {
-                "latest_year": placements[0].year if placements else None,
-                "highest_package": placements[0].highest_package if placements else None,
-                "average_package": placements[0].average_package if placements else None,
-                "placement_percentage": placements[0].placement_percentage if placements else None,
-            } if placements else {},
-            "admission": {
-                "procedure": admission.procedure_text,
-                "eligibility": admission.eligibility_text,
-            } if admission else {},
-        }
+        "data": summary,
     }
 
 
@@ -161,10 +136,12 @@ def get_college_details(college_id: int, db: Session = Depends(get_db)):
 def list_pages(
     college_id: Optional[int] = Query(None),
     page_type: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get all active pages, optionally filtered by college and/or page type.
+    Get active pages, optionally filtered by college and/or page type.
     """
     q = db.query(Page).filter(Page.is_active == True)
     
@@ -174,10 +151,11 @@ def list_pages(
     if page_type:
         q = q.filter(Page.page_type == page_type)
     
-    pages = q.order_by(Page.title).all()
+    pages, next_cursor = page_results(paginate(q, PAGE_ORDER, cursor, limit).all(), PAGE_ORDER, limit)
     
     return {
         "status": "success",
+        "next_cursor": next_cursor,
         "data": [
             {
                 "id": p.id,
@@ -193,249 +171,36 @@ def list_pages(
 
 
 @router.get("/pages/{page_id}")
-def get_page_details(page_id: int, db: Session = Depends(get_db)):
+async def get_page_details(page_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """
     Get detailed page content including sections and SEO metadata.
     Clean, simple response optimized for frontend rendering.
     """
-    page = db.query(Page).filter(Page.id == page_id, Page.is_active == True).first()
-    if not page:
+    # Page, college, SEO, sections and items are loaded in a constant
+    # number of queries and the result is cached until an admin edit evicts it.
+    payload = await aget_page_payload(db, page_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Page not found")
-    
-    # Get sections
-    sections = db.query(PageSection).filter(PageSection.page_id == page_id, PageSection.is_active == True).order_by(PageSection.sort_order).all()
-    
-    # Get SEO metadata
-    seo = db.query(SEOMeta).filter(SEOMeta.page_id == page_id).first()
-    
-    # Get college info
-    college = db.query(College).filter(College.id == page.college_id).first() if page.college_id else None
-    
-    # Build clean sections response tailored for Angular frontend
-    sections_data = []
-    for section in sections:
-        items = db.query(SectionItem).filter(SectionItem.section_id == section.id).order_by(SectionItem.sort_order).all()
-        
-        # Section data optimized for frontend section types
-        if section.section_type == "HERO":
-            # Hero: images (single or multiple), title, description, color, optional CTA
-            images = []
-            
-            # Check extra_data first for images
-            if section.extra_data and isinstance(section.extra_data, dict):
-                extra_images = section.extra_data.get("images")
-                if extra_images and isinstance(extra_images, list):
-                    images.extend([img for img in extra_images if img])
-            
-            # Then check hero_images column
-            if not images and getattr(section, 'hero_images', None):
-                try:
-                    for img in section.hero_images:
-                        if img and img not in images:
-                            images.append(img)
-                except Exception:
-                    pass
-            
-            # Fallback to other sources
-            if not images and getattr(section, 'hero_image_url', None):
-                images.append(section.hero_image_url)
-            if not images and section.extra_data and isinstance(section.extra_data, dict):
-                hero_img = section.extra_data.get("hero_image_url")
-                if hero_img:
-                    images.append(hero_img)
-            if section.background_image and section.background_image not in images:
-                images.append(section.background_image)
-            
-            # Get CTA from extra_data (new format)
-            cta_text = None
-            cta_link = None
-            if section.extra_data and isinstance(section.extra_data, dict):
-                cta_text = section.extra_data.get("cta_text")
-                cta_link = section.extra_data.get("cta_link")
-            
-            # Fallback to items if not in extra_data (backward compatibility)
-            if not cta_text and items and items[0].cta_text:
-                cta_text = items[0].cta_text
-            if not cta_link and items and items[0].cta_link:
-                cta_link = items[0].cta_link
-
-            section_obj = {
-                "id": section.id,
-                "type": section.section_type,
-                "title": section.section_title,
-                "description": section.section_description,
-                "color": section.hero_text_color or section.background_color or None,
-                "images": images if images else None,
-                "cta_text": cta_text,
-                "cta_link": cta_link,
-            }
-        
-        elif section.section_type == "STATS":
-            # Stats: array of {value, label} for displaying numbers/metrics
-            section_obj = {
-                "id": section.id,
-                "type": section.section_type,
-                "title": section.section_title,
-                "subtitle": section.section_subtitle,
-                "stats": [
-                    {
-                        "value": i.title,  # e.g., "30" or "500+"
-                        "label": i.subtitle or i.description,  # e.g., "Years Legacy"
-                    }
-                    for i in items
-                ]
-            }
-        
-        elif section.section_type == "INFO_BAR":
-            # INFO_BAR: Stats (first 5 items) + Accreditation (remaining items)
-            stats_items = items[:5] if len(items) > 5 else items
-            accreditation_items = items[5:] if len(items) > 5 else []
-            
-            section_obj = {
-                "id": section.id,
-                "type": section.section_type,
-                "title": section.section_title,
-                "subtitle": section.section_subtitle,
-                "description": section.section_description,
-                "stats": [
-                    {
-                        "value": i.title,  # e.g., "30" or "500+"
-                        "label": i.subtitle,  # e.g., "Years Legacy"
-                    }
-                    for i in stats_items
-                ],
-                "accreditations": [
-                    {
-                        "title": i.title,  # e.g., "NAAC A++"
-                        "subtitle": i.subtitle,  # e.g., "Accredited Management Institute"
-                        "description": i.description,
-                        "image_url": i.image_url,
-                    }
-                    for i in accreditation_items
-                ]
-            }
-        
-        elif section.section_type in ["TEXT", "ABOUT"]:
-            # Text/About: title, description, optional button
-            section_obj = {
-                "id": section.id,
-                "type": section.section_type,
-                "title": section.section_title,
-                "subtitle": section.section_subtitle,
-                "description": section.section_description,
-                "cta_text": items[0].cta_text if items and items[0].cta_text else None,
-                "cta_link": items[0].cta_link if items and items[0].cta_link else section.section_link,
-            }
-        
-        elif section.section_type == "ACCORDION":
-            # Accordion: title + items for expandable lists (e.g., courses by category)
-            section_obj = {
-                "id": section.id,
-                "type": section.section_type,
-                "title": section.section_title,
-                "subtitle": section.section_subtitle,
-                "description": section.section_description,
-                "items": [
-                    {
-                        "id": i.id,
-                        "title": i.title,  # Category name (e.g., "Management")
-                        "content": i.description,  # Content when expanded
-                    }
-                    for i in items
-                ]
-            }
-        
-        elif section.section_type in ["BADGES", "ACCREDITATION"]:
-            # Badges/Accreditation: grid of logos or achievements
-            section_obj = {
-                "id": section.id,
-                "type": section.section_type,
-                "title": section.section_title,
-                "subtitle": section.section_subtitle,
-                "items": [
-                    {
-                        "title": i.title,
-                        "subtitle": i.subtitle,
-                        "description": i.description,
-                        "image_url": i.image_url,
-                    }
-                    for i in items
-                ]
-            }
-        
-        else:
-            # Generic fallback for CARDS, FACILITIES, FACULTY, etc.
-            section_obj = {
-                "id": section.id,
-                "type": section.section_type,
-                "title": section.section_title,
-                "subtitle": section.section_subtitle,
-                "description": section.section_description,
-                "background_color": section.background_color,
-                "items": [
-                    {
-                        "id": i.id,
-                        "title": i.title,
-                        "subtitle": i.subtitle,
-                        "description": i.description,
-                        "image_url": i.image_url,
-                        "cta_text": i.cta_text,
-                        "cta_link": i.cta_link,
-                    }
-                    for i in items
-                ]
-            }
 
-        sections_data.append(section_obj)
-    
-    # Clean page response
-    return {
-        "status": "success",
-        "data": {
-            "page": {
-                "id": page.id,
-                "title": page.title,
-                "slug": page.slug,
-                "college_id": page.college_id,
-                "college_name": college.name if college else None,
-            },
-            "seo": {
-                "title": seo.meta_title,
-                "description": seo.meta_description,
-                "url": seo.canonical_url,
-                "image": seo.og_image,
-            } if seo else {},
-            "sections": sections_data,
-        }
-    }
+    return payload
 
 
 @router.get("/", include_in_schema=False)
-def home(request: Request, db: Session = Depends(get_db)):
+def home(request: Request, db: Session = Depends(get_read_db)):
     """Server-rendered homepage driven by the Page/Sections in the DB.
     It finds the page with slug 'home' (or the first active page) and renders
     the sections using the page builder macros in templates/includes.
     """
-    # Try to find an explicit home page
-    page = db.query(Page).filter(Page.slug == 'home', Page.is_active == True).first()
-    if not page:
-        page = db.query(Page).filter(Page.page_type == 'home', Page.is_active == True).first()
-    if not page:
-        page = db.query(Page).filter(Page.is_active == True).order_by(Page.id).first()
+    # Explicit home page first, then the first active page
+    page = load_home_page(db)
 
     if not page:
         # No page to render; return a minimal message
         return templates.TemplateResponse("index.html", {"request": request, "page": None, "courses": {}, "faculty": {}, "placement": {}, "facilities": {}})
 
-    # Load sections and attach items to each section
-    sections = db.query(PageSection).filter(PageSection.page_id == page.id, PageSection.is_active == True).order_by(PageSection.sort_order).all()
-    for s in sections:
-        items = db.query(SectionItem).filter(SectionItem.section_id == s.id).order_by(SectionItem.sort_order).all()
-        # attach items list so macros can iterate
-        setattr(s, 'items', items)
-
-    # Attach sections to page object for macros expecting page.sections
-    setattr(page, 'sections', sections)
+    # Sections and their items are already eager-loaded; shared sections
+    # (footer carousels etc.) are merged in by sort_order with one query.
+    sections = sections_with_shared(db, page)
 
     # Lightweight datasets (can be expanded later)
     courses = {}
@@ -443,50 +208,43 @@ def home(request: Request, db: Session = Depends(get_db)):
     placement = {}
     facilities = {}
 
-    return templates.TemplateResponse("index.html", {"request": request, "page": page, "courses": courses, "faculty": faculty, "placement": placement, "facilities": facilities})
+    # Unchanged sections come from the fragment cache; the shell is rendered around them.
+    fragments = render_fragments(
+        template_env, page, sections, courses=courses, faculty=faculty, placement=placement, facilities=facilities
+    )
+
+    return templates.TemplateResponse("index.html", {"request": request, "page": page, "sections": sections, "fragments": fragments, "courses": courses, "faculty": faculty, "placement": placement, "facilities": facilities})
 
 
 # =====================================
 # Pages by college slug + page slug
 # Example: /ips-acadmy/home
 # =====================================
-@router.get("/{college_slug}/{page_slug}")
-def get_page_by_college_and_slug(college_slug: str, page_slug: str, db: Session = Depends(get_db)):
-    # Find college by slug
-    college = db.query(College).filter(College.slug == college_slug, College.is_active == True).first()
-    if not college:
-        raise HTTPException(status_code=404, detail="College not found")
-
-    # Find page by slug for this college
-    page = db.query(Page).filter(Page.slug == page_slug, Page.college_id == college.id, Page.is_active == True).first()
-    if not page:
-        raise HTTPException(status_code=404, detail="Page not found for this college")
-
-    # Reuse existing page details builder
-    return get_page_details(page.id, db)
-
-
 # =====================================
 # COURSES - Public Routes
 # =====================================
 
 @router.get("/courses")
-def list_courses(
+async def list_courses(
     college_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get courses list, optionally filtered by college.
     """
-    q = db.query(Course).filter(Course.is_active == True)
+    stmt = select(Course).where(Course.is_active == True)
     
     if college_id:
-        q = q.filter(Course.college_id == college_id)
+        stmt = stmt.where(Course.college_id == college_id)
     
-    courses = q.order_by(Course.name).all()
+    result = await db.execute(paginate(stmt, COURSE_ORDER, cursor, limit))
+    courses, next_cursor = page_results(result.scalars().all(), COURSE_ORDER, limit)
     
     return {
         "status": "success",
+        "next_cursor": next_cursor,
         "data": [
             {
                 "id": c.id,
@@ -504,7 +262,7 @@ def list_courses(
 
 
 @router.get("/courses/{course_id}")
-def get_course_details(course_id: int, db: Session = Depends(get_db)):
+def get_course_details(course_id: int, db: Session = Depends(get_read_db)):
     """
     Get course details with curriculum and career info.
     """
@@ -543,7 +301,9 @@ def get_course_details(course_id: int, db: Session = Depends(get_db)):
 @router.get("/faculty")
 def list_faculty(
     college_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get faculty members for college display.
@@ -553,10 +313,11 @@ def list_faculty(
     if college_id:
         q = q.filter(Faculty.college_id == college_id)
     
-    faculty = q.order_by(Faculty.name).limit(20).all()
+    faculty, next_cursor = page_results(paginate(q, FACULTY_ORDER, cursor, limit).all(), FACULTY_ORDER, limit)
     
     return {
         "status": "success",
+        "next_cursor": next_cursor,
         "data": [
             {
                 "id": f.id,
@@ -571,7 +332,7 @@ def list_faculty(
 
 
 @router.get("/faculty/{faculty_id}")
-def get_faculty_details(faculty_id: int, db: Session = Depends(get_db)):
+def get_faculty_details(faculty_id: int, db: Session = Depends(get_read_db)):
     """
     Get faculty member profile.
     """
@@ -603,7 +364,9 @@ def get_faculty_details(faculty_id: int, db: Session = Depends(get_db)):
 @router.get("/placements")
 def list_placements(
     college_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(5, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get placement statistics.
@@ -613,10 +376,11 @@ def list_placements(
     if college_id:
         q = q.filter(Placement.college_id == college_id)
     
-    placements = q.order_by(Placement.year.desc()).limit(5).all()
+    placements, next_cursor = page_results(paginate(q, PLACEMENT_ORDER, cursor, limit).all(), PLACEMENT_ORDER, limit)
     
     return {
         "status": "success",
+        "next_cursor": next_cursor,
         "data": [
             {
                 "id": p.id,
@@ -632,7 +396,7 @@ def list_placements(
 
 
 @router.get("/placements/{placement_id}")
-def get_placement_details(placement_id: int, db: Session = Depends(get_db)):
+def get_placement_details(placement_id: int, db: Session = Depends(get_read_db)):
     """
     Get placement record details.
     """
@@ -663,7 +427,9 @@ def get_placement_details(placement_id: int, db: Session = Depends(get_db)):
 @router.get("/facilities")
 def list_facilities(
     college_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(12, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get facilities for display.
@@ -673,10 +439,11 @@ def list_facilities(
     if college_id:
         q = q.filter(Facility.college_id == college_id)
     
-    facilities = q.limit(12).all()
+    facilities, next_cursor = page_results(paginate(q, FACILITY_ORDER, cursor, limit).all(), FACILITY_ORDER, limit)
     
     return {
         "status": "success",
+        "next_cursor": next_cursor,
         "data": [
             {
                 "id": f.id,
@@ -690,7 +457,7 @@ def list_facilities(
 
 
 @router.get("/facilities/{facility_id}")
-def get_facility_details(facility_id: int, db: Session = Depends(get_db)):
+def get_facility_details(facility_id: int, db: Session = Depends(get_read_db)):
     """
     Get facility information.
     """
@@ -719,7 +486,9 @@ def get_facility_details(facility_id: int, db: Session = Depends(get_db)):
 @router.get("/activities")
 def list_activities(
     college_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get recent activities/events.
@@ -729,10 +498,11 @@ def list_activities(
     if college_id:
         q = q.filter(Activity.college_id == college_id)
     
-    activities = q.order_by(Activity.event_date.desc()).limit(20).all()
+    activities, next_cursor = page_results(paginate(q, ACTIVITY_ORDER, cursor, limit).all(), ACTIVITY_ORDER, limit)
     
     return {
         "status": "success",
+        "next_cursor": next_cursor,
         "data": [
             {
                 "id": a.id,
@@ -748,7 +518,7 @@ def list_activities(
 
 
 @router.get("/activities/{activity_id}")
-def get_activity_details(activity_id: int, db: Session = Depends(get_db)):
+def get_activity_details(activity_id: int, db: Session = Depends(get_read_db)):
     """
     Get activity details.
     """
@@ -863,82 +633,82 @@ def submit_enquiry(
 # =====================================
 
 @router.get("/search")
-def search(
+async def search(
     query: str = Query(..., min_length=2),
     search_type: Optional[str] = Query(None),  # colleges, pages, courses, faculty
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Global search across colleges, pages, and courses.
+    Global search across colleges, pages, courses and faculty.
+
+    `ranked` lists the best matches across all types by relevance; `results`
+    groups the same hits per type.
     """
-    results = {
+    types = [search_type] if search_type else list(ENTITIES_BY_NAME)
+    types = [t for t in types if t in ENTITIES_BY_NAME]
+    hits = []
+    if types:
+        # Identical (normalized) queries share a cached result, and concurrent
+        # misses wait for one search instead of each hitting the database.
+        hits = await search_results.get_or_compute(
+            search_results.key(query, types),
+            lambda: db.run_sync(search_index.search, query, types),
+        )
+
+    grouped = {t: [] for t in types}
+    for hit in hits:
+        grouped[hit["type"]].append({k: v for k, v in hit.items() if k not in ("type", "score")})
+
+    return {
         "status": "success",
         "query": query,
-        "results": {}
+        "ranked": hits,
+        "results": grouped,
     }
-    
-    # Search colleges
-    if not search_type or search_type == "colleges":
-        colleges = db.query(College).filter(
-            College.is_active == True,
-            (College.name.ilike(f"%{query}%") | College.short_description.ilike(f"%{query}%"))
-        ).limit(10).all()
-        results["results"]["colleges"] = [
-            {
-                "id": c.id,
-                "name": c.name,
-                "slug": c.slug,
-                "short_description": c.short_description,
-            }
-            for c in colleges
-        ]
-    
-    # Search pages
-    if not search_type or search_type == "pages":
-        pages = db.query(Page).filter(
-            Page.is_active == True,
-            Page.title.ilike(f"%{query}%")
-        ).limit(10).all()
-        results["results"]["pages"] = [
-            {
-                "id": p.id,
-                "title": p.title,
-                "slug": p.slug,
-                "college_id": p.college_id,
-            }
-            for p in pages
-        ]
-    
-    # Search courses
-    if not search_type or search_type == "courses":
-        courses = db.query(Course).filter(
-            Course.is_active == True,
-            (Course.name.ilike(f"%{query}%") | Course.overview.ilike(f"%{query}%"))
-        ).limit(10).all()
-        results["results"]["courses"] = [
-            {
-                "id": c.id,
-                "name": c.name,
-                "slug": c.slug,
-                "college_id": c.college_id,
-            }
-            for c in courses
-        ]
-    
-    # Search faculty
-    if not search_type or search_type == "faculty":
-        faculty = db.query(Faculty).filter(
-            Faculty.is_active == True,
-            (Faculty.name.ilike(f"%{query}%") | Faculty.designation.ilike(f"%{query}%"))
-        ).limit(10).all()
-        results["results"]["faculty"] = [
-            {
-                "id": f.id,
-                "name": f.name,
-                "designation": f.designation,
-                "college_id": f.college_id,
-            }
-            for f in faculty
-        ]
-    
-    return results
+
+
+@router.get("/search/suggest")
+async def search_suggest(
+    query: str = Query(..., min_length=1, max_length=100),
+    search_type: Optional[str] = Query(None),  # colleges, pages, courses, faculty
+    limit: int = Query(8, ge=1, le=20),
+):
+    """
+    Typeahead suggestions for the search box, answered from memory
+    without touching the database.
+    """
+    types = [search_type] if search_type else None
+    if search_type and search_type not in ENTITIES_BY_NAME:
+        return {"status": "success", "query": query, "data": []}
+    return {
+        "status": "success",
+        "query": query,
+        "data": suggest_index.suggest(query, limit=limit, types=types),
+    }
+
+
+# =====================================
+# COLLEGE PAGES BY SLUG - Public Routes
+# =====================================
+
+# Catch-all two-segment route; keep it last so it does not shadow
+# /courses/{id}, /faculty/{id}, /search/suggest and the other routes above.
+@router.get("/{college_slug}/{page_slug}")
+def get_page_by_college_and_slug(college_slug: str, page_slug: str, db: Session = Depends(get_read_db)):
+    # One lookup in the precomputed inheritance snapshot; the page may be
+    # the college's own or inherited from an ancestor college.
+    college_id, effective = resolve_page(db, college_slug, page_slug)
+    if college_id is None:
+        raise HTTPException(status_code=404, detail="College not found")
+    if effective is None:
+        raise HTTPException(status_code=404, detail="Page not found for this college")
+
+    # Reuse the cached page payload builder
+    payload = get_page_payload(db, effective.page_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Page not found")
+    if effective.content_page_id != effective.page_id:
+        content = get_page_payload(db, effective.content_page_id)
+        if content is not None:
+            payload = {**payload, "data": {**payload["data"], "sections": content["data"]["sections"]}}
+    return payload
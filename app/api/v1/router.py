@@ -23,6 +23,11 @@ try:
 except Exception:
 	admin = None
 
+try:
+	from app.api.v1 import metrics
+except Exception:
+	metrics = None
+
 try:
 	from app.api.v1 import public
 except Exception:
@@ -40,5 +45,10 @@ if courses and hasattr(courses, "router"):
 if admin and hasattr(admin, "router"):
 	api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
 
+# Registered before the public router so its catch-all
+# `/{college_slug}/{page_slug}` route does not shadow `/metrics/...`.
+if metrics and hasattr(metrics, "router"):
+	api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+
 if public and hasattr(public, "router"):
 	api_router.include_router(public.router, prefix="", tags=["Public API"])
@@ -4,7 +4,7 @@ Automatically determines selected college from query params or session.
 """
 from fastapi import Request
 from sqlalchemy.orm import Session
-from app.models.college import College
+from app.services.college_cache import college_directory
 
 
 class CollegeContextMiddleware:
@@ -45,24 +45,11 @@ def get_all_colleges_for_dropdown(db: Session, selected_college_id: int = None):
     Get all colleges formatted for dropdown selection.
     Returns list with root colleges first, then children indented.
     """
-    def format_college_list(college, depth=0):
-        items = [{
+    return [
+        {
             "id": college.id,
             "name": ("&nbsp;&nbsp;" * depth) + ("└─ " if depth > 0 else "") + college.name,
             "selected": college.id == selected_college_id if selected_college_id else False
-        }]
-        
-        # Add children
-        for child in college.children:
-            items.extend(format_college_list(child, depth + 1))
-        
-        return items
-    
-    # Get root colleges
-    root_colleges = db.query(College).filter(College.parent_id == None).all()
-    
-    result = []
-    for college in root_colleges:
-        result.extend(format_college_list(college))
-    
-    return result
+        }
+        for college, depth in college_directory.forest(db)
+    ]
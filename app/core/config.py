@@ -4,10 +4,82 @@ class Settings(BaseSettings):
     APP_NAME: str
     ENV: str
     DATABASE_URL: str
+    # Optional asyncio URL (e.g. mysql+aiomysql://..., sqlite+aiosqlite:///...).
+    # Derived from DATABASE_URL when not set.
+    ASYNC_DATABASE_URL: str | None = None
+    # Optional read replicas for public GET traffic, as a JSON list in the
+    # environment (DATABASE_READ_URLS='["mysql+pymysql://...", ...]').
+    DATABASE_READ_URLS: list[str] = []
+    # After an admin commit, that browser session reads from the primary for
+    # this many seconds so edits are visible despite replication lag.
+    DATABASE_READ_STICKY_SECONDS: int = 10
+    # Seconds a replica that failed a health check is kept out of rotation.
+    DATABASE_REPLICA_EJECT_SECONDS: int = 30
+    # Connection pool per engine and per worker process.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a free connection before raising.
+    DB_POOL_TIMEOUT: int = 30
+    # Recycle connections older than this (keep below MySQL wait_timeout).
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
     # Secret key used for session middleware. Override in .env for production.
     SECRET_KEY: str = "dev-secret-change-me"
     # Simple admin password (only for initial/dev use). Prefer real user management.
     ADMIN_PASSWORD: str = "admin"
+    # In-process cache of rendered public page payloads (per worker).
+    PAGE_CACHE_SIZE: int = 512
+    PAGE_CACHE_TTL: int = 300
+    # Max serialized shared sections (footer carousels etc.) kept per worker.
+    SHARED_SECTION_CACHE_SIZE: int = 256
+    # Rendered HTML of page builder sections, keyed by section content digest.
+    FRAGMENT_CACHE_SIZE: int = 2048
+    FRAGMENT_CACHE_TTL: int = 3600
+    # Seconds the subdomain -> college snapshot used by the middleware is kept.
+    COLLEGE_CACHE_TTL: int = 300
+    # Seconds the admin dashboard counts are cached.
+    DASHBOARD_CACHE_TTL: int = 30
+    # Cache-Control for public GET endpoints; HTTP_CACHE_POLICIES maps an
+    # endpoint name (e.g. "get_page_details") to its Cache-Control value.
+    HTTP_CACHE_DEFAULT_POLICY: str = "public, max-age=60, stale-while-revalidate=300"
+    HTTP_CACHE_POLICIES: dict = {}
+    # Seconds a remembered ETag may answer 304 without running the endpoint.
+    # Content versions are per worker, so this bounds how long other workers
+    # can answer 304 for content changed through one worker.
+    HTTP_ETAG_INDEX_TTL: int = 15
+    # Public search backend: "memory" (in-process inverted index) or "mysql"
+    # (FULLTEXT indexes, see migration 4d5e6f7g8h9i).
+    SEARCH_BACKEND: str = "memory"
+    # Seconds before the in-process index is rebuilt to pick up other workers' writes.
+    SEARCH_INDEX_REFRESH: int = 300
+    # /search result cache per worker, keyed by the analyzed query.
+    SEARCH_CACHE_SIZE: int = 1024
+    SEARCH_CACHE_TTL: int = 120
+    # Compiled Jinja templates are cached here (system temp dir when unset).
+    TEMPLATE_BYTECODE_CACHE_DIR: str | None = None
+    # Re-check template sources on every render; defaults to on except when
+    # ENV is "production"/"prod".
+    TEMPLATE_AUTO_RELOAD: bool | None = None
+    # Admin image uploads: content-addressed files below UPLOAD_DIR, served
+    # under UPLOAD_URL_PREFIX (see app/services/uploads.py).
+    UPLOAD_DIR: str = "templet/static/uploads"
+    UPLOAD_URL_PREFIX: str = "/static/uploads"
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    # Responsive variants of uploaded images (needs Pillow; AVIF needs a
+    # Pillow build with AVIF support and is skipped otherwise).
+    IMAGE_DERIVATIVE_WIDTHS: list[int] = [320, 640, 960, 1280, 1920]
+    IMAGE_DERIVATIVE_FORMATS: list[str] = ["avif", "webp"]
+    IMAGE_DERIVATIVE_WORKERS: int = 2
+    # Static pre-rendering of public pages (see app/services/static_publisher.py).
+    # When set, releases are written below this directory and `current` is
+    # served at STATIC_PUBLISH_URL (or by nginx/a CDN straight from disk).
+    STATIC_PUBLISH_DIR: str | None = None
+    STATIC_PUBLISH_URL: str = "/site"
+    # Republish automatically this many seconds after content-changing commits.
+    STATIC_PUBLISH_ON_CHANGE: bool = True
+    STATIC_PUBLISH_DELAY: float = 5.0
+    # Releases kept on disk for rollback (including the current one).
+    STATIC_PUBLISH_KEEP: int = 3
     model_config = {"extra": "ignore", "env_file": ".env"}
 
 settings = Settings()
@@ -1,60 +1,301 @@
+from fastapi import Request
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 from sqlalchemy.exc import OperationalError as SAOperationalError
 from app.core.config import settings
+from app.core.db_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
+import itertools
 import logging
+import threading
+import time
 import pymysql
 
 logger = logging.getLogger(__name__)
 
-# Create engine with connection pool settings optimized for long-running processes
-# Add driver-specific connect_args to help with network timeouts and keepalive.
-engine = create_engine(
-    settings.DATABASE_URL,
-    poolclass=QueuePool,
-    pool_pre_ping=True,  # Test connections before using them
-    pool_size=5,  # Reduce pool size
-    max_overflow=10,  # Allow overflow connections
-    pool_recycle=3600,  # Recycle connections every hour to avoid timeout
-    pool_timeout=30,  # Wait up to 30 seconds for a connection
-    connect_args={
-        # client-side timeouts (seconds) for pymysql driver
-        "connect_timeout": 10,
-        "read_timeout": 120,
-        "write_timeout": 120,
-    },
-    echo=False,  # Set to True for SQL debugging
-)
+def _connect_args(url):
+    # Client-side timeouts (seconds) for the pymysql driver.
+    if url.get_backend_name() == "mysql":
+        return {
+            "connect_timeout": 10,
+            "read_timeout": 120,
+            "write_timeout": 120,
+        }
+    return {}
 
-# Listen for pool events to handle lost connections
-@event.listens_for(engine, "connect")
-def receive_connect(dbapi_conn, connection_record):
-    """Called when a connection is created"""
-    pass
 
-@event.listens_for(engine, "close")
-def receive_close(dbapi_conn, connection_record):
-    """Called when a connection is closed"""
-    pass
+# Create engine with connection pool settings optimized for long-running processes.
+# Pool sizing comes from settings (DB_POOL_*); size it so that
+# uvicorn workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below the server's
+# max_connections, and use /api/v1/metrics/pool to check waits and overflow.
+def _create_engine(url, name):
+    url = make_url(url)
+    bind = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,  # Test connections before using them
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,  # Allow overflow connections
+        pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections to avoid server-side timeout
+        pool_timeout=settings.DB_POOL_TIMEOUT,  # Wait this long for a free connection
+        connect_args=_connect_args(url),
+        echo=False,  # Set to True for SQL debugging
+    )
+    # Pool event listeners feed the per-engine metrics
+    instrument_engine(bind, name)
+    return bind
 
-@event.listens_for(engine, "detach")
-def receive_detach(dbapi_conn, connection_record):
-    """Called when a connection is removed from the pool"""
-    pass
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
+
+
+# ---------------------------------------------------------------------------
+# Read replicas
+#
+# Public GET handlers take their session from get_read_db / get_async_read_db,
+# which spread reads over DATABASE_READ_URLS round-robin. Everything else
+# (admin, form submissions, scripts) stays on the primary. Without replicas
+# configured every session simply uses the primary.
+# ---------------------------------------------------------------------------
+
+# session.info keys used by RoutingSession
+REPLICAS_KEY = "read_replicas"
+REPLICA_BIND_KEY = "read_replica_bind"
+WROTE_KEY = "wrote"
+REQUEST_KEY = "request"
+
+# request.session key holding the time until which reads stay on the primary
+READ_PRIMARY_UNTIL_KEY = "db_read_primary_until"
+
+
+class ReplicaSet:
+    """
+    Round-robin set of replica engines with health-based ejection.
+
+    A replica whose connection fails (including a failed pool_pre_ping or
+    a refused connect) is taken out of rotation for `eject_seconds`; when
+    every replica is ejected `choose()` returns None and callers fall back
+    to the primary.
+    """
+
+    def __init__(self, engines, eject_seconds: float):
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self._cycle = itertools.cycle(range(len(self.engines)))
+        self._lock = threading.Lock()
+        self._ejected_until = {}
+        for bind in self.engines:
+            event.listen(bind, "handle_error", self._on_error)
+
+    def __bool__(self):
+        return bool(self.engines)
+
+    def _on_error(self, context):
+        if context.is_disconnect or context.is_pre_ping or context.connection is None:
+            self.eject(context.engine)
+
+    def eject(self, bind):
+        logger.warning(f"Ejecting read replica {bind.url!r} for {self.eject_seconds}s")
+        self._ejected_until[bind] = time.monotonic() + self.eject_seconds
+        bind.dispose()
+
+    def healthy(self, bind) -> bool:
+        return self._ejected_until.get(bind, 0.0) <= time.monotonic()
+
+    def choose(self):
+        """Next healthy replica engine, or None if none is available."""
+        with self._lock:
+            for _ in range(len(self.engines)):
+                bind = self.engines[next(self._cycle)]
+                if self.healthy(bind):
+                    return bind
+        return None
+
+    def status(self):
+        return [
+            {"url": bind.url.render_as_string(hide_password=True), "healthy": self.healthy(bind)}
+            for bind in self.engines
+        ]
+
+    def dispose(self):
+        for bind in self.engines:
+            bind.dispose()
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica when the caller opted in.
+
+    Sessions created with `info={REPLICAS_KEY: replica_set}` pin one replica
+    for their lifetime and send SELECTs to it. Flushes, DML statements and
+    every statement after the session first writes go to the primary, so a
+    session always reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replicas = self.info.get(REPLICAS_KEY)
+        if (
+            replicas
+            and not self._flushing
+            and not self.info.get(WROTE_KEY)
+            and not getattr(clause, "is_dml", False)
+        ):
+            bind = self.info.get(REPLICA_BIND_KEY)
+            if bind is None or not replicas.healthy(bind):
+                bind = replicas.choose()
+                self.info[REPLICA_BIND_KEY] = bind
+            if bind is not None:
+                return bind
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(session):
+    # Read-your-writes for the admin: after a committed write, that browser
+    # session's public reads go to the primary until replicas have caught up.
+    if not session.info.pop(WROTE_KEY, False):
+        return
+    request = session.info.get(REQUEST_KEY)
+    if request is not None and "session" in request.scope and settings.DATABASE_READ_STICKY_SECONDS > 0:
+        request.session[READ_PRIMARY_UNTIL_KEY] = time.time() + settings.DATABASE_READ_STICKY_SECONDS
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """True while `request`'s browser session is inside its post-write window."""
+    if "session" not in request.scope:
+        return False
+    return request.session.get(READ_PRIMARY_UNTIL_KEY, 0) > time.time()
+
+
+# Until this time.time(), every public read in this process goes to the
+# primary: caches dropped after a content change here must not be refilled
+# (and their ETags re-recorded) from a replica that has not replayed it yet.
+_primary_reads_until = 0.0
+
+
+def pin_reads_to_primary(seconds: float = None):
+    """Send this process's public reads to the primary for `seconds` (default DATABASE_READ_STICKY_SECONDS)."""
+    global _primary_reads_until
+    seconds = settings.DATABASE_READ_STICKY_SECONDS if seconds is None else seconds
+    _primary_reads_until = max(_primary_reads_until, time.time() + seconds)
+
+
+def process_reads_pinned_to_primary() -> bool:
+    """True while this process is inside a post-invalidation window."""
+    return _primary_reads_until > time.time()
+
+
+read_replicas = ReplicaSet(
+    [_create_engine(url, f"replica-{n}") for n, url in enumerate(settings.DATABASE_READ_URLS, 1)],
+    eject_seconds=settings.DATABASE_REPLICA_EJECT_SECONDS,
+)
 
 SessionLocal = sessionmaker(
     bind=engine,
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=True
 )
 
+# Async engine for the hot public read routes. Created on first use so the
+# asyncio driver (aiomysql / aiosqlite) is only required when it is needed;
+# the sync engine above keeps serving the admin UI and Alembic.
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+_async_engine = None
+_async_read_replicas = None
+
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def async_database_url(url: str = None):
+    """Return the asyncio-driver URL for `url` (defaults to settings)."""
+    if url is None and settings.ASYNC_DATABASE_URL:
+        return make_url(settings.ASYNC_DATABASE_URL)
+    url = make_url(url or settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if url.get_driver_name() in ASYNC_DRIVERS.values():
+        return url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for database backend '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def _async_engine_options(url):
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "echo": False}
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    if url.get_backend_name() == "mysql":
+        options["connect_args"] = {"connect_timeout": 10}
+    return options
+
+
+def _create_async_engine(url, name):
+    bind = create_async_engine(url, **_async_engine_options(url))
+    if isinstance(bind.sync_engine.pool, InstrumentedAsyncAdaptedQueuePool):
+        instrument_engine(bind.sync_engine, name)
+    return bind
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        url = async_database_url()
+        _async_engine = _create_async_engine(url, "async")
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+def get_async_read_replicas():
+    """Replica set for async sessions; holds the sync facades of async engines."""
+    global _async_read_replicas
+    if _async_read_replicas is None:
+        engines = []
+        for n, replica_url in enumerate(settings.DATABASE_READ_URLS, 1):
+            url = async_database_url(replica_url)
+            engines.append(_create_async_engine(url, f"async-replica-{n}").sync_engine)
+        _async_read_replicas = ReplicaSet(engines, eject_seconds=settings.DATABASE_REPLICA_EJECT_SECONDS)
+    return _async_read_replicas
+
+
 class Base(DeclarativeBase):
     pass
 
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    db = SessionLocal(info={REQUEST_KEY: request})
     try:
         yield db
     except Exception as e:
@@ -82,3 +323,57 @@ def get_db():
             db.close()
         except Exception as e:
             logger.error(f"Error closing database session: {e}")
+
+
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            try:
+                await db.rollback()
+            except Exception as re:
+                logger.error(f"Rollback failed (likely connection lost): {re}")
+            raise
+
+
+def get_read_db(request: Request):
+    """Session for public GET handlers; reads go to a replica when configured."""
+    if not read_replicas or reads_pinned_to_primary(request) or process_reads_pinned_to_primary():
+        yield from get_db(request)
+        return
+    db = SessionLocal(info={REPLICAS_KEY: read_replicas})
+    try:
+        yield db
+    except Exception as e:
+        logger.error(f"Database error: {e}")
+        try:
+            db.rollback()
+        except Exception as re:
+            logger.error(f"Rollback failed (likely connection lost): {re}")
+        raise
+    finally:
+        try:
+            db.close()
+        except Exception as e:
+            logger.error(f"Error closing database session: {e}")
+
+
+async def get_async_read_db(request: Request):
+    """Async session for public GET handlers; reads go to a replica when configured."""
+    get_async_engine()
+    info = {}
+    if settings.DATABASE_READ_URLS and not (reads_pinned_to_primary(request) or process_reads_pinned_to_primary()):
+        info[REPLICAS_KEY] = get_async_read_replicas()
+    async with AsyncSessionLocal(info=info) as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            try:
+                await db.rollback()
+            except Exception as re:
+                logger.error(f"Rollback failed (likely connection lost): {re}")
+            raise
@@ -0,0 +1,192 @@
+"""
+Connection pool instrumentation.
+
+Every engine created by app.core.database uses one of the instrumented pool
+classes below and is registered with `instrument_engine`, which hooks the
+pool events to count checkouts, invalidations and connection lifetimes.
+`pool_metrics` maps an engine name ("primary", "replica-1", "async", ...)
+to its PoolMetrics for the /api/v1/metrics/pool endpoint.
+"""
+from collections import deque
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Recent checkout waits kept for percentile estimates.
+WAIT_SAMPLE_SIZE = 1000
+
+_CREATED_AT = "metrics_created_at"
+
+pool_metrics = {}
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PoolMetrics:
+    """Counters for one engine's pool (per worker process)."""
+
+    def __init__(self, name: str, pool):
+        self.name = name
+        self.pool = pool
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.closes = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.checkout_timeouts = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.detaches = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._waits = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self.lifetime_count = 0
+        self.lifetime_total = 0.0
+        self.lifetime_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._waits.append(seconds)
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, self.pool.overflow())
+
+    def record_lifetime(self, connection_record):
+        created_at = connection_record.info.pop(_CREATED_AT, None)
+        if created_at is None:
+            return
+        seconds = time.monotonic() - created_at
+        with self._lock:
+            self.lifetime_count += 1
+            self.lifetime_total += seconds
+            self.lifetime_max = max(self.lifetime_max, seconds)
+
+    def stats(self):
+        pool = self.pool
+        with self._lock:
+            waits = list(self._waits)
+            return {
+                "name": self.name,
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow_in_use": max(0, pool.overflow()),
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": max(0, self.peak_overflow),
+                "connects": self.connects,
+                "closes": self.closes,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checkout_timeouts": self.checkout_timeouts,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "detaches": self.detaches,
+                "checkout_wait_ms": {
+                    "mean": round(1000 * self.wait_total / self.wait_count, 3) if self.wait_count else 0.0,
+                    "p95": round(1000 * _percentile(waits, 0.95), 3),
+                    "max": round(1000 * self.wait_max, 3),
+                },
+                "connection_lifetime_s": {
+                    "closed": self.lifetime_count,
+                    "mean": round(self.lifetime_total / self.lifetime_count, 1) if self.lifetime_count else 0.0,
+                    "max": round(self.lifetime_max, 1),
+                },
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including waits for a free connection."""
+
+    metrics = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """Attach pool event listeners to `engine` and register its metrics under `name`."""
+    metrics = PoolMetrics(name, engine.pool)
+    engine.pool.metrics = metrics
+    pool_metrics[name] = metrics
+
+    @event.listens_for(engine, "connect")
+    def receive_connect(dbapi_conn, connection_record):
+        """Called when a connection is created"""
+        connection_record.info[_CREATED_AT] = time.monotonic()
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def receive_checkout(dbapi_conn, connection_record, connection_proxy):
+        metrics.record_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def receive_checkin(dbapi_conn, connection_record):
+        metrics.checkins += 1
+
+    @event.listens_for(engine, "close")
+    def receive_close(dbapi_conn, connection_record):
+        """Called when a connection is closed"""
+        metrics.closes += 1
+        metrics.record_lifetime(connection_record)
+
+    @event.listens_for(engine, "detach")
+    def receive_detach(dbapi_conn, connection_record):
+        """Called when a connection is removed from the pool"""
+        metrics.detaches += 1
+        metrics.record_lifetime(connection_record)
+
+    @event.listens_for(engine, "invalidate")
+    def receive_invalidate(dbapi_conn, connection_record, exception):
+        metrics.invalidations += 1
+
+    @event.listens_for(engine, "soft_invalidate")
+    def receive_soft_invalidate(dbapi_conn, connection_record, exception):
+        metrics.soft_invalidations += 1
+
+    return metrics
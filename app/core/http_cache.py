@@ -0,0 +1,111 @@
+"""
+HTTP caching for public read endpoints: strong ETags, 304 Not Modified
+and per-endpoint Cache-Control policies.
+
+ETags are a hash of the response body. The last ETag computed for each
+host + URL (responses depend on the college resolved from the subdomain)
+is remembered together with the content version it was built at, so a
+conditional request arriving before any content change is answered with
+304 without running the endpoint at all.
+
+The content version is per worker process: a worker that did not handle
+an admin commit keeps answering 304 for at most HTTP_ETAG_INDEX_TTL
+seconds, after which the endpoint runs again and the ETag is recomputed
+from the body. Keep that TTL short in multi-worker deployments.
+"""
+import hashlib
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.services.cache import TTLCache
+from app.services.content_version import content_version
+
+
+# Cache-Control per endpoint name; override or extend through
+# settings.HTTP_CACHE_POLICIES (e.g. {"list_colleges": "public, max-age=600"}).
+DEFAULT_POLICIES = {
+    "list_colleges": "public, max-age=300, stale-while-revalidate=3600",
+    "get_college_details": "public, max-age=120, stale-while-revalidate=600",
+    "list_pages": "public, max-age=120, stale-while-revalidate=600",
+    "get_page_details": "public, max-age=60, stale-while-revalidate=600",
+    "get_page_by_college_and_slug": "public, max-age=60, stale-while-revalidate=600",
+    "search": "public, max-age=30, stale-while-revalidate=120",
+    "search_suggest": "public, max-age=60, stale-while-revalidate=300",
+    "home": "public, max-age=0, must-revalidate",
+}
+
+# host + URL -> (etag, content version it was computed at)
+etag_index = TTLCache(maxsize=4096, ttl=settings.HTTP_ETAG_INDEX_TTL, name="etags")
+
+
+def cache_policy(endpoint_name: str) -> str:
+    policies = {**DEFAULT_POLICIES, **settings.HTTP_CACHE_POLICIES}
+    return policies.get(endpoint_name, settings.HTTP_CACHE_DEFAULT_POLICY)
+
+
+def compute_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Evaluate an If-None-Match header against a strong ETag (weak comparison per RFC 9110)."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def _cache_key(request: Request) -> str:
+    host = request.headers.get("host", "").lower()
+    query = request.url.query
+    return f"{host}{request.url.path}?{query}" if query else f"{host}{request.url.path}"
+
+
+class CachedRoute(APIRoute):
+    """
+    APIRoute that adds ETag / Cache-Control headers to successful GET
+    responses and answers matching conditional requests with 304.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        if "GET" not in self.methods:
+            return handler
+
+        policy = cache_policy(self.name)
+
+        async def cached_handler(request: Request) -> Response:
+            key = _cache_key(request)
+            if_none_match = request.headers.get("if-none-match")
+            # Read the version before building so a concurrent admin commit
+            # leaves this entry stale rather than wrongly current.
+            version = content_version.current
+
+            known = etag_index.get(key)
+            if known and known[1] == version and etag_matches(if_none_match, known[0]):
+                return Response(status_code=304, headers={"ETag": known[0], "Cache-Control": policy, "Vary": "Host"})
+
+            response = await handler(request)
+            body = getattr(response, "body", None)
+            if response.status_code != 200 or body is None:
+                return response
+
+            etag = compute_etag(body)
+            etag_index.set(key, (etag, version))
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag, "Cache-Control": policy, "Vary": "Host"})
+
+            response.headers["ETag"] = etag
+            response.headers.setdefault("Cache-Control", policy)
+            # The subdomain selects the college, so shared caches must key on it.
+            vary = response.headers.get("Vary")
+            if not vary:
+                response.headers["Vary"] = "Host"
+            elif "host" not in vary.lower():
+                response.headers["Vary"] = f"{vary}, Host"
+            return response
+
+        return cached_handler
@@ -1,70 +1,98 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.models.college import College
-from app.core.database import SessionLocal
+from starlette.datastructures import Headers, QueryParams
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.services.college_cache import college_directory
 import logging
 
 logger = logging.getLogger(__name__)
 
-class CollegeResolverMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        host = request.headers.get("host", "")
+# Paths that never need a college context; skip all lookups for them.
+SKIP_PATH_PREFIXES = ("/static", "/health", "/docs", "/redoc", "/openapi.json", "/favicon.ico")
+
+# Hosts whose first label is not a college subdomain.
+NON_COLLEGE_SUBDOMAINS = ("www", "ipsacademy", "localhost")
+
+
+class LazyRequestState(dict):
+    """
+    Backing dict for `request.state` whose college entries are computed the
+    first time a handler reads them (e.g. `request.state.college`) and then
+    memoised for the rest of the request.
+    """
+
+    def __init__(self, initial, resolvers):
+        super().__init__(initial)
+        self._resolvers = resolvers
+
+    def __missing__(self, key):
+        resolver = self._resolvers.get(key)
+        if resolver is None:
+            raise KeyError(key)
+        value = resolver()
+        self[key] = value
+        return value
+
+
+def _resolve_college(subdomain: str):
+    # Subdomain-based college resolution (for frontend), served from the
+    # in-memory college snapshot rather than a per-request query.
+    if not subdomain or subdomain in NON_COLLEGE_SUBDOMAINS:
+        return None
+    try:
+        return college_directory.by_subdomain(subdomain)
+    except Exception as e:
+        logger.error(f"Error resolving college by subdomain: {e}")
+        return None
+
+
+def _colleges_for_dropdown():
+    # Root colleges for the dropdown in admin templates
+    try:
+        return college_directory.roots()
+    except Exception as e:
+        logger.error(f"Error fetching colleges for dropdown: {e}")
+        return []
+
+
+class CollegeResolverMiddleware:
+    """
+    Pure ASGI middleware exposing college context on `request.state`:
+    `college`, `selected_college_id` and `colleges_for_dropdown`.
+
+    Nothing is looked up until a handler reads one of those attributes, and
+    the response stream is passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(SKIP_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        host = Headers(scope=scope).get("host", "")
         subdomain = host.split(".")[0]
+        session = scope.get("session")
 
-        db = SessionLocal()
-        college = None
-        
         # Get college_id from query params or session
-        college_id = request.query_params.get("college_id")
+        college_id = QueryParams(scope.get("query_string", b"")).get("college_id")
         if college_id:
             try:
-                request.session["selected_college_id"] = int(college_id)
-            except RuntimeError:
-                # Session not available yet (might be during non-admin request)
-                pass
-        else:
-            # Try to get from session
-            try:
-                college_id = request.session.get("selected_college_id")
-            except RuntimeError:
+                college_id = int(college_id)
+                if session is not None:
+                    session["selected_college_id"] = college_id
+            except ValueError:
                 college_id = None
+        elif session is not None:
+            college_id = session.get("selected_college_id")
 
-        # Subdomain-based college resolution (for frontend)
-        if subdomain not in ["www", "ipsacademy", "localhost"]:
-            try:
-                college = db.query(College).filter(
-                    College.subdomain == subdomain,
-                    College.is_active == True
-                ).first()
-            except Exception as e:
-                logger.error(f"Error resolving college by subdomain: {e}")
-                college = None
-
-        request.state.college = college
-        request.state.selected_college_id = int(college_id) if college_id else None
-        
-        # Pre-fetch colleges for dropdown in admin templates
-        if "/admin" in request.url.path:
-            try:
-                all_colleges = db.query(College).filter(College.parent_id == None).all()
-                request.state.colleges_for_dropdown = all_colleges
-            except Exception as e:
-                logger.error(f"Error fetching colleges for dropdown: {e}")
-                request.state.colleges_for_dropdown = []
-        
-        try:
-            response = await call_next(request)
-        finally:
-            # Safely close the database session
-            try:
-                db.close()
-            except Exception as e:
-                logger.error(f"Error closing database session: {e}")
-                # Dispose of the session if close fails
-                try:
-                    db.dispose()
-                except:
-                    pass
-        
-        return response
+        scope["state"] = LazyRequestState(
+            scope.get("state") or {},
+            {
+                "college": lambda: _resolve_college(subdomain),
+                "colleges_for_dropdown": _colleges_for_dropdown,
+            },
+        )
+        scope["state"]["selected_college_id"] = int(college_id) if college_id else None
 
+        await self.app(scope, receive, send)
@@ -0,0 +1,84 @@
+"""
+The shared Jinja environment over `templet/`.
+
+Public, admin and example routers, the static publisher and the fragment
+cache all render through `templates` / `template_env`, so each template is
+compiled once per process. Compiled bytecode is kept on disk by a
+FileSystemBytecodeCache, so a restarted worker loads it instead of parsing
+the sources again, and `warm_templates` precompiles the admin UI at startup.
+Outside development the sources are not re-checked for changes on every
+render (TEMPLATE_AUTO_RELOAD overrides this).
+"""
+import logging
+import os
+import time
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templet"
+
+# Templates compiled by `warm_templates` at startup
+WARM_TEMPLATE_PATTERNS = ("admin/*.html", "index.html", "includes/*.html")
+
+
+def _auto_reload():
+    if settings.TEMPLATE_AUTO_RELOAD is not None:
+        return settings.TEMPLATE_AUTO_RELOAD
+    return settings.ENV.lower() not in ("prod", "production")
+
+
+def _bytecode_cache():
+    """
+    Bytecode cache in TEMPLATE_BYTECODE_CACHE_DIR, else a per-user directory
+    under the system temp dir. Falls back to the latter, and then to no disk
+    cache at all, when a directory cannot be created or written (e.g. a
+    read-only filesystem); templates are then compiled from source.
+    """
+    if settings.TEMPLATE_BYTECODE_CACHE_DIR:
+        directory = Path(settings.TEMPLATE_BYTECODE_CACHE_DIR)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            if not os.access(directory, os.W_OK | os.X_OK):
+                raise PermissionError(f"{directory} is not writable")
+            return FileSystemBytecodeCache(str(directory))
+        except OSError as e:
+            logger.warning(f"Template bytecode cache directory unusable, using the default: {e}")
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Template bytecode cache disabled: {e}")
+        return None
+
+
+template_env = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=select_autoescape(),
+    bytecode_cache=_bytecode_cache(),
+    auto_reload=_auto_reload(),
+)
+templates = Jinja2Templates(env=template_env)
+
+
+def warm_templates(patterns=WARM_TEMPLATE_PATTERNS):
+    """Compile the templates matching `patterns` into the environment cache; returns the count."""
+    start = time.perf_counter()
+    names = sorted({
+        path.relative_to(TEMPLATES_DIR).as_posix()
+        for pattern in patterns
+        for path in TEMPLATES_DIR.glob(pattern)
+    })
+    compiled = 0
+    for name in names:
+        try:
+            template_env.get_template(name)
+            compiled += 1
+        except Exception:
+            logger.exception(f"Failed to compile template {name}")
+    logger.info(f"Warmed {compiled} templates in {time.perf_counter() - start:.2f}s")
+    return compiled
@@ -1,22 +1,76 @@
+from contextlib import asynccontextmanager
+from pathlib import Path
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
 from app.core.middleware import CollegeResolverMiddleware
+from app.core.templates import warm_templates
 from app.api.v1.router import api_router
+from app.services import derived_tables
+from app.services.college_cache import college_directory
+from app.services.image_derivatives import derivative_pool
+from app.services.search import build_search_indexes
 import logging
 from starlette.middleware.sessions import SessionMiddleware
 
+# The publisher (file locks, symlinks) is only loaded when it is configured.
+static_publisher = None
+if settings.STATIC_PUBLISH_DIR:
+    from app.services.static_publisher import static_publisher
+
+# Derived tables (tree paths, college_stats, effective_pages) follow ORM writes.
+derived_tables.register()
+
 try:
     from app.api.v1 import admin as admin_module
 except Exception as e:
     logging.exception("Failed to import admin module")
     admin_module = None
 
-app = FastAPI(title=settings.APP_NAME)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the in-process search and typeahead indexes before serving traffic;
+    # if the database is unavailable they are built on first use instead.
+    try:
+        await run_in_threadpool(build_search_indexes)
+    except Exception:
+        logging.exception("Failed to build search indexes at startup")
+    # Load the college snapshot used to resolve subdomains; expired copies
+    # are then reloaded in the background while requests keep using them.
+    try:
+        await run_in_threadpool(college_directory.warm)
+    except Exception:
+        logging.exception("Failed to load the college directory at startup")
+    # Compile the admin UI templates now rather than on the first page views.
+    try:
+        await run_in_threadpool(warm_templates)
+    except Exception:
+        logging.exception("Failed to warm templates at startup")
+    if static_publisher is not None and settings.STATIC_PUBLISH_ON_CHANGE:
+        static_publisher.start()
+        if not (Path(settings.STATIC_PUBLISH_DIR) / "current").exists():
+            static_publisher.request_publish()
+    yield
+    if static_publisher is not None:
+        static_publisher.stop()
+    derivative_pool.shutdown(wait=False)
+
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 # Mount static files for admin templates
 app.mount("/static", StaticFiles(directory="templet/static"), name="static")
 
+# Pre-rendered public pages; `current` is a symlink swapped on each publish.
+if settings.STATIC_PUBLISH_DIR:
+    app.mount(
+        settings.STATIC_PUBLISH_URL,
+        StaticFiles(directory=str(Path(settings.STATIC_PUBLISH_DIR) / "current"), html=True, check_dir=False),
+        name="published",
+    )
+
 # Middleware order matters: added first = executed last
 # We need SessionMiddleware to execute FIRST (innermost)
 # So add CollegeResolverMiddleware first, then SessionMiddleware
@@ -1,5 +1,5 @@
 from sqlalchemy import Integer, String, Boolean, DateTime, Text, func, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
 from typing import List
 from app.core.database import Base
 
@@ -9,6 +9,8 @@ class College(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     parent_id: Mapped[int] = mapped_column(ForeignKey("colleges.id", ondelete="SET NULL"), nullable=True)
+    # Materialized ancestry "/<root id>/.../<id>/", maintained by app.services.tree_paths
+    path: Mapped[str] = mapped_column(String(255), nullable=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     slug: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     subdomain: Mapped[str] = mapped_column(String(255), nullable=True, unique=True)
@@ -30,9 +32,14 @@ class College(Base):
     
     def get_root_college(self):
         """Get the root (parent) college in the hierarchy"""
-        if self.parent_id:
-            return self.parent.get_root_college()
-        return self
+        session = object_session(self)
+        if session is None or self.id is None:
+            if self.parent_id:
+                return self.parent.get_root_college()
+            return self
+        from app.services.college_cache import college_directory
+        root_id = college_directory.root_id(session, self.id)
+        return session.get(College, root_id) if root_id is not None else self
     
     def is_child(self):
         """Check if this is a child college"""
@@ -49,6 +49,7 @@ class Page(Base):
         UniqueConstraint("college_id", "slug", name="uq_pages_college_slug"),
         Index("ix_pages_college_active", "college_id", "is_active"),
         Index("ix_pages_parent_id", "parent_page_id"),
+        Index("ix_pages_path", "path"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -61,6 +62,8 @@ class Page(Base):
     template_type: Mapped[str] = mapped_column(String(50), nullable=True)
     # For inheritance: parent page (when child college inherits from parent college)
     parent_page_id: Mapped[int] = mapped_column(ForeignKey("pages.id", ondelete="SET NULL"), nullable=True)
+    # Materialized inheritance chain "/<source page id>/.../<id>/", maintained by app.services.tree_paths
+    path: Mapped[str] = mapped_column(String(255), nullable=True)
     # Whether this page can be inherited by child colleges
     is_inheritable: Mapped[bool] = mapped_column(Boolean, default=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -283,6 +286,9 @@ class Recruiter(Base):
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        Index("ix_activities_college_event_date", "college_id", "event_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     college_id: Mapped[int] = mapped_column(ForeignKey("colleges.id", ondelete="CASCADE"), nullable=False)
@@ -396,4 +402,49 @@ class MediaAsset(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=True)
     alt_text: Mapped[str] = mapped_column(String(255), nullable=True)
     media_type: Mapped[str] = mapped_column(String(50), nullable=True)  # image / video / document
-    meta: Mapped[dict] = mapped_column(JSON, nullable=True)
\ No newline at end of file
+    meta: Mapped[dict] = mapped_column(JSON, nullable=True)
+
+
+class CollegeStats(Base):
+    """
+    Materialized per-college counts and latest placement figures.
+
+    Kept current inside the writing transaction by app.services.college_stats
+    (session events); rebuild with scripts/rebuild_college_stats.py.
+    """
+
+    __tablename__ = "college_stats"
+
+    college_id: Mapped[int] = mapped_column(ForeignKey("colleges.id", ondelete="CASCADE"), primary_key=True)
+    pages_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    courses_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    active_courses_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    faculty_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    active_faculty_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    facilities_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    activities_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latest_placement_year: Mapped[int] = mapped_column(Integer, nullable=True)
+    latest_highest_package: Mapped[float] = mapped_column(Float, nullable=True)
+    latest_average_package: Mapped[float] = mapped_column(Float, nullable=True)
+    latest_placement_percentage: Mapped[float] = mapped_column(Float, nullable=True)
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class EffectivePage(Base):
+    """
+    Page served for each (college, slug) once inheritance is resolved.
+    Maintained by app.services.effective_pages; rebuild with
+    scripts/rebuild_effective_pages.py.
+    """
+
+    __tablename__ = "effective_pages"
+
+    college_id: Mapped[int] = mapped_column(ForeignKey("colleges.id", ondelete="CASCADE"), primary_key=True)
+    slug: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # The college's own page or an inheritable page of an ancestor college
+    page_id: Mapped[int] = mapped_column(ForeignKey("pages.id", ondelete="CASCADE"), nullable=False)
+    # Page whose sections are rendered; differs from page_id for inherited
+    # copies (see inherit_page) that have no sections of their own
+    content_page_id: Mapped[int] = mapped_column(ForeignKey("pages.id", ondelete="CASCADE"), nullable=False)
+    # 0 for the college's own page, 1 for the parent college, ...
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1 @@
+"""app.services package"""
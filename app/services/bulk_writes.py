@@ -0,0 +1,71 @@
+"""
+Helpers for `do_orm_execute` listeners that keep derived data in step with
+bulk ORM `update()` / `delete()` statements.
+
+The flush hooks see each changed instance; bulk statements bypass them, so
+listeners use these helpers to find out which columns a statement assigns and
+which rows it is about to touch, and rescope their refresh to just those.
+"""
+from sqlalchemy import select, tuple_
+from sqlalchemy.sql.elements import BindParameter
+
+
+def _bulk_rows(orm_execute_state):
+    """Parameter dicts of an UPDATE by primary key (`execute(update(Model), [...])`), else None."""
+    parameters = orm_execute_state.parameters
+    if orm_execute_state.is_update and isinstance(parameters, list):
+        return parameters
+    return None
+
+
+def assigned_columns(orm_execute_state):
+    """Names of the columns an UPDATE statement assigns (none for a DELETE)."""
+    if not orm_execute_state.is_update:
+        return set()
+    rows = _bulk_rows(orm_execute_state)
+    if rows is not None:
+        return {key for row in rows for key in row}
+    return {getattr(column, "key", column) for column in orm_execute_state.statement._values or {}}
+
+
+def assigned_values(orm_execute_state, key):
+    """
+    Values an UPDATE statement assigns to column `key`: an empty set when it
+    does not assign it, None when a value is only known in the database (an
+    SQL expression such as `college_id + 1`).
+    """
+    if not orm_execute_state.is_update:
+        return set()
+    rows = _bulk_rows(orm_execute_state)
+    if rows is not None:
+        return {row[key] for row in rows if key in row}
+    for column, value in (orm_execute_state.statement._values or {}).items():
+        if getattr(column, "key", column) == key:
+            return {value.value} if isinstance(value, BindParameter) else None
+    return set()
+
+
+def matched_values(orm_execute_state, column):
+    """
+    Current values of `column` in the rows the statement is about to update
+    or delete; call before the statement runs. `column` belongs to the
+    statement's entity (or joins to it through the statement's criteria).
+    """
+    mapper = orm_execute_state.bind_mapper
+    rows = _bulk_rows(orm_execute_state)
+    query = select(column).distinct()
+    if rows is not None:
+        keys = [key.key for key in mapper.primary_key]
+        if len(keys) == 1:
+            query = query.where(mapper.primary_key[0].in_([row[keys[0]] for row in rows]))
+        else:
+            query = query.where(tuple_(*mapper.primary_key).in_([tuple(row[key] for key in keys) for row in rows]))
+    else:
+        query = query.select_from(mapper)
+        if orm_execute_state.statement.whereclause is not None:
+            query = query.where(orm_execute_state.statement.whereclause)
+    return set(
+        orm_execute_state.session.execute(
+            query, orm_execute_state.parameters if rows is None else None
+        ).scalars()
+    )
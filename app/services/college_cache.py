@@ -0,0 +1,231 @@
+"""
+In-memory snapshot of the colleges table, shared by request routing and
+hierarchy lookups.
+
+The snapshot is loaded with a single flat query and assembled in memory, so
+resolving a subdomain needs no database connection and root, ancestor,
+descendant and dropdown lookups cost no round trips per level or per child.
+It is dropped after any committed write to a college in this process, and
+otherwise kept for COLLEGE_CACHE_TTL seconds so changes made by other
+workers show up. Subdomain and dropdown lookups made while serving a
+request never wait for the query once a snapshot exists: an expired one
+keeps answering while a single background thread reloads it. Hierarchy
+lookups pass their session and reload an expired snapshot inline.
+"""
+from dataclasses import dataclass
+import logging
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.college import College
+
+logger = logging.getLogger(__name__)
+
+_CHANGED = "college_directory_changed"
+
+
+@dataclass(frozen=True)
+class CollegeRef:
+    """Detached, read-only view of a college row plus its children ids."""
+    id: int
+    parent_id: int
+    name: str
+    slug: str
+    subdomain: str
+    logo_url: str
+    theme_primary_color: str
+    theme_secondary_color: str
+    is_active: bool
+    children: tuple = ()
+
+
+class CollegeDirectory:
+    """Subdomain and parent/child lookups backed by a TTL snapshot of the colleges table."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._expires_at = 0.0
+        self._generation = 0
+        self._loaded = False
+        self._refreshing = False
+        self._nodes = {}
+        self._by_subdomain = {}
+        self._root_ids = ()
+
+    def _load(self, db: Session = None):
+        generation = self._generation
+        session = db if db is not None else SessionLocal()
+        try:
+            rows = session.query(
+                College.id,
+                College.parent_id,
+                College.name,
+                College.slug,
+                College.subdomain,
+                College.logo_url,
+                College.theme_primary_color,
+                College.theme_secondary_color,
+                College.is_active,
+            ).order_by(College.id).all()
+        finally:
+            if db is None:
+                session.close()
+
+        children = {}
+        for row in rows:
+            children.setdefault(row.parent_id, []).append(row.id)
+        ids = {row.id for row in rows}
+        self._nodes = {row.id: CollegeRef(*row, children=tuple(children.get(row.id, ()))) for row in rows}
+        self._by_subdomain = {
+            c.subdomain: c for c in self._nodes.values() if c.subdomain and c.is_active
+        }
+        # A parent_id pointing at a missing row makes the college a root.
+        self._root_ids = tuple(row.id for row in rows if row.parent_id is None or row.parent_id not in ids)
+        self._loaded = True
+        # Invalidated while reading: the rows may predate that commit.
+        if generation == self._generation:
+            self._expires_at = time.monotonic() + self.ttl
+
+    @property
+    def is_stale(self):
+        return time.monotonic() >= self._expires_at
+
+    def _ensure_fresh(self, db: Session = None):
+        if not self.is_stale:
+            return
+        with self._lock:
+            if not self.is_stale:
+                return
+            self._load(db)
+
+    def _refresh_in_background(self):
+        try:
+            self._ensure_fresh()
+        except Exception as e:
+            logger.error(f"College directory refresh failed: {e}")
+        finally:
+            self._refreshing = False
+
+    def _maybe_refresh(self):
+        if not self.is_stale:
+            return
+        if not self._loaded:
+            self._ensure_fresh()
+            return
+        if self._refreshing:
+            return
+        self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="college-directory", daemon=True).start()
+
+    def warm(self):
+        """Load the snapshot now so the first request does not wait for it."""
+        self._ensure_fresh()
+
+    def invalidate(self):
+        """Force the next lookup to reload the snapshot."""
+        self._generation += 1
+        self._expires_at = 0.0
+
+    # ----- request routing -----
+
+    def by_subdomain(self, subdomain: str):
+        """Active college for `subdomain`, or None."""
+        self._maybe_refresh()
+        return self._by_subdomain.get(subdomain)
+
+    def roots(self):
+        """Root colleges (no parent), used by the admin college dropdown."""
+        self._maybe_refresh()
+        roots = (self._nodes.get(i) for i in self._root_ids)
+        return [c for c in roots if c is not None and c.parent_id is None]
+
+    # ----- hierarchy; `db` loads an expired snapshot on the caller's session -----
+
+    def get(self, db: Session, college_id: int):
+        """CollegeRef for `college_id`, or None."""
+        self._ensure_fresh(db)
+        return self._nodes.get(college_id)
+
+    def ancestor_ids(self, db: Session, college_id: int):
+        """Ids from `college_id` up to its root, nearest first."""
+        self._ensure_fresh(db)
+        nodes = self._nodes
+        result = []
+        node = nodes.get(college_id)
+        while node is not None and node.id not in result:
+            result.append(node.id)
+            node = nodes.get(node.parent_id)
+        return result
+
+    def root_id(self, db: Session, college_id: int):
+        """Id of the root of `college_id`'s tree, or None if it does not exist."""
+        ancestors = self.ancestor_ids(db, college_id)
+        return ancestors[-1] if ancestors else None
+
+    def subtree(self, db: Session, college_id: int, depth: int = 0):
+        """(college, depth) pairs for `college_id` and its descendants, depth first."""
+        self._ensure_fresh(db)
+        return list(self._walk(college_id, depth, set()))
+
+    def _walk(self, college_id, depth, seen):
+        node = self._nodes.get(college_id)
+        if node is None or node.id in seen:
+            return
+        seen.add(node.id)
+        yield node, depth
+        for child_id in node.children:
+            yield from self._walk(child_id, depth + 1, seen)
+
+    def descendant_ids(self, db: Session, college_id: int):
+        """`college_id` and all its descendants, depth first."""
+        return [node.id for node, _ in self.subtree(db, college_id)]
+
+    def forest(self, db: Session):
+        """(college, depth) pairs for every college, roots first then children."""
+        self._ensure_fresh(db)
+        seen = set()
+        result = []
+        for root_id in self._root_ids:
+            result.extend(self._walk(root_id, 0, seen))
+        return result
+
+
+college_directory = CollegeDirectory(ttl=settings.COLLEGE_CACHE_TTL)
+
+
+def mark_colleges_changed(session: Session):
+    """Drop the snapshot when `session` commits; for colleges written with Core statements."""
+    session.info[_CHANGED] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_college_writes(session, flush_context):
+    if any(isinstance(obj, College) for obj in (*session.new, *session.dirty, *session.deleted)):
+        mark_colleges_changed(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_college_writes(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ is College:
+            mark_colleges_changed(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop(_CHANGED, False):
+        college_directory.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_on_rollback(session, previous_transaction):
+    # The snapshot may have been loaded inside the rolled-back transaction.
+    if session.info.pop(_CHANGED, False):
+        college_directory.invalidate()
@@ -0,0 +1,318 @@
+"""
+Maintenance and reads of the materialized `college_stats` table.
+
+Session events turn each flush into +/- deltas per college (rows added,
+removed, moved to another college or (de)activated) and apply them with
+`UPDATE college_stats SET x = x + delta` in the same transaction, so the
+stats commit or roll back together with the write. Concurrent writers to
+one college serialize on its stats row instead of overwriting each other's
+counts with a recount from their own snapshot; rows are updated in
+college_id order so two writers cannot deadlock on them. Latest placement
+figures are re-read when placements change. New colleges get their row
+from a recount. Bulk update()/delete() statements that touch a counted
+table's college_id, is_active or placement figures have the colleges of
+the rows they match (and any college they move rows to) recounted before
+commit.
+"""
+from collections import Counter, defaultdict
+
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.models.college import College
+from app.schemas.schema import (
+    Activity,
+    CollegeStats,
+    Course,
+    Facility,
+    Faculty,
+    Page,
+    Placement,
+)
+from app.services import bulk_writes
+
+# Models whose rows are counted per college
+COUNTED_MODELS = (Page, Course, Faculty, Facility, Activity, Placement)
+
+# Counter column and, for models with is_active, active counter column
+COUNT_COLUMNS = {
+    Page: ("pages_count", None),
+    Course: ("courses_count", "active_courses_count"),
+    Faculty: ("faculty_count", "active_faculty_count"),
+    Facility: ("facilities_count", None),
+    Activity: ("activities_count", None),
+}
+
+_DELTAS = "college_stats_deltas"
+_PLACEMENTS = "college_stats_placements"
+_NEW = "college_stats_new"
+_DELETED = "college_stats_deleted"
+_REBUILD = "college_stats_rebuild"
+_ALL = "all"
+
+# Columns whose bulk updates change a model's stats
+_STATS_INPUTS = {
+    **{model: {"college_id", "is_active"} for model in COUNT_COLUMNS},
+    Placement: {"college_id", "year", "highest_package", "average_package", "placement_percentage"},
+}
+
+
+def _latest_placement(column, college_id):
+    return (
+        select(column)
+        .where(Placement.college_id == college_id)
+        .order_by(Placement.year.desc(), Placement.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def _stats_select(college_ids=None):
+    """SELECT producing college_stats rows for `college_ids` (all when None)."""
+    college_id = College.id
+
+    def count(model, *criteria):
+        return (
+            select(func.count(model.id))
+            .where(model.college_id == college_id, *criteria)
+            .scalar_subquery()
+        )
+
+    def latest(column):
+        return _latest_placement(column, college_id)
+
+    stmt = select(
+        college_id,
+        count(Page),
+        count(Course),
+        count(Course, Course.is_active == True),
+        count(Faculty),
+        count(Faculty, Faculty.is_active == True),
+        count(Facility),
+        count(Activity),
+        latest(Placement.year),
+        latest(Placement.highest_package),
+        latest(Placement.average_package),
+        latest(Placement.placement_percentage),
+        func.now(),
+    )
+    if college_ids is not None:
+        stmt = stmt.where(college_id.in_(college_ids))
+    return stmt
+
+
+_STATS_COLUMNS = [
+    "college_id",
+    "pages_count",
+    "courses_count",
+    "active_courses_count",
+    "faculty_count",
+    "active_faculty_count",
+    "facilities_count",
+    "activities_count",
+    "latest_placement_year",
+    "latest_highest_package",
+    "latest_average_package",
+    "latest_placement_percentage",
+    "updated_at",
+]
+
+
+def refresh_college_stats(connection, college_ids=None):
+    """
+    Recompute college_stats rows for `college_ids` (every college when None)
+    on `connection` (a Connection or Session), inside its transaction.
+    """
+    if college_ids is not None:
+        college_ids = sorted(set(college_ids))
+        if not college_ids:
+            return
+        connection.execute(delete(CollegeStats).where(CollegeStats.college_id.in_(college_ids)))
+    else:
+        connection.execute(delete(CollegeStats))
+    connection.execute(insert(CollegeStats).from_select(_STATS_COLUMNS, _stats_select(college_ids)))
+
+
+def apply_college_stats_deltas(connection, deltas, placement_college_ids=()):
+    """
+    Add `deltas` ({college_id: {column: delta}}) to the college_stats rows
+    and re-read the latest placement of `placement_college_ids`. Colleges
+    without a row yet are recounted instead.
+    """
+    college_ids = sorted({*deltas, *placement_college_ids})
+    if not college_ids:
+        return
+    existing = set(connection.execute(
+        select(CollegeStats.college_id).where(CollegeStats.college_id.in_(college_ids))
+    ).scalars())
+    missing = [college_id for college_id in college_ids if college_id not in existing]
+    if missing:
+        refresh_college_stats(connection, missing)
+
+    table = CollegeStats.__table__
+    for college_id in college_ids:
+        if college_id not in existing:
+            continue
+        values = {
+            column: table.c[column] + delta
+            for column, delta in deltas.get(college_id, {}).items()
+            if delta
+        }
+        if college_id in placement_college_ids:
+            values.update(
+                latest_placement_year=_latest_placement(Placement.year, table.c.college_id),
+                latest_highest_package=_latest_placement(Placement.highest_package, table.c.college_id),
+                latest_average_package=_latest_placement(Placement.average_package, table.c.college_id),
+                latest_placement_percentage=_latest_placement(Placement.placement_percentage, table.c.college_id),
+            )
+        if values:
+            connection.execute(
+                update(table).where(table.c.college_id == college_id).values(**values, updated_at=func.now())
+            )
+
+
+def rebuild_college_stats(db: Session):
+    """Rebuild the whole table and commit; used by scripts/rebuild_college_stats.py."""
+    refresh_college_stats(db)
+    db.commit()
+    return db.query(func.count(CollegeStats.college_id)).scalar()
+
+
+def get_college_stats(db: Session, college_id: int):
+    """The CollegeStats row for a college (primary key lookup), or None."""
+    return db.get(CollegeStats, college_id)
+
+
+def _value(obj, key, previous):
+    """Current value of `obj.key`, or the one it had before this flush."""
+    if previous:
+        history = inspect(obj).attrs[key].history
+        if history.deleted:
+            return history.deleted[0]
+        if history.added:
+            return None
+    return getattr(obj, key)
+
+
+def _counted(obj, previous=False):
+    """(college_id, columns) an instance is counted under, now or before this flush."""
+    count_column, active_column = COUNT_COLUMNS[type(obj)]
+    columns = [count_column]
+    if active_column and _value(obj, "is_active", previous):
+        columns.append(active_column)
+    return _value(obj, "college_id", previous), columns
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    # Registered with active_history so the old value is loaded (even on an
+    # expired instance) and shows up in the attribute history.
+    return value
+
+
+def _load_deleted_state(session, flush_context, instances):
+    # The counters a deleted row leaves are read after its DELETE ran, when
+    # expired attributes could no longer be loaded.
+    for obj in session.deleted:
+        if type(obj) in COUNT_COLUMNS:
+            _counted(obj)
+
+
+def _collect_deltas(session, flush_context):
+    changes = [
+        (obj, state)
+        for state, objs in (("new", session.new), ("dirty", session.dirty), ("deleted", session.deleted))
+        for obj in objs
+        if isinstance(obj, (*COUNTED_MODELS, College))
+    ]
+    if not changes:
+        return
+    deltas = session.info.setdefault(_DELTAS, defaultdict(Counter))
+    for obj, state in changes:
+        if isinstance(obj, College):
+            if state != "dirty":
+                session.info.setdefault(_NEW if state == "new" else _DELETED, set()).add(obj.id)
+            continue
+        if isinstance(obj, Placement):
+            college_ids = {obj.college_id, *inspect(obj).attrs.college_id.history.deleted}
+            session.info.setdefault(_PLACEMENTS, set()).update(i for i in college_ids if i is not None)
+            continue
+        before = None if state == "new" else _counted(obj, previous=True)
+        after = None if state == "deleted" else _counted(obj)
+        if before == after:
+            continue
+        for counted, sign in ((before, -1), (after, 1)):
+            if counted and counted[0] is not None:
+                for column in counted[1]:
+                    deltas[counted[0]][column] += sign
+
+
+def _apply_deltas(session, flush_context):
+    deltas = session.info.pop(_DELTAS, None) or {}
+    placements = session.info.pop(_PLACEMENTS, set())
+    created = session.info.pop(_NEW, set())
+    deleted = session.info.pop(_DELETED, set())
+    connection = session.connection()
+    if deleted:
+        connection.execute(delete(CollegeStats).where(CollegeStats.college_id.in_(deleted)))
+    if created - deleted:
+        # Counted from scratch; nobody else can write to a college being created.
+        refresh_college_stats(connection, created - deleted)
+    skip = created | deleted
+    apply_college_stats_deltas(
+        connection,
+        {college_id: d for college_id, d in deltas.items() if college_id not in skip},
+        placements - skip,
+    )
+
+
+def _track_bulk_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    model = mapper.class_ if mapper is not None else None
+    if model not in (*COUNTED_MODELS, College):
+        return
+    if orm_execute_state.is_update:
+        if model is College or not bulk_writes.assigned_columns(orm_execute_state) & _STATS_INPUTS[model]:
+            return
+    college_ids = bulk_writes.matched_values(orm_execute_state, College.id if model is College else model.college_id)
+    if orm_execute_state.is_update:
+        moved_to = bulk_writes.assigned_values(orm_execute_state, "college_id")
+        if moved_to is None:
+            # Moved by an SQL expression: the new colleges are unknown.
+            college_ids = None
+        else:
+            college_ids |= moved_to
+    rebuild = orm_execute_state.session.info.setdefault(_REBUILD, set())
+    if college_ids is None or rebuild is _ALL:
+        orm_execute_state.session.info[_REBUILD] = _ALL
+    else:
+        rebuild.update(i for i in college_ids if i is not None)
+
+
+def _rebuild_after_bulk_writes(session):
+    college_ids = session.info.pop(_REBUILD, None)
+    if college_ids is _ALL:
+        refresh_college_stats(session.connection())
+    elif college_ids:
+        refresh_college_stats(session.connection(), college_ids)
+
+
+def _reset_on_rollback(session, previous_transaction):
+    for key in (_DELTAS, _PLACEMENTS, _NEW, _DELETED, _REBUILD):
+        session.info.pop(key, None)
+
+
+def register():
+    """Wire session and attribute events that keep college_stats in step with ORM writes."""
+    for model in (*COUNT_COLUMNS, Placement):
+        event.listen(model.college_id, "set", _load_previous_value, active_history=True, retval=True)
+    for model, (_, active_column) in COUNT_COLUMNS.items():
+        if active_column:
+            event.listen(model.is_active, "set", _load_previous_value, active_history=True, retval=True)
+    event.listen(Session, "before_flush", _load_deleted_state)
+    event.listen(Session, "after_flush", _collect_deltas)
+    event.listen(Session, "after_flush_postexec", _apply_deltas)
+    event.listen(Session, "do_orm_execute", _track_bulk_writes)
+    event.listen(Session, "before_commit", _rebuild_after_bulk_writes)
+    event.listen(Session, "after_soft_rollback", _reset_on_rollback)
@@ -0,0 +1,143 @@
+"""
+College detail summary for the public college page.
+
+Stats and the latest placement come from the materialized `college_stats`
+row (falling back to COUNT aggregates if it is missing) and the
+course/faculty/facility previews are LIMITed queries, so the cost of
+building a summary does not depend on how many rows a college has.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.college import College
+from app.schemas.schema import Activity, Admission, Course, Facility, Faculty, Placement
+from app.services.college_stats import get_college_stats
+
+# Preview sizes shown on the college page
+COURSE_PREVIEW = 10
+FACULTY_PREVIEW = 8
+FACILITY_PREVIEW = 6
+
+
+def _counts(db: Session, college_id: int):
+    def count(model, *criteria):
+        return (
+            select(func.count(model.id))
+            .where(model.college_id == college_id, *criteria)
+            .scalar_subquery()
+        )
+
+    row = db.execute(
+        select(
+            count(Course, Course.is_active == True),
+            count(Faculty, Faculty.is_active == True),
+            count(Facility),
+            count(Activity),
+        )
+    ).one()
+    courses, faculty, facilities, events = row
+    return {"courses": courses, "faculty": faculty, "facilities": facilities, "events": events}
+
+
+def _latest_placement(db: Session, college_id: int):
+    placement = db.query(
+        Placement.year, Placement.highest_package, Placement.average_package, Placement.placement_percentage
+    ).filter(Placement.college_id == college_id).order_by(Placement.year.desc(), Placement.id.desc()).first()
+    if not placement:
+        return {}
+    return {
+        "latest_year": placement.year,
+        "highest_package": placement.highest_package,
+        "average_package": placement.average_package,
+        "placement_percentage": placement.placement_percentage,
+    }
+
+
+def _stats_and_placement(db: Session, college_id: int):
+    stats = get_college_stats(db, college_id)
+    if stats is None:
+        return _counts(db, college_id), _latest_placement(db, college_id)
+    counts = {
+        "courses": stats.active_courses_count,
+        "faculty": stats.active_faculty_count,
+        "facilities": stats.facilities_count,
+        "events": stats.activities_count,
+    }
+    placement = {
+        "latest_year": stats.latest_placement_year,
+        "highest_package": stats.latest_highest_package,
+        "average_package": stats.latest_average_package,
+        "placement_percentage": stats.latest_placement_percentage,
+    } if stats.latest_placement_year is not None else {}
+    return counts, placement
+
+
+def get_college_summary(db: Session, college_id: int):
+    """Summary payload for an active college, or None if there is none."""
+    college = db.query(College).filter(College.id == college_id, College.is_active == True).first()
+    if not college:
+        return None
+
+    courses = db.query(
+        Course.id, Course.name, Course.slug, Course.level, Course.department
+    ).filter(
+        Course.college_id == college_id, Course.is_active == True
+    ).order_by(Course.id).limit(COURSE_PREVIEW).all()
+
+    faculty = db.query(
+        Faculty.id, Faculty.name, Faculty.designation, Faculty.photo_url
+    ).filter(
+        Faculty.college_id == college_id, Faculty.is_active == True
+    ).order_by(Faculty.id).limit(FACULTY_PREVIEW).all()
+
+    facilities = db.query(
+        Facility.id, Facility.name, Facility.image_url
+    ).filter(Facility.college_id == college_id).order_by(Facility.id).limit(FACILITY_PREVIEW).all()
+
+    stats, placements = _stats_and_placement(db, college_id)
+
+    admission = db.query(
+        Admission.procedure_text, Admission.eligibility_text
+    ).filter(Admission.college_id == college_id).order_by(Admission.id).first()
+
+    return {
+        "id": college.id,
+        "name": college.name,
+        "slug": college.slug,
+        "description": college.short_description,
+        "logo": college.logo_url,
+        "theme_color": college.theme_primary_color,
+        "stats": stats,
+        "courses": [
+            {
+                "id": c.id,
+                "name": c.name,
+                "slug": c.slug,
+                "level": c.level,
+                "department": c.department,
+            }
+            for c in courses
+        ],
+        "faculty": [
+            {
+                "id": f.id,
+                "name": f.name,
+                "designation": f.designation,
+                "photo": f.photo_url,
+            }
+            for f in faculty
+        ],
+        "facilities": [
+            {
+                "id": f.id,
+                "name": f.name,
+                "image": f.image_url,
+            }
+            for f in facilities
+        ],
+        "placements": placements,
+        "admission": {
+            "procedure": admission.procedure_text,
+            "eligibility": admission.eligibility_text,
+        } if admission else {},
+    }
@@ -0,0 +1,87 @@
+"""
+Process-wide content version for public read endpoints.
+
+Every committed session that inserted, updated or deleted public CMS
+content (pages, sections, colleges, courses, ...) bumps the version.
+Readers such as the HTTP cache layer compare versions instead of
+rebuilding payloads to decide whether cached validators are still good.
+Each bump also sends this process's public reads to the primary for the
+replication-lag window, so the caches it invalidated are refilled with
+the new content rather than from a lagging replica.
+"""
+import itertools
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.database import pin_reads_to_primary
+from app.schemas.schema import Application, Enquiry, User
+
+
+# Models whose writes never change anything a public GET returns.
+NON_CONTENT_MODELS = (Application, Enquiry, User)
+
+_FLAG = "content_changed"
+
+
+class ContentVersion:
+    """Monotonic counter bumped after content-changing commits."""
+
+    def __init__(self):
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self.current = 0
+
+    def subscribe(self, callback):
+        """Call `callback(version)` after every bump (e.g. to schedule a static publish)."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def bump(self):
+        with self._lock:
+            self.current = next(self._counter)
+            version = self.current
+        for callback in list(self._subscribers):
+            callback(version)
+        return version
+
+
+content_version = ContentVersion()
+content_version.subscribe(lambda version: pin_reads_to_primary())
+
+
+def _is_content(obj):
+    return not isinstance(obj, NON_CONTENT_MODELS)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_content(session, flush_context):
+    if any(_is_content(obj) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_FLAG] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_content(orm_execute_state):
+    # Explicit update()/delete() statements bypass the flush; e.g. the
+    # admin section editor saves JSON columns with an UPDATE statement.
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is None or not issubclass(mapper.class_, NON_CONTENT_MODELS):
+            orm_execute_state.session.info[_FLAG] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    if session.info.pop(_FLAG, False):
+        content_version.bump()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_on_rollback(session, previous_transaction):
+    session.info.pop(_FLAG, None)
@@ -0,0 +1,156 @@
+"""
+Admin dashboard statistics.
+
+Per-college counts are read from the materialized `college_stats` table in
+the same query as the college list, global counts come from one row of
+scalar subqueries, names are resolved with IN lookups, and the result is
+cached for a short TTL.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.college import College
+from app.schemas.schema import (
+    Application,
+    CollegeStats,
+    Course,
+    Enquiry,
+    Facility,
+    Faculty,
+    Page,
+    Placement,
+)
+from app.services.cache import TTLCache
+from app.services.content_version import content_version
+
+# Recent rows shown on the dashboard
+RECENT_PAGES = 10
+RECENT_APPLICATIONS = 5
+
+# Keyed by content version, so CMS edits show up immediately and only
+# applications/enquiries can be up to DASHBOARD_CACHE_TTL seconds old.
+dashboard_cache = TTLCache(maxsize=4, ttl=settings.DASHBOARD_CACHE_TTL, name="dashboard")
+
+
+def compute_dashboard_stats(db: Session):
+    """Build the dashboard context without caching."""
+    colleges = db.query(
+        College.id,
+        College.parent_id,
+        College.name,
+        College.slug,
+        College.subdomain,
+        College.is_active,
+        CollegeStats.pages_count,
+        CollegeStats.courses_count,
+        CollegeStats.faculty_count,
+    ).outerjoin(
+        CollegeStats, CollegeStats.college_id == College.id
+    ).order_by(College.id.desc()).all()
+
+    college_rows = []
+    college_names = {}
+    for c in colleges:
+        college_names[c.id] = c.name
+        college_rows.append(
+            {
+                "id": c.id,
+                "parent_id": c.parent_id,
+                "name": c.name,
+                "slug": c.slug,
+                "subdomain": c.subdomain,
+                "is_active": c.is_active,
+                "pages_count": c.pages_count or 0,
+                "courses_count": c.courses_count or 0,
+                "faculty_count": c.faculty_count or 0,
+            }
+        )
+
+    pages = [
+        {
+            "id": p.id,
+            "title": p.title,
+            "slug": p.slug,
+            "college_id": p.college_id,
+            "college_name": college_names.get(p.college_id),
+            "is_active": p.is_active,
+        }
+        for p in db.query(
+            Page.id, Page.title, Page.slug, Page.college_id, Page.is_active
+        ).order_by(Page.id.desc()).limit(RECENT_PAGES)
+    ]
+
+    # Global counts; pages without a college are not in college_stats
+    totals = db.execute(
+        select(
+            select(func.count(Page.id)).scalar_subquery(),
+            select(func.count(Course.id)).scalar_subquery(),
+            select(func.count(Faculty.id)).scalar_subquery(),
+            select(func.count(Application.id)).scalar_subquery(),
+            select(func.count(Enquiry.id)).scalar_subquery(),
+            select(func.count(Facility.id)).scalar_subquery(),
+            select(func.count(Placement.id)).scalar_subquery(),
+        )
+    ).one()
+    (
+        total_pages,
+        total_courses,
+        total_faculty,
+        total_applications,
+        total_enquiries,
+        facilities_count,
+        placements_count,
+    ) = totals
+
+    apps = db.query(
+        Application.id,
+        Application.name,
+        Application.email,
+        Application.course_id,
+        Application.status,
+        Application.created_at,
+    ).order_by(Application.created_at.desc()).limit(RECENT_APPLICATIONS).all()
+
+    course_ids = {a.course_id for a in apps if a.course_id}
+    course_names = dict(
+        db.query(Course.id, Course.name).filter(Course.id.in_(course_ids)).all()
+    ) if course_ids else {}
+
+    recent_apps = [
+        {
+            "id": a.id,
+            "name": a.name,
+            "email": a.email,
+            "course_name": course_names.get(a.course_id, "-") if a.course_id else "-",
+            "status": a.status or "pending",
+            "applied_at": a.created_at.strftime("%b %d, %Y") if a.created_at else "",
+        }
+        for a in apps
+    ]
+
+    return {
+        "colleges": college_rows,
+        "pages": pages,
+        "stats": {
+            "total_colleges": len(college_rows),
+            "total_faculty": total_faculty,
+            "total_applications": total_applications,
+            "total_pages": total_pages,
+            "total_courses": total_courses,
+            "total_enquiries": total_enquiries,
+        },
+        "recent_applications": recent_apps,
+        "facilities_count": facilities_count,
+        "placements_count": placements_count,
+    }
+
+
+def get_dashboard_stats(db: Session):
+    """Cached dashboard context; see `compute_dashboard_stats`."""
+    key = content_version.current
+    stats = dashboard_cache.get(key)
+    if stats is None:
+        stats = compute_dashboard_stats(db)
+        dashboard_cache.set(key, stats)
+    return stats
@@ -0,0 +1,23 @@
+"""
+Session hooks that keep the derived tables in step with ORM writes.
+
+`register()` installs them, once per process, for the materialized tree
+paths, the college_stats counters and the effective_pages snapshot. The
+order matters: effective_pages resolves inheritance from the paths, so the
+path hooks must run first. The application calls it when app.main is
+imported; scripts that write through the ORM call it before they start.
+"""
+from app.services import college_stats, effective_pages, tree_paths
+
+_registered = False
+
+
+def register():
+    """Install the derived-table session hooks; later calls do nothing."""
+    global _registered
+    if _registered:
+        return
+    tree_paths.register()
+    college_stats.register()
+    effective_pages.register()
+    _registered = True
@@ -0,0 +1,258 @@
+"""
+Precomputed page inheritance: the `effective_pages` snapshot.
+
+For every college the snapshot maps each servable slug to the page to show:
+the college's own page, or else the nearest ancestor college's inheritable
+page. Inherited copies created by `inherit_page` that have no sections of
+their own render the sections of the page they were copied from.
+
+Page, section and college writes mark the affected colleges (the college,
+its descendants, and colleges holding copies of a changed page); just those
+colleges are recomputed before the transaction commits; bulk update() and
+delete() statements mark the colleges of the rows they match the same way.
+Public routes read one snapshot row instead of walking the hierarchy per
+request.
+"""
+from sqlalchemy import delete, event, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.college import College
+from app.schemas.schema import EffectivePage, Page, PageSection
+from app.services import bulk_writes
+from app.services.tree_paths import path_ids, subtree_clause
+
+_COLLEGES = "effective_pages_colleges"
+_PAGES = "effective_pages_pages"
+_REBUILD = "effective_pages_rebuild"
+
+# Columns whose bulk updates can change the snapshot
+_SNAPSHOT_INPUTS = {
+    Page: {"college_id", "slug", "is_active", "is_inheritable", "parent_page_id", "path"},
+    College: {"parent_id", "path"},
+    PageSection: {"page_id"},
+}
+
+
+def _content_page_id(page, section_counts):
+    """The page itself, or the nearest page it was copied from that has sections."""
+    if page.parent_page_id is None or section_counts.get(page.id):
+        return page.id
+    chain = path_ids(page.path)[-2::-1] if page.path else [page.parent_page_id]
+    for source_id in chain:
+        if section_counts.get(source_id):
+            return source_id
+    return page.id
+
+
+def refresh_effective_pages(connection, college_ids=None):
+    """
+    Recompute the snapshot for `college_ids` (every college when None) on
+    `connection` (a Connection or Session), inside its transaction.
+    """
+    q = select(College.id, College.parent_id, College.path)
+    if college_ids is not None:
+        college_ids = sorted(set(college_ids))
+        if not college_ids:
+            return
+        q = q.where(College.id.in_(college_ids))
+    colleges = connection.execute(q).all()
+
+    ancestors = {}
+    for college in colleges:
+        if college.path:
+            ancestors[college.id] = path_ids(college.path)[-2::-1]
+        else:
+            ancestors[college.id] = [college.parent_id] if college.parent_id else []
+    wanted = {c.id for c in colleges}.union(*ancestors.values())
+
+    pages = connection.execute(
+        select(
+            Page.id, Page.college_id, Page.slug, Page.is_active, Page.is_inheritable,
+            Page.parent_page_id, Page.path,
+        ).where(Page.college_id.in_(wanted))
+    ).all() if wanted else []
+
+    source_ids = {p.id for p in pages}
+    for p in pages:
+        if p.parent_page_id is not None:
+            source_ids.update(path_ids(p.path) if p.path else [p.parent_page_id])
+    section_counts = dict(connection.execute(
+        select(PageSection.page_id, func.count(PageSection.id))
+        .where(PageSection.page_id.in_(source_ids))
+        .group_by(PageSection.page_id)
+    ).all()) if source_ids else {}
+
+    by_college = {}
+    for p in sorted(pages, key=lambda p: p.id):
+        by_college.setdefault(p.college_id, []).append(p)
+
+    rows = []
+    for college in colleges:
+        claimed = set()
+        for depth, owner_id in enumerate([college.id, *ancestors[college.id]]):
+            for page in by_college.get(owner_id, ()):
+                if page.slug in claimed:
+                    continue
+                if depth == 0:
+                    # An inactive own page hides the slug instead of exposing a parent's page.
+                    claimed.add(page.slug)
+                    if not page.is_active:
+                        continue
+                elif not (page.is_active and page.is_inheritable):
+                    continue
+                claimed.add(page.slug)
+                rows.append({
+                    "college_id": college.id,
+                    "slug": page.slug,
+                    "page_id": page.id,
+                    "content_page_id": _content_page_id(page, section_counts),
+                    "depth": depth,
+                })
+
+    if college_ids is None:
+        connection.execute(delete(EffectivePage))
+    else:
+        connection.execute(delete(EffectivePage).where(EffectivePage.college_id.in_(college_ids)))
+    if rows:
+        connection.execute(insert(EffectivePage), rows)
+
+
+def rebuild_effective_pages(db: Session):
+    """Rebuild the whole snapshot and commit; used by scripts/rebuild_effective_pages.py."""
+    refresh_effective_pages(db)
+    db.commit()
+    return db.query(func.count()).select_from(EffectivePage).scalar()
+
+
+def _affected_colleges(connection, college_ids, page_ids):
+    """Colleges whose snapshot depends on the changed colleges and pages."""
+    college_ids = set(college_ids)
+    page_paths = []
+    if page_ids:
+        for college_id, path in connection.execute(
+            select(Page.college_id, Page.path).where(Page.id.in_(page_ids))
+        ):
+            college_ids.add(college_id)
+            if path:
+                page_paths.append(path)
+    if page_paths:
+        # Colleges holding copies of a changed page
+        college_ids.update(connection.execute(
+            select(Page.college_id).where(or_(*(subtree_clause(Page, path) for path in page_paths)))
+        ).scalars())
+    college_ids.discard(None)
+    if not college_ids:
+        return set()
+    college_paths = connection.execute(
+        select(College.path).where(College.id.in_(college_ids), College.path.is_not(None))
+    ).scalars().all()
+    if college_paths:
+        college_ids.update(connection.execute(
+            select(College.id).where(or_(*(subtree_clause(College, path) for path in college_paths)))
+        ).scalars())
+    return college_ids
+
+
+def _pending(session):
+    if _COLLEGES not in session.info:
+        session.info[_COLLEGES] = set()
+        session.info[_PAGES] = set()
+    return session.info[_COLLEGES], session.info[_PAGES]
+
+
+def _collect_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Page):
+            college_ids, page_ids = _pending(session)
+            page_ids.add(obj.id)
+            college_ids.add(obj.college_id)
+            college_ids.update(inspect(obj).attrs.college_id.history.deleted or ())
+        elif isinstance(obj, College):
+            college_ids, _ = _pending(session)
+            college_ids.add(obj.id)
+        elif isinstance(obj, PageSection):
+            # Only whether a page has sections matters, not their content.
+            history = inspect(obj).attrs.page_id.history
+            if obj in session.new or obj in session.deleted or history.has_changes():
+                _, page_ids = _pending(session)
+                page_ids.add(obj.page_id)
+                page_ids.update(history.deleted or ())
+
+
+def _track_bulk_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    model = mapper.class_ if mapper is not None else None
+    if model not in _SNAPSHOT_INPUTS:
+        return
+    # The admin section editor saves with UPDATE statements; unless they
+    # move sections between pages they never change which pages have any.
+    if orm_execute_state.is_update and not bulk_writes.assigned_columns(orm_execute_state) & _SNAPSHOT_INPUTS[model]:
+        return
+    session = orm_execute_state.session
+    if model is College:
+        college_ids, page_ids = bulk_writes.matched_values(orm_execute_state, College.id), set()
+    elif model is Page:
+        college_ids, page_ids = set(), bulk_writes.matched_values(orm_execute_state, Page.id)
+        moved_to = bulk_writes.assigned_values(orm_execute_state, "college_id")
+        if moved_to is None:
+            session.info[_REBUILD] = True
+            return
+        college_ids |= moved_to
+    else:
+        college_ids, page_ids = set(), bulk_writes.matched_values(orm_execute_state, PageSection.page_id)
+        moved_to = bulk_writes.assigned_values(orm_execute_state, "page_id")
+        if moved_to is None:
+            session.info[_REBUILD] = True
+            return
+        page_ids |= moved_to
+    # Resolved now, while deleted rows and old paths can still be read; the
+    # pages are resolved again before commit for their new colleges.
+    pending_colleges, pending_pages = _pending(session)
+    pending_colleges.update(_affected_colleges(session.connection(), college_ids, page_ids))
+    pending_pages.update(page_ids)
+
+
+def _refresh_before_commit(session):
+    session.flush()
+    college_ids = session.info.pop(_COLLEGES, None)
+    page_ids = session.info.pop(_PAGES, None)
+    if session.info.pop(_REBUILD, False):
+        refresh_effective_pages(session.connection())
+    elif college_ids is not None:
+        connection = session.connection()
+        refresh_effective_pages(connection, _affected_colleges(connection, college_ids, page_ids))
+
+
+def _reset_on_rollback(session, previous_transaction):
+    session.info.pop(_COLLEGES, None)
+    session.info.pop(_PAGES, None)
+    session.info.pop(_REBUILD, None)
+
+
+def register():
+    """Wire session events that keep the snapshot in step with ORM writes."""
+    event.listen(Session, "after_flush", _collect_changes)
+    event.listen(Session, "do_orm_execute", _track_bulk_writes)
+    event.listen(Session, "before_commit", _refresh_before_commit)
+    event.listen(Session, "after_soft_rollback", _reset_on_rollback)
+
+
+def resolve_page(db: Session, college_slug: str, page_slug: str):
+    """
+    (college_id, effective row) for an active college and a slug. college_id
+    is None when there is no such college; the row is None when the college
+    serves no page under that slug.
+    """
+    row = db.execute(
+        select(College.id, EffectivePage.page_id, EffectivePage.content_page_id, EffectivePage.depth)
+        .outerjoin(
+            EffectivePage,
+            (EffectivePage.college_id == College.id) & (EffectivePage.slug == page_slug),
+        )
+        .where(College.slug == college_slug, College.is_active == True)
+    ).first()
+    if row is None:
+        return None, None
+    return row.id, (row if row.page_id is not None else None)
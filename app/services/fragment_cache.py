@@ -0,0 +1,99 @@
+"""
+Rendered-HTML cache for page builder sections.
+
+Each section is rendered once through `render_builder_section` in
+templet/includes/page_builder_macros.html and kept under (model, section
+id, version). The version is a digest of the section's columns, its items
+and the data it is rendered with, so an edit anywhere (including admin bulk
+UPDATEs and other workers' commits) yields a new key and no invalidation
+is needed; stale versions age out of the LRU. Hit ratio and render time
+are tracked per section type for the metrics endpoint.
+"""
+import hashlib
+import threading
+import time
+
+from markupsafe import Markup
+from sqlalchemy import inspect
+
+from app.core.config import settings
+from app.services.cache import TTLCache
+
+MACROS_TEMPLATE = "includes/page_builder_macros.html"
+
+# Section types rendered with per-college data rather than section content
+DATA_ARGS = {"COURSES": "courses", "FACULTY": "faculty", "PLACEMENTS": "placement", "FACILITIES": "facilities"}
+
+fragment_cache = TTLCache(maxsize=settings.FRAGMENT_CACHE_SIZE, ttl=settings.FRAGMENT_CACHE_TTL, name="fragments")
+
+
+class FragmentStats:
+    """Per section type hit/miss counters and render time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._types = {}
+
+    def record(self, section_type, hit: bool, seconds: float = 0.0):
+        with self._lock:
+            entry = self._types.setdefault(section_type, {"hits": 0, "misses": 0, "render_seconds": 0.0})
+            entry["hits" if hit else "misses"] += 1
+            entry["render_seconds"] += seconds
+
+    def clear(self):
+        with self._lock:
+            self._types.clear()
+
+    def stats(self):
+        with self._lock:
+            result = {}
+            for section_type, entry in self._types.items():
+                lookups = entry["hits"] + entry["misses"]
+                result[section_type] = {
+                    "hits": entry["hits"],
+                    "misses": entry["misses"],
+                    "hit_ratio": round(entry["hits"] / lookups, 4) if lookups else None,
+                    "render_ms_avg": round(entry["render_seconds"] * 1000 / entry["misses"], 3) if entry["misses"] else None,
+                }
+            return result
+
+
+fragment_stats = FragmentStats()
+
+
+def _columns(obj):
+    return tuple(getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs)
+
+
+def section_version(section, data=None):
+    """Digest of everything a section's fragment is rendered from."""
+    parts = (_columns(section), tuple(_columns(item) for item in section.items or ()), data)
+    return hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+
+
+def render_fragments(env, page, sections, **data):
+    """
+    Rendered HTML (Markup) for the active `sections` of `page`, served from
+    `fragment_cache` when the section is unchanged. `data` holds the
+    per-college dicts (courses, faculty, placement, facilities) the data
+    driven section types are rendered with.
+    """
+    macros = env.get_template(MACROS_TEMPLATE).module
+    args = {name: data.get(name) or {} for name in DATA_ARGS.values()}
+    fragments = []
+    for section in sections:
+        if not section.is_active:
+            continue
+        data_arg = DATA_ARGS.get(section.section_type)
+        section_data = args[data_arg].get(page.college_id) if data_arg else None
+        key = (type(section).__name__, section.id, section_version(section, section_data))
+        html = fragment_cache.get(key)
+        if html is None:
+            start = time.perf_counter()
+            html = Markup(macros.render_builder_section(section, page, **args))
+            fragment_stats.record(section.section_type, hit=False, seconds=time.perf_counter() - start)
+            fragment_cache.set(key, html)
+        else:
+            fragment_stats.record(section.section_type, hit=True)
+        fragments.append(html)
+    return fragments
@@ -0,0 +1,223 @@
+"""
+Responsive derivatives of uploaded images.
+
+For every stored upload (see app.services.uploads) a process pool renders
+resized WebP/AVIF variants at IMAGE_DERIVATIVE_WIDTHS plus a tiny blurred
+placeholder, and writes them next to a manifest:
+
+    <UPLOAD_DIR>/derived/<kind>/<digest>/<width>.<format>
+    <UPLOAD_DIR>/derived/<kind>/<digest>/manifest.json
+
+Uploads are content-addressed, so derivatives are generated once per image
+and a manifest never changes once written. `image_srcset` turns a manifest
+into the `srcset` data exposed by the public page payload; images without
+derivatives (yet) simply have none. Pillow is optional: without it nothing
+is scheduled and the payload keeps the original URLs only.
+"""
+import base64
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.cache import TTLCache
+
+try:
+    from PIL import Image, ImageFilter, ImageOps
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIR = "derived"
+MANIFEST_NAME = "manifest.json"
+
+# Raster formats worth resizing; SVG and (animated) GIF are served as uploaded
+SOURCE_EXTENSIONS = {".avif", ".jpg", ".png", ".webp"}
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+PLACEHOLDER_WIDTH = 24
+QUALITY = {"avif": 55, "webp": 78}
+
+# Manifests are immutable once written; only found ones are cached.
+manifest_cache = TTLCache(maxsize=4096, ttl=3600, name="image_manifests")
+
+
+def derivatives_available():
+    return Image is not None
+
+
+def _supported_formats(formats):
+    if Image is None:
+        return []
+    # Image.SAVE only lists the plugins imported so far; a fresh (spawned)
+    # process has not loaded WebP/AVIF yet.
+    Image.init()
+    saveable = {name.lower() for name in Image.SAVE}
+    return [fmt for fmt in formats if fmt in saveable]
+
+
+def _derived_dir(relative: str, root):
+    kind, name = relative.rsplit("/", 1)
+    return Path(root) / DERIVED_DIR / kind / os.path.splitext(name)[0]
+
+
+def _atomic_write(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def generate_derivatives(relative: str, root: str, url_prefix: str, widths, formats):
+    """
+    Render the variants and placeholder for the upload at `root/relative`
+    and write its manifest; returns the manifest. Runs in a pool process.
+    """
+    out_dir = _derived_dir(relative, root)
+    manifest_path = out_dir / MANIFEST_NAME
+    if manifest_path.exists():
+        return json.loads(manifest_path.read_text())
+    out_dir.mkdir(parents=True, exist_ok=True)
+    base_url = f"{url_prefix.rstrip('/')}/{out_dir.relative_to(root).as_posix()}"
+
+    with Image.open(Path(root) / relative) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    width, height = image.size
+
+    # Standard widths below the original, or the original width for small images
+    targets = sorted({w for w in widths if w < width}) or [width]
+    variants = []
+    for fmt in _supported_formats(formats):
+        for target in targets:
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS
+            )
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt.upper(), quality=QUALITY.get(fmt, 75))
+            _atomic_write(out_dir / f"{target}.{fmt}", buffer.getvalue())
+            variants.append({"format": fmt, "width": target, "url": f"{base_url}/{target}.{fmt}"})
+
+    # PNG is always available; WebP only when Pillow was built with it.
+    placeholder_format = (_supported_formats(["webp"]) or ["png"])[0]
+    tiny = image.resize((PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))), Image.BILINEAR)
+    buffer = io.BytesIO()
+    tiny.filter(ImageFilter.GaussianBlur(2)).save(buffer, placeholder_format.upper(), quality=40)
+    placeholder = base64.b64encode(buffer.getvalue()).decode("ascii")
+    manifest = {
+        "width": width,
+        "height": height,
+        "placeholder": f"data:image/{placeholder_format};base64,{placeholder}",
+        "variants": variants,
+    }
+    # Written last: a manifest means every variant is in place.
+    _atomic_write(manifest_path, json.dumps(manifest).encode())
+    return manifest
+
+
+class DerivativePool:
+    """Process pool rendering derivatives off the web workers."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """Call `callback(relative)` in this process when an image's derivatives are ready."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def submit(self, relative: str):
+        """Schedule derivatives for an upload path like "hero/<digest>.png"; returns the future or None."""
+        if not derivatives_available() or os.path.splitext(relative)[1] not in SOURCE_EXTENSIONS:
+            return None
+        with self._lock:
+            if relative in self._pending:
+                return None
+            if self._executor is None:
+                # spawn: the web process runs threads, which do not survive fork
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            self._pending.add(relative)
+            future = self._executor.submit(
+                generate_derivatives, relative, settings.UPLOAD_DIR, settings.UPLOAD_URL_PREFIX,
+                settings.IMAGE_DERIVATIVE_WIDTHS, settings.IMAGE_DERIVATIVE_FORMATS,
+            )
+        future.add_done_callback(lambda f: self._done(relative, f))
+        return future
+
+    def _done(self, relative, future):
+        with self._lock:
+            self._pending.discard(relative)
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.error(f"Image derivatives failed for {relative}: {future.exception()!r}")
+            return
+        for callback in list(self._subscribers):
+            callback(relative)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+derivative_pool = DerivativePool(max_workers=settings.IMAGE_DERIVATIVE_WORKERS)
+
+
+def upload_path(url):
+    """Upload path ("hero/<digest>.png") of an uploaded image URL, or None."""
+    prefix = settings.UPLOAD_URL_PREFIX.rstrip("/") + "/"
+    if not url or not url.startswith(prefix):
+        return None
+    relative = url[len(prefix):]
+    if relative.startswith(f"{DERIVED_DIR}/") or relative.count("/") != 1:
+        return None
+    return relative
+
+
+def load_manifest(url):
+    """The derivative manifest of an uploaded image URL, or None."""
+    relative = upload_path(url)
+    if relative is None:
+        return None
+    manifest = manifest_cache.get(relative)
+    if manifest is None:
+        path = _derived_dir(relative, settings.UPLOAD_DIR) / MANIFEST_NAME
+        try:
+            manifest = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        manifest_cache.set(relative, manifest)
+    return manifest
+
+
+def image_srcset(url):
+    """
+    `srcset` data for an uploaded image: original size, blurred placeholder
+    and one source per format (best first), or None without derivatives.
+    """
+    manifest = load_manifest(url)
+    if not manifest:
+        return None
+    by_format = {}
+    for variant in manifest["variants"]:
+        by_format.setdefault(variant["format"], []).append(f"{variant['url']} {variant['width']}w")
+    return {
+        "width": manifest["width"],
+        "height": manifest["height"],
+        "placeholder": manifest["placeholder"],
+        "sources": [
+            {"type": MIME_TYPES.get(fmt, f"image/{fmt}"), "srcset": ", ".join(by_format[fmt])}
+            for fmt in sorted(by_format, key=lambda fmt: fmt != "avif")
+        ],
+    }
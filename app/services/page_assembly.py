@@ -0,0 +1,527 @@
+"""
+Page assembly for the public API.
+Loads a page together with its sections, section items, SEO metadata and
+college in a fixed number of queries, and serializes it into the payload
+consumed by the Angular frontend.
+
+Shared sections (reused by many pages through `page_shared_sections`) are
+serialized and cached once per shared section, and merged into a page's
+section list by sort_order when the payload is served.
+"""
+import os
+import threading
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.core.config import settings
+from app.schemas.schema import Page, PageSection, SharedSection, page_shared_sections
+from app.services.cache import TTLCache
+from app.services.image_derivatives import (
+    SOURCE_EXTENSIONS,
+    derivative_pool,
+    derivatives_available,
+    image_srcset,
+    upload_path,
+)
+
+
+class CachedPage(NamedTuple):
+    """A page's own payload plus what is needed to merge its shared sections."""
+    payload: dict
+    # sort_order of each serialized (active) own section, in payload order
+    section_orders: tuple
+    # (shared_section_id, sort_order on the page link) per attached shared section
+    shared_refs: tuple
+
+
+# Serialized `/pages/{id}` payloads (CachedPage) keyed by page id. Admin write
+# handlers evict entries through `invalidate_pages` so edits show up immediately.
+page_cache = TTLCache(maxsize=settings.PAGE_CACHE_SIZE, ttl=settings.PAGE_CACHE_TTL, name="pages")
+
+# (sort_order, payload) per shared section id, or () for a missing/inactive
+# one. Evicted per section by `invalidate_shared_sections`, so editing a
+# shared section leaves the cached pages that embed it alone.
+shared_section_cache = TTLCache(
+    maxsize=settings.SHARED_SECTION_CACHE_SIZE, ttl=settings.PAGE_CACHE_TTL, name="shared_sections"
+)
+
+# Upload path -> (page ids, shared section ids) of cached payloads that
+# serialized the image before its derivatives existed; finished derivatives
+# evict just those entries.
+_awaiting_derivatives = {}
+_awaiting_lock = threading.Lock()
+
+
+def page_load_options():
+    """
+    Loader options that fetch everything a rendered page needs up front:
+    SEO and college are joined onto the page row, sections and their items
+    are fetched with one SELECT ... IN query each.
+    """
+    return (
+        joinedload(Page.college),
+        joinedload(Page.seo),
+        selectinload(Page.sections).selectinload(PageSection.items),
+    )
+
+
+def load_page(db: Session, page_id: int, active_only: bool = True):
+    """Load a page with sections, items, SEO and college eagerly (3 queries)."""
+    q = db.query(Page).options(*page_load_options()).filter(Page.id == page_id)
+    if active_only:
+        q = q.filter(Page.is_active == True)
+    return q.first()
+
+
+async def aload_page(db: AsyncSession, page_id: int, active_only: bool = True):
+    """Async counterpart of `load_page` for `get_async_db` sessions."""
+    stmt = select(Page).options(*page_load_options()).where(Page.id == page_id)
+    if active_only:
+        stmt = stmt.where(Page.is_active == True)
+    result = await db.execute(stmt)
+    return result.scalars().first()
+
+
+def serialize_section(section):
+    """
+    Build the frontend payload for a single section.
+    Expects `section.items` to be loaded already (ordered by sort_order).
+    """
+    items = list(section.items or [])
+
+    # Section data optimized for frontend section types
+    if section.section_type == "HERO":
+        # Hero: images (single or multiple), title, description, color, optional CTA
+        images = []
+
+        # Check extra_data first for images
+        if section.extra_data and isinstance(section.extra_data, dict):
+            extra_images = section.extra_data.get("images")
+            if extra_images and isinstance(extra_images, list):
+                images.extend([img for img in extra_images if img])
+
+        # Then check hero_images column
+        if not images and getattr(section, 'hero_images', None):
+            try:
+                for img in section.hero_images:
+                    if img and img not in images:
+                        images.append(img)
+            except Exception:
+                pass
+
+        # Fallback to other sources
+        if not images and getattr(section, 'hero_image_url', None):
+            images.append(section.hero_image_url)
+        if not images and section.extra_data and isinstance(section.extra_data, dict):
+            hero_img = section.extra_data.get("hero_image_url")
+            if hero_img:
+                images.append(hero_img)
+        if section.background_image and section.background_image not in images:
+            images.append(section.background_image)
+
+        # Get CTA from extra_data (new format)
+        cta_text = None
+        cta_link = None
+        if section.extra_data and isinstance(section.extra_data, dict):
+            cta_text = section.extra_data.get("cta_text")
+            cta_link = section.extra_data.get("cta_link")
+
+        # Fallback to items if not in extra_data (backward compatibility)
+        if not cta_text and items and items[0].cta_text:
+            cta_text = items[0].cta_text
+        if not cta_link and items and items[0].cta_link:
+            cta_link = items[0].cta_link
+
+        return {
+            "id": section.id,
+            "type": section.section_type,
+            "title": section.section_title,
+            "description": section.section_description,
+            "color": section.hero_text_color or section.background_color or None,
+            "images": images if images else None,
+            # Responsive variants per entry of `images` (None where there are none)
+            "srcsets": [image_srcset(img) for img in images] if images else None,
+            "cta_text": cta_text,
+            "cta_link": cta_link,
+        }
+
+    if section.section_type == "STATS":
+        # Stats: array of {value, label} for displaying numbers/metrics
+        return {
+            "id": section.id,
+            "type": section.section_type,
+            "title": section.section_title,
+            "subtitle": section.section_subtitle,
+            "stats": [
+                {
+                    "value": i.title,  # e.g., "30" or "500+"
+                    "label": i.subtitle or i.description,  # e.g., "Years Legacy"
+                }
+                for i in items
+            ]
+        }
+
+    if section.section_type == "INFO_BAR":
+        # INFO_BAR: Stats (first 5 items) + Accreditation (remaining items)
+        stats_items = items[:5] if len(items) > 5 else items
+        accreditation_items = items[5:] if len(items) > 5 else []
+
+        return {
+            "id": section.id,
+            "type": section.section_type,
+            "title": section.section_title,
+            "subtitle": section.section_subtitle,
+            "description": section.section_description,
+            "stats": [
+                {
+                    "value": i.title,  # e.g., "30" or "500+"
+                    "label": i.subtitle,  # e.g., "Years Legacy"
+                }
+                for i in stats_items
+            ],
+            "accreditations": [
+                {
+                    "title": i.title,  # e.g., "NAAC A++"
+                    "subtitle": i.subtitle,  # e.g., "Accredited Management Institute"
+                    "description": i.description,
+                    "image_url": i.image_url,
+                    "image_srcset": image_srcset(i.image_url),
+                }
+                for i in accreditation_items
+            ]
+        }
+
+    if section.section_type in ["TEXT", "ABOUT"]:
+        # Text/About: title, description, optional button
+        return {
+            "id": section.id,
+            "type": section.section_type,
+            "title": section.section_title,
+            "subtitle": section.section_subtitle,
+            "description": section.section_description,
+            "cta_text": items[0].cta_text if items and items[0].cta_text else None,
+            "cta_link": items[0].cta_link if items and items[0].cta_link else section.section_link,
+        }
+
+    if section.section_type == "ACCORDION":
+        # Accordion: title + items for expandable lists (e.g., courses by category)
+        return {
+            "id": section.id,
+            "type": section.section_type,
+            "title": section.section_title,
+            "subtitle": section.section_subtitle,
+            "description": section.section_description,
+            "items": [
+                {
+                    "id": i.id,
+                    "title": i.title,  # Category name (e.g., "Management")
+                    "content": i.description,  # Content when expanded
+                }
+                for i in items
+            ]
+        }
+
+    if section.section_type in ["BADGES", "ACCREDITATION"]:
+        # Badges/Accreditation: grid of logos or achievements
+        return {
+            "id": section.id,
+            "type": section.section_type,
+            "title": section.section_title,
+            "subtitle": section.section_subtitle,
+            "items": [
+                {
+                    "title": i.title,
+                    "subtitle": i.subtitle,
+                    "description": i.description,
+                    "image_url": i.image_url,
+                    "image_srcset": image_srcset(i.image_url),
+                }
+                for i in items
+            ]
+        }
+
+    # Generic fallback for CARDS, FACILITIES, FACULTY, etc.
+    return {
+        "id": section.id,
+        "type": section.section_type,
+        "title": section.section_title,
+        "subtitle": section.section_subtitle,
+        "description": section.section_description,
+        "background_color": section.background_color,
+        "items": [
+            {
+                "id": i.id,
+                "title": i.title,
+                "subtitle": i.subtitle,
+                "description": i.description,
+                "image_url": i.image_url,
+                "image_srcset": image_srcset(i.image_url),
+                "cta_text": i.cta_text,
+                "cta_link": i.cta_link,
+            }
+            for i in items
+        ]
+    }
+
+
+def build_page_payload(page):
+    """
+    Serialize an eagerly loaded page (see `load_page`) into the public
+    `/pages/{id}` response. Performs no database access.
+    """
+    college = page.college
+    seo = page.seo
+    sections_data = [serialize_section(s) for s in page.sections if s.is_active]
+
+    # Clean page response
+    return {
+        "status": "success",
+        "data": {
+            "page": {
+                "id": page.id,
+                "title": page.title,
+                "slug": page.slug,
+                "college_id": page.college_id,
+                "college_name": college.name if college else None,
+            },
+            "seo": {
+                "title": seo.meta_title,
+                "description": seo.meta_description,
+                "url": seo.canonical_url,
+                "image": seo.og_image,
+            } if seo else {},
+            "sections": sections_data,
+        }
+    }
+
+
+def serialize_shared_section(section):
+    """Frontend payload for a shared section; expects `section.items` loaded."""
+    return {
+        "id": section.id,
+        "type": section.section_type,
+        "title": section.section_title,
+        "subtitle": section.section_subtitle,
+        "shared": True,
+        "items": [
+            {
+                "id": i.id,
+                "title": i.title,
+                "subtitle": i.subtitle,
+                "description": i.description,
+                "image_url": i.image_url,
+                "image_srcset": image_srcset(i.image_url),
+                "video_url": i.video_url,
+                "cta_text": i.cta_text,
+                "cta_link": i.cta_link,
+            }
+            for i in section.items
+        ],
+    }
+
+
+def _shared_refs_query(page_id: int):
+    return select(
+        page_shared_sections.c.shared_section_id, page_shared_sections.c.sort_order
+    ).where(page_shared_sections.c.page_id == page_id)
+
+
+def cached_page_entry(page, shared_refs):
+    """CachedPage for an eagerly loaded page and its (shared_section_id, sort_order) links."""
+    return CachedPage(
+        payload=build_page_payload(page),
+        section_orders=tuple(s.sort_order or 0 for s in page.sections if s.is_active),
+        shared_refs=tuple((section_id, sort_order or 0) for section_id, sort_order in shared_refs),
+    )
+
+
+def _store_shared_sections(ids, sections):
+    found = {s.id: s for s in sections}
+    entries = {}
+    for section_id in ids:
+        section = found.get(section_id)
+        entry = (section.sort_order or 0, serialize_shared_section(section)) if section and section.is_active else ()
+        shared_section_cache.set(section_id, entry)
+        if entry:
+            _await_derivatives(entry[1], shared_section_id=section_id)
+        entries[section_id] = entry
+    return entries
+
+
+def _cached_shared_sections(ids):
+    entries, missing = {}, []
+    for section_id in ids:
+        entry = shared_section_cache.get(section_id)
+        if entry is None:
+            missing.append(section_id)
+        else:
+            entries[section_id] = entry
+    return entries, missing
+
+
+def get_shared_sections(db: Session, ids):
+    """{id: (sort_order, payload) or ()} for shared sections, loading misses at once."""
+    entries, missing = _cached_shared_sections(ids)
+    if missing:
+        sections = db.query(SharedSection).options(
+            selectinload(SharedSection.items)
+        ).filter(SharedSection.id.in_(missing)).all()
+        entries.update(_store_shared_sections(missing, sections))
+    return entries
+
+
+async def aget_shared_sections(db: AsyncSession, ids):
+    """Async counterpart of `get_shared_sections`."""
+    entries, missing = _cached_shared_sections(ids)
+    if missing:
+        result = await db.execute(
+            select(SharedSection).options(selectinload(SharedSection.items)).where(SharedSection.id.in_(missing))
+        )
+        entries.update(_store_shared_sections(missing, result.scalars().all()))
+    return entries
+
+
+def merge_shared_sections(cached: CachedPage, shared):
+    """
+    The page payload with shared sections merged into its sections by
+    sort_order (the page link's sort_order, else the shared section's own);
+    own sections come first on ties. Cached dicts are not modified.
+    """
+    own = cached.payload["data"]["sections"]
+    entries = [(order, 0, n, section) for n, (order, section) in enumerate(zip(cached.section_orders, own))]
+    for n, (section_id, link_order) in enumerate(cached.shared_refs):
+        entry = shared.get(section_id)
+        if entry:
+            section_order, section = entry
+            entries.append((link_order or section_order, 1, n, section))
+    entries.sort(key=lambda entry: entry[:3])
+    return {**cached.payload, "data": {**cached.payload["data"], "sections": [e[3] for e in entries]}}
+
+
+def load_home_page(db: Session):
+    """
+    The page served at `/`: the active page with slug 'home', else the first
+    active page of type 'home', else the first active page. Loaded like `load_page`.
+    """
+    q = db.query(Page).options(*page_load_options()).filter(Page.is_active == True)
+    return (
+        q.filter(Page.slug == 'home').first()
+        or q.filter(Page.page_type == 'home').first()
+        or q.order_by(Page.id).first()
+    )
+
+
+def sections_with_shared(db: Session, page):
+    """
+    ORM sections for server-side rendering: the page's active sections plus
+    its active shared sections (items loaded), merged the same way as
+    `merge_shared_sections`.
+    """
+    rows = db.execute(
+        select(SharedSection, page_shared_sections.c.sort_order)
+        .join(page_shared_sections, page_shared_sections.c.shared_section_id == SharedSection.id)
+        .where(page_shared_sections.c.page_id == page.id, SharedSection.is_active == True)
+        .options(selectinload(SharedSection.items))
+    ).all()
+    entries = [(s.sort_order or 0, 0, n, s) for n, s in enumerate(page.sections) if s.is_active]
+    entries.extend(
+        (link_order or shared.sort_order or 0, 1, n, shared) for n, (shared, link_order) in enumerate(rows)
+    )
+    entries.sort(key=lambda entry: entry[:3])
+    return [entry[3] for entry in entries]
+
+
+def get_page_payload(db: Session, page_id: int):
+    """
+    Return the public payload for an active page, served from `page_cache`
+    when possible. Returns None if the page does not exist or is inactive.
+    """
+    cached = page_cache.get(page_id)
+    if cached is None:
+        page = load_page(db, page_id)
+        if not page:
+            return None
+        cached = cached_page_entry(page, db.execute(_shared_refs_query(page_id)).all())
+        page_cache.set(page_id, cached)
+        _await_derivatives(cached.payload, page_id=page_id)
+    if not cached.shared_refs:
+        return cached.payload
+    return merge_shared_sections(cached, get_shared_sections(db, [ref[0] for ref in cached.shared_refs]))
+
+
+async def aget_page_payload(db: AsyncSession, page_id: int):
+    """Async counterpart of `get_page_payload`; shares the same caches."""
+    cached = page_cache.get(page_id)
+    if cached is None:
+        page = await aload_page(db, page_id)
+        if not page:
+            return None
+        cached = cached_page_entry(page, (await db.execute(_shared_refs_query(page_id))).all())
+        page_cache.set(page_id, cached)
+        _await_derivatives(cached.payload, page_id=page_id)
+    if not cached.shared_refs:
+        return cached.payload
+    return merge_shared_sections(cached, await aget_shared_sections(db, [ref[0] for ref in cached.shared_refs]))
+
+
+def invalidate_pages(*page_ids):
+    """Evict cached payloads for the given pages; call after committing edits."""
+    page_cache.invalidate(*[int(pid) for pid in page_ids if pid is not None])
+
+
+def invalidate_all_pages():
+    """Evict every cached page, e.g. when a college name embedded in payloads changes."""
+    page_cache.clear()
+
+
+def invalidate_shared_sections(*section_ids):
+    """Evict cached shared sections; pages embedding them pick up the change."""
+    shared_section_cache.invalidate(*[int(sid) for sid in section_ids if sid is not None])
+
+
+def _images_without_srcset(value):
+    """Upload paths of images serialized (anywhere in `value`) without srcset data."""
+    if isinstance(value, list):
+        for child in value:
+            yield from _images_without_srcset(child)
+        return
+    if not isinstance(value, dict):
+        return
+    if value.get("image_url") and value.get("image_srcset") is None:
+        yield value["image_url"]
+    images = value.get("images") or ()
+    for url, srcset in zip(images, value.get("srcsets") or [None] * len(images)):
+        if srcset is None:
+            yield url
+    for child in value.values():
+        if isinstance(child, (dict, list)):
+            yield from _images_without_srcset(child)
+
+
+def _await_derivatives(payload, page_id=None, shared_section_id=None):
+    if not derivatives_available():
+        return
+    for url in _images_without_srcset(payload):
+        relative = upload_path(url) if isinstance(url, str) else None
+        if relative is None or os.path.splitext(relative)[1] not in SOURCE_EXTENSIONS:
+            continue
+        with _awaiting_lock:
+            page_ids, section_ids = _awaiting_derivatives.setdefault(relative, (set(), set()))
+            if page_id is not None:
+                page_ids.add(page_id)
+            if shared_section_id is not None:
+                section_ids.add(shared_section_id)
+
+
+def _drop_payloads_for_new_derivatives(relative):
+    # Payloads embed srcset data, which appears once derivatives are ready;
+    # only the cached payloads that serialized this image without it go.
+    with _awaiting_lock:
+        page_ids, section_ids = _awaiting_derivatives.pop(relative, ((), ()))
+    invalidate_pages(*page_ids)
+    invalidate_shared_sections(*section_ids)
+
+
+derivative_pool.subscribe(_drop_payloads_for_new_derivatives)
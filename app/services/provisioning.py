@@ -0,0 +1,260 @@
+"""
+Bulk onboarding of colleges with their standard pages.
+
+Each batch runs in one transaction: existing colleges, pages and SEO rows
+are found with one IN query per table, and everything missing is written
+with multi-row INSERT statements. Because those inserts bypass the ORM
+flush, the derived tables (tree paths, college_stats, effective_pages) are
+refreshed for the batch explicitly, and the in-process caches and search
+indexes are dropped once at the end.
+"""
+import logging
+import time
+
+from sqlalchemy import String, bindparam, cast, insert, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.college import College
+from app.schemas.schema import Page, PageSection, SEOMeta
+from app.services.college_cache import mark_colleges_changed
+from app.services.college_stats import refresh_college_stats
+from app.services.content_version import content_version
+from app.services.effective_pages import refresh_effective_pages
+from app.services.search import search_index, search_results, suggest_index
+
+logger = logging.getLogger(__name__)
+
+# Colleges written per transaction
+DEFAULT_BATCH_SIZE = 200
+
+# slug, title format, page type, template type, section type of the starter section
+STANDARD_PAGES = (
+    ("home", "{name} - Home", "HOME", "HERO_SECTION", "HERO"),
+    ("about", "About {name}", "ABOUT", "BLANK", "TEXT"),
+    ("courses", "Programs at {name}", "COURSES", "COURSES_LIST", "COURSES"),
+    ("faculty", "Faculty - {name}", "FACULTY", "FACULTY_LIST", "FACULTY"),
+    ("placements", "Placements - {name}", "PLACEMENTS", "PLACEMENTS", "PLACEMENTS"),
+    ("facilities", "Facilities - {name}", "FACILITIES", "FACILITIES_LIST", "FACILITIES"),
+    ("admissions", "Admissions - {name}", "ADMISSIONS", "BLANK", "TEXT"),
+    ("contact", "Contact {name}", "CONTACT", "BLANK", "FORM"),
+)
+STANDARD_SLUGS = [slug for slug, *_ in STANDARD_PAGES]
+
+COLLEGE_FIELDS = (
+    "name", "slug", "subdomain", "short_description", "logo_url",
+    "theme_primary_color", "theme_secondary_color", "is_active", "parent_id",
+)
+
+
+def standard_pages(college_name: str):
+    """Page attributes of the standard page set for a college."""
+    return [
+        {
+            "slug": slug,
+            "title": title.format(name=college_name),
+            "page_type": page_type,
+            "template_type": template_type,
+        }
+        for slug, title, page_type, template_type, _ in STANDARD_PAGES
+    ]
+
+
+def parse_college_specs(records):
+    """
+    Normalize CSV rows or JSON objects into provisioning specs: unknown keys
+    are dropped, blank strings become None and `is_active` accepts
+    true/false/yes/no/1/0.
+    """
+    specs = []
+    for record in records:
+        spec = {}
+        for key in (*COLLEGE_FIELDS, "parent_slug"):
+            value = record.get(key)
+            if isinstance(value, str):
+                value = value.strip() or None
+            spec[key] = value
+        if isinstance(spec["parent_id"], str):
+            spec["parent_id"] = int(spec["parent_id"])
+        if isinstance(spec["is_active"], str):
+            spec["is_active"] = spec["is_active"].lower() in ("1", "true", "yes", "y", "on")
+        specs.append(spec)
+    return specs
+
+
+def _college_row(spec):
+    # Every row carries every column: multi-row INSERTs need uniform keys.
+    row = {field: spec.get(field) if spec.get(field) != "" else None for field in COLLEGE_FIELDS}
+    if row["is_active"] is None:
+        row["is_active"] = True
+    if not row["name"] or not row["slug"]:
+        raise ValueError(f"College needs a name and a slug: {spec!r}")
+    return row
+
+
+def _insert_colleges(connection, rows, specs, counts):
+    """Insert colleges that do not exist yet, parents before children."""
+    slugs = [row["slug"] for row in rows]
+    parent_slugs = {spec["parent_slug"] for spec in specs if spec.get("parent_slug")}
+    known = dict(connection.execute(
+        select(College.slug, College.id).where(College.slug.in_(set(slugs) | parent_slugs))
+    ).all())
+    pending = [(row, spec.get("parent_slug")) for row, spec in zip(rows, specs) if row["slug"] not in known]
+    counts["colleges_existing"] += len(rows) - len(pending)
+
+    created = []
+    while pending:
+        ready = [(row, parent) for row, parent in pending if not parent or parent in known]
+        if not ready:
+            missing = sorted({parent for _, parent in pending})
+            raise ValueError(f"Unknown parent colleges: {', '.join(missing)}")
+        for row, parent in ready:
+            if parent:
+                row["parent_id"] = known[parent]
+        connection.execute(insert(College).values([row for row, _ in ready]))
+        ready_slugs = [row["slug"] for row, _ in ready]
+        known.update(connection.execute(
+            select(College.slug, College.id).where(College.slug.in_(ready_slugs))
+        ).all())
+        created.extend(ready_slugs)
+        pending = [item for item in pending if item not in ready]
+    counts["colleges"] += len(created)
+    return created
+
+
+def _provision_batch(db: Session, specs, counts):
+    # Core statements on the session's connection: no per-row ORM work and
+    # no ORM bulk-write hooks; derived data is refreshed explicitly below.
+    connection = db.connection()
+    mark_colleges_changed(db)
+    rows = [_college_row(spec) for spec in specs]
+    created_slugs = _insert_colleges(connection, rows, specs, counts)
+
+    colleges = connection.execute(
+        select(College.id, College.name, College.short_description)
+        .where(College.slug.in_([row["slug"] for row in rows]))
+    ).all()
+    college_ids = [c.id for c in colleges]
+
+    # Standard pages the colleges do not have yet
+    have = set(connection.execute(
+        select(Page.college_id, Page.slug).where(Page.college_id.in_(college_ids), Page.slug.in_(STANDARD_SLUGS))
+    ).all())
+    page_rows = [
+        {"college_id": c.id, "is_active": True, **page}
+        for c in colleges
+        for page in standard_pages(c.name)
+        if (c.id, page["slug"]) not in have
+    ]
+    if page_rows:
+        connection.execute(insert(Page).values(page_rows))
+        counts["pages"] += len(page_rows)
+        pages = connection.execute(
+            select(Page.id, Page.college_id, Page.slug, Page.title)
+            .where(tuple_(Page.college_id, Page.slug).in_([(r["college_id"], r["slug"]) for r in page_rows]))
+        ).all()
+        _insert_page_content(connection, pages, {c.id: c.short_description for c in colleges}, counts)
+
+    _refresh_derived(connection, created_slugs, college_ids)
+
+
+def _insert_page_content(connection, pages, descriptions, counts):
+    """Starter section, SEO row and materialized path for new standard pages."""
+    section_types = {slug: section_type for slug, *_, section_type in STANDARD_PAGES}
+    connection.execute(insert(PageSection).values([
+        {
+            "page_id": p.id,
+            "section_type": section_types[p.slug],
+            "section_title": p.title,
+            "sort_order": 0,
+            "is_active": True,
+        }
+        for p in pages
+    ]))
+    counts["sections"] += len(pages)
+
+    page_ids = [p.id for p in pages]
+    with_seo = set(connection.execute(select(SEOMeta.page_id).where(SEOMeta.page_id.in_(page_ids))).scalars())
+    seo_rows = [
+        {
+            "page_id": p.id,
+            "meta_title": p.title,
+            "meta_description": descriptions.get(p.college_id),
+            "og_title": p.title,
+        }
+        for p in pages
+        if p.id not in with_seo
+    ]
+    if seo_rows:
+        connection.execute(insert(SEOMeta).values(seo_rows))
+    counts["seo"] += len(seo_rows)
+
+    # Standard pages are roots of their own inheritance tree.
+    table = Page.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id.in_(page_ids))
+        .values(path=literal("/", String) + cast(table.c.id, String) + literal("/", String))
+    )
+
+
+def _refresh_derived(connection, created_slugs, college_ids):
+    """Bring tables maintained by ORM hooks up to date for rows inserted in bulk."""
+    if created_slugs:
+        new_colleges = connection.execute(
+            select(College.id, College.parent_id).where(College.slug.in_(created_slugs)).order_by(College.id)
+        ).all()
+        parent_ids = {c.parent_id for c in new_colleges if c.parent_id}
+        paths = dict(connection.execute(
+            select(College.id, College.path).where(College.id.in_(parent_ids))
+        ).all()) if parent_ids else {}
+        for college in new_colleges:
+            # Parents inserted earlier have lower ids, so their path is known.
+            paths[college.id] = f"{paths.get(college.parent_id) or '/'}{college.id}/"
+        table = College.__table__
+        connection.execute(
+            table.update().where(table.c.id == bindparam("node_id")).values(path=bindparam("new_path")),
+            [{"node_id": c.id, "new_path": paths[c.id]} for c in new_colleges],
+        )
+    refresh_college_stats(connection, college_ids)
+    refresh_effective_pages(connection, college_ids)
+
+
+def _drop_caches():
+    search_index.invalidate()
+    suggest_index.invalidate()
+    search_results.invalidate()
+    content_version.bump()
+
+
+def provision_colleges(db: Session, specs, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Create the colleges described by `specs` (dicts with COLLEGE_FIELDS and
+    an optional `parent_slug`) plus their standard pages, one starter
+    section and an SEO row per page. Colleges that already exist (by slug)
+    only get their missing standard pages. Returns a report with row
+    counts and throughput.
+    """
+    specs = list(specs)
+    counts = {"colleges": 0, "colleges_existing": 0, "pages": 0, "sections": 0, "seo": 0}
+    start = time.perf_counter()
+    try:
+        for offset in range(0, len(specs), batch_size):
+            _provision_batch(db, specs[offset:offset + batch_size], counts)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        if counts["colleges"] or counts["pages"]:
+            _drop_caches()
+    seconds = time.perf_counter() - start
+
+    rows = counts["colleges"] + counts["pages"] + counts["sections"] + counts["seo"]
+    report = {
+        **counts,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+    }
+    logger.info(f"Provisioned colleges: {report}")
+    return report
@@ -0,0 +1,45 @@
+"""
+Search over colleges, pages, courses and faculty.
+
+`search_index` is the configured backend (settings.SEARCH_BACKEND):
+"memory" for the in-process inverted index, "mysql" for FULLTEXT indexes
+(requires migration 4d5e6f7g8h9i). Both expose the same interface:
+`search(db, query, types=None, limit=10)` returns ranked hit dicts with
+"type" and "score" plus the entity's result fields.
+
+`suggest_index` serves typeahead suggestions from memory (see suggest.py)
+and `search_results` caches /search results per analyzed query.
+"""
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.search import sync
+from app.services.search.documents import ENTITIES, ENTITIES_BY_NAME
+from app.services.search.memory import InMemorySearchIndex
+from app.services.search.mysql import MySQLFullTextSearch
+from app.services.search.results import SearchResultCache
+from app.services.search.suggest import SuggestIndex
+
+
+def create_search_index(backend: str = None):
+    backend = backend or settings.SEARCH_BACKEND
+    if backend == "mysql":
+        return MySQLFullTextSearch()
+    if backend == "memory":
+        return InMemorySearchIndex(refresh_seconds=settings.SEARCH_INDEX_REFRESH)
+    raise ValueError(f"Unknown SEARCH_BACKEND '{backend}'")
+
+
+search_index = create_search_index()
+suggest_index = SuggestIndex(refresh_seconds=settings.SEARCH_INDEX_REFRESH)
+search_results = SearchResultCache(maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_CACHE_TTL)
+sync.register(search_index, suggest_index, search_results)
+
+
+def build_search_indexes():
+    """Load the in-process indexes; called at application startup."""
+    db = SessionLocal()
+    try:
+        search_index.build(db)
+        suggest_index.build(db)
+    finally:
+        db.close()
@@ -0,0 +1,94 @@
+"""
+Searchable entities and the documents built from them.
+
+Each SearchEntity says which model is searched, which columns are indexed
+(with a weight; titles count more than body text) and which columns are
+returned in results.
+"""
+from dataclasses import dataclass
+
+from app.models.college import College
+from app.schemas.schema import Course, Faculty, Page
+from app.services.search.text import analyze
+
+
+@dataclass(frozen=True)
+class SearchEntity:
+    name: str
+    model: type
+    fields: tuple  # ((column name, weight), ...)
+    result_fields: tuple
+
+    def is_indexed(self, obj) -> bool:
+        return getattr(obj, "is_active", True) is not False
+
+    def payload(self, obj) -> dict:
+        return {field: getattr(obj, field) for field in self.result_fields}
+
+    def document(self, obj) -> "SearchDocument":
+        weights = {}
+        for field, weight in self.fields:
+            for term in analyze(getattr(obj, field) or ""):
+                weights[term] = weights.get(term, 0.0) + weight
+        return SearchDocument(
+            entity=self.name,
+            id=obj.id,
+            college_id=obj.id if self.model is College else getattr(obj, "college_id", None),
+            terms=weights,
+            payload=self.payload(obj),
+        )
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    entity: str
+    id: int
+    college_id: int
+    terms: dict  # term -> summed field weight
+    payload: dict
+
+    @property
+    def key(self):
+        return (self.entity, self.id)
+
+
+ENTITIES = (
+    SearchEntity(
+        name="colleges",
+        model=College,
+        fields=(("name", 3.0), ("short_description", 1.0)),
+        result_fields=("id", "name", "slug", "short_description"),
+    ),
+    SearchEntity(
+        name="pages",
+        model=Page,
+        fields=(("title", 3.0),),
+        result_fields=("id", "title", "slug", "college_id"),
+    ),
+    SearchEntity(
+        name="courses",
+        model=Course,
+        fields=(("name", 3.0), ("department", 1.5), ("overview", 1.0)),
+        result_fields=("id", "name", "slug", "college_id"),
+    ),
+    SearchEntity(
+        name="faculty",
+        model=Faculty,
+        fields=(("name", 3.0), ("designation", 1.0)),
+        result_fields=("id", "name", "designation", "college_id"),
+    ),
+)
+
+ENTITIES_BY_NAME = {e.name: e for e in ENTITIES}
+ENTITIES_BY_MODEL = {e.model: e for e in ENTITIES}
+
+
+def entity_for(obj):
+    return ENTITIES_BY_MODEL.get(type(obj))
+
+
+def select_entities(types=None):
+    """Entities for the requested type names (all when `types` is empty)."""
+    if not types:
+        return ENTITIES
+    return tuple(ENTITIES_BY_NAME[t] for t in types if t in ENTITIES_BY_NAME)
@@ -0,0 +1,223 @@
+"""
+Pure-Python in-process search backend.
+
+An inverted index (term -> {document key: weight}) with a sorted term list
+for prefix lookups. It is built from the CMS tables at startup, patched
+after every committed admin write in this worker, and rebuilt every
+SEARCH_INDEX_REFRESH seconds (or after `invalidate`) so writes handled by
+other workers show up. Rebuilds run in one background thread while
+searches keep using the current index; patches committed during a rebuild
+are replayed on the new snapshot before it is swapped in.
+"""
+from bisect import bisect_left
+import logging
+import math
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.services.search.documents import ENTITIES, select_entities
+from app.services.search.text import analyze
+
+logger = logging.getLogger(__name__)
+
+# Score multiplier for a term matched only as a prefix of the query word.
+PREFIX_MATCH_WEIGHT = 0.5
+
+
+class InMemorySearchIndex:
+    """Ranked search over colleges, pages, courses and faculty."""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._docs = {}
+        self._postings = {}
+        self._terms = []
+        self._terms_dirty = False
+        self._built_at = None
+        self._stale = False
+        self._refreshing = False
+        # Patches applied while a build reads the tables; None when not building
+        self._patches_during_build = None
+
+    # -- maintenance -------------------------------------------------------
+
+    def build(self, db: Session):
+        """(Re)build the whole index from the database."""
+        start = time.perf_counter()
+        with self._lock:
+            self._stale = False
+            self._patches_during_build = []
+        try:
+            docs = {}
+            for entity in ENTITIES:
+                q = db.query(entity.model)
+                if hasattr(entity.model, "is_active"):
+                    q = q.filter(entity.model.is_active == True)
+                for obj in q:
+                    doc = entity.document(obj)
+                    docs[doc.key] = doc
+
+            postings = {}
+            for key, doc in docs.items():
+                for term, weight in doc.terms.items():
+                    postings.setdefault(term, {})[key] = weight
+        except BaseException:
+            with self._lock:
+                self._patches_during_build = None
+            raise
+
+        with self._lock:
+            patches, self._patches_during_build = self._patches_during_build, None
+            self._docs = docs
+            self._postings = postings
+            # The rows may have been read before these commits; patching is
+            # idempotent, so replaying ones the build already saw is harmless.
+            for changes, deleted_college_ids in patches:
+                self._patch(changes, deleted_college_ids)
+            self._terms = sorted(self._postings)
+            self._terms_dirty = False
+            self._built_at = time.monotonic()
+        logger.info(
+            f"Search index built: {len(docs)} documents, {len(postings)} terms "
+            f"in {1000 * (time.perf_counter() - start):.1f}ms"
+        )
+
+    def build_from_db(self):
+        db = SessionLocal()
+        try:
+            self.build(db)
+        finally:
+            db.close()
+
+    def _refresh_in_background(self):
+        try:
+            self.build_from_db()
+        except Exception as e:
+            logger.error(f"Search index rebuild failed: {e}")
+        finally:
+            self._refreshing = False
+
+    def is_fresh(self) -> bool:
+        return (
+            self._built_at is not None
+            and not self._stale
+            and time.monotonic() - self._built_at < self.refresh_seconds
+        )
+
+    def _maybe_refresh(self):
+        with self._lock:
+            if self._refreshing or self.is_fresh():
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="search-index", daemon=True).start()
+
+    def invalidate(self):
+        """Rebuild in the background on the next search; keep serving the current index meanwhile."""
+        self._stale = True
+
+    def apply(self, changes, deleted_college_ids=()):
+        """
+        Patch the index after a commit. `changes` maps (entity, id) to the new
+        SearchDocument, or None when the row was deleted or deactivated.
+        """
+        with self._lock:
+            if self._patches_during_build is not None:
+                self._patches_during_build.append((changes, deleted_college_ids))
+            if self._built_at is not None:
+                self._patch(changes, deleted_college_ids)
+
+    def _patch(self, changes, deleted_college_ids):
+        for key, doc in changes.items():
+            self._remove(key)
+            if doc is not None:
+                self._add(doc)
+        if deleted_college_ids:
+            # Courses, pages and faculty go with their college (ON DELETE CASCADE).
+            for key, doc in list(self._docs.items()):
+                if doc.college_id in deleted_college_ids:
+                    self._remove(key)
+
+    def _add(self, doc):
+        self._docs[doc.key] = doc
+        for term, weight in doc.terms.items():
+            if term not in self._postings:
+                self._postings[term] = {}
+                self._terms_dirty = True
+            self._postings[term][doc.key] = weight
+
+    def _remove(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for term in doc.terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(key, None)
+            if not posting:
+                del self._postings[term]
+                self._terms_dirty = True
+
+    # -- querying ----------------------------------------------------------
+
+    def _expand(self, term, prefix):
+        """Index terms matching `term`: itself, plus terms it prefixes."""
+        matches = {}
+        if term in self._postings:
+            matches[term] = 1.0
+        if prefix:
+            if self._terms_dirty:
+                self._terms = sorted(self._postings)
+                self._terms_dirty = False
+            i = bisect_left(self._terms, term)
+            while i < len(self._terms) and self._terms[i].startswith(term):
+                matches.setdefault(self._terms[i], PREFIX_MATCH_WEIGHT)
+                i += 1
+        return matches
+
+    def search(self, db: Session, query: str, types=None, limit: int = 10):
+        """
+        Ranked hits for `query` across the requested entity types, at most
+        `limit` per type.
+
+        Every query word must match (the last one may match as a prefix, for
+        search-as-you-type); documents score by summed idf x field weight.
+        Never waits for a rebuild: a stale index schedules one and answers
+        from its current contents.
+        """
+        self._maybe_refresh()
+        words = analyze(query)
+        if not words:
+            return []
+        wanted = {e.name for e in select_entities(types)}
+
+        with self._lock:
+            total = len(self._docs) or 1
+            scores = None
+            for n, word in enumerate(words):
+                word_scores = {}
+                for term, match_weight in self._expand(word, prefix=n == len(words) - 1).items():
+                    posting = self._postings[term]
+                    idf = math.log(1 + total / len(posting))
+                    for key, weight in posting.items():
+                        if key[0] not in wanted:
+                            continue
+                        score = idf * match_weight * (1 + math.log(weight))
+                        word_scores[key] = max(word_scores.get(key, 0.0), score)
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {k: s + word_scores[k] for k, s in scores.items() if k in word_scores}
+                if not scores:
+                    return []
+
+            hits, per_type = [], {}
+            for key, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+                per_type[key[0]] = per_type.get(key[0], 0) + 1
+                if per_type[key[0]] <= limit:
+                    hits.append({"type": key[0], "score": round(score, 4), **self._docs[key].payload})
+            return hits
@@ -0,0 +1,49 @@
+"""
+MySQL FULLTEXT search backend.
+
+Uses the FULLTEXT indexes added by migration 4d5e6f7g8h9i and MATCH ...
+AGAINST in boolean mode. Query words are analyzed like the in-process
+backend and sent as required prefix terms (`+engineer*`), so stemming and
+prefix matching behave the same. The index is maintained by MySQL itself.
+"""
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.services.search.documents import select_entities
+from app.services.search.text import analyze
+
+
+def boolean_query(query: str) -> str:
+    return " ".join(f"+{term}*" for term in analyze(query))
+
+
+class MySQLFullTextSearch:
+    """Ranked search over colleges, pages, courses and faculty via FULLTEXT."""
+
+    def build(self, db: Session):
+        pass
+
+    def invalidate(self):
+        pass
+
+    def apply(self, changes, deleted_college_ids=()):
+        pass
+
+    def search(self, db: Session, query: str, types=None, limit: int = 10):
+        """Ranked hits for `query`, at most `limit` per entity type."""
+        against = boolean_query(query)
+        if not against:
+            return []
+
+        hits = []
+        for entity in select_entities(types):
+            columns = [entity.model.__table__.c[field] for field, _ in entity.fields]
+            relevance = match(*columns, against=against).in_boolean_mode()
+            q = db.query(entity.model, relevance.label("score")).filter(relevance > 0)
+            if hasattr(entity.model, "is_active"):
+                q = q.filter(entity.model.is_active == True)
+            for obj, score in q.order_by(relevance.desc()).limit(limit):
+                hits.append({"type": entity.name, "score": round(float(score), 4), **entity.payload(obj)})
+
+        hits.sort(key=lambda hit: (-hit["score"], hit["type"], hit["id"]))
+        return hits
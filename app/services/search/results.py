@@ -0,0 +1,91 @@
+"""
+Cache of /search results keyed by the analyzed query.
+
+"MBA", " mba " and "M.B.A." analyze to the same terms and share one entry.
+Concurrent misses for the same key are coalesced: the first request runs
+the search and the others await its result, so a burst of an identical
+query costs one database round trip. Entries are dropped whenever a
+searchable entity changes (registered with the search sync hooks) and
+otherwise expire after SEARCH_CACHE_TTL seconds.
+"""
+import asyncio
+
+from app.services.cache import TTLCache
+from app.services.search.text import analyze
+
+
+class _LeaderCancelled(Exception):
+    """The request computing a shared result was cancelled; waiters retry."""
+
+
+class SearchResultCache:
+    """TTL/LRU result cache with single-flight misses (per worker)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, name="search")
+        self._inflight = {}
+        self._generation = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(query: str, types=None):
+        return (" ".join(analyze(query)), tuple(sorted(types or ())))
+
+    async def get_or_compute(self, key, compute):
+        """
+        Cached value for `key`, or the result of `await compute()`. Callers
+        arriving while a computation for `key` is running share its result;
+        if the request running it is cancelled, one of them takes over.
+        """
+        waited = False
+        while True:
+            value = self._cache.get(key)
+            if value is not None:
+                return value
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            if not waited:
+                self.coalesced += 1
+                waited = True
+            try:
+                return await asyncio.shield(pending)
+            except _LeaderCancelled:
+                # `compute` belongs to the cancelled request (its session is
+                # being closed); rerun with this caller's own.
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an error nobody else awaited isn't logged twice.
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        # Don't store results computed across an invalidation.
+        if generation == self._generation:
+            self._cache.set(key, value)
+        future.set_result(value)
+        return value
+
+    def apply(self, changes, deleted_college_ids=()):
+        self.invalidate()
+
+    def invalidate(self):
+        self._generation += 1
+        self._cache.clear()
+
+    def stats(self):
+        return {**self._cache.stats(), "coalesced": self.coalesced, "in_flight": len(self._inflight)}
@@ -0,0 +1,169 @@
+"""
+Typeahead suggestions for the public search box.
+
+A sorted array of (key, entity, id) entries, one per word position of each
+college, course, faculty and page title, answered with a binary search.
+The array is built at startup, patched after admin commits, and rebuilt in
+a background thread when it gets old; a request never waits on the
+database.
+"""
+from bisect import bisect_left, insort
+import logging
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.services.search.documents import ENTITIES, select_entities
+from app.services.search.text import STOPWORDS, TOKEN_RE, normalize
+
+logger = logging.getLogger(__name__)
+
+# Entries examined per request before ranking; bounds latency for short prefixes.
+MAX_SCAN = 200
+
+LABEL_FIELDS = ("name", "title")
+
+
+def suggest_key(text: str) -> str:
+    """Lower-case, accent- and punctuation-free form used for matching."""
+    return " ".join(TOKEN_RE.findall(normalize(text)))
+
+
+def _entry_keys(label: str):
+    words = suggest_key(label).split(" ")
+    return [
+        " ".join(words[n:])
+        for n in range(len(words))
+        if words[n] and (n == 0 or words[n] not in STOPWORDS)
+    ]
+
+
+class SuggestIndex:
+    """Prefix lookups over entity titles."""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._entries = []
+        self._docs = {}
+        self._built_at = None
+        self._refreshing = False
+
+    def _suggestion(self, doc):
+        label = next((doc.payload[f] for f in LABEL_FIELDS if doc.payload.get(f)), "")
+        suggestion = {"type": doc.entity, "id": doc.id, "label": label}
+        for field in ("slug", "college_id"):
+            if field in doc.payload:
+                suggestion[field] = doc.payload[field]
+        return suggestion
+
+    def build(self, db: Session):
+        start = time.perf_counter()
+        docs, entries = {}, []
+        for entity in ENTITIES:
+            q = db.query(entity.model)
+            if hasattr(entity.model, "is_active"):
+                q = q.filter(entity.model.is_active == True)
+            for obj in q:
+                doc = entity.document(obj)
+                suggestion = self._suggestion(doc)
+                keys = _entry_keys(suggestion["label"])
+                docs[doc.key] = (suggestion, keys, doc.college_id)
+                entries.extend((key, doc.entity, doc.id) for key in keys)
+        entries.sort()
+        with self._lock:
+            self._docs = docs
+            self._entries = entries
+            self._built_at = time.monotonic()
+        logger.info(
+            f"Suggest index built: {len(docs)} titles, {len(entries)} keys "
+            f"in {1000 * (time.perf_counter() - start):.1f}ms"
+        )
+
+    def build_from_db(self):
+        db = SessionLocal()
+        try:
+            self.build(db)
+        finally:
+            db.close()
+
+    def _refresh_in_background(self):
+        try:
+            self.build_from_db()
+        except Exception as e:
+            logger.error(f"Suggest index rebuild failed: {e}")
+        finally:
+            self._refreshing = False
+
+    def _maybe_refresh(self):
+        if self._refreshing:
+            return
+        if self._built_at is not None and time.monotonic() - self._built_at < self.refresh_seconds:
+            return
+        self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="suggest-index", daemon=True).start()
+
+    def invalidate(self):
+        """Rebuild in the background; keep serving the current entries meanwhile."""
+        self._built_at = None
+        self._maybe_refresh()
+
+    def apply(self, changes, deleted_college_ids=()):
+        """Patch entries after a commit (same arguments as the search index)."""
+        with self._lock:
+            removed = set(changes)
+            if deleted_college_ids:
+                removed.update(k for k, (_, _, college_id) in self._docs.items() if college_id in deleted_college_ids)
+            for key in removed:
+                self._remove(key)
+            for key, doc in changes.items():
+                if doc is not None:
+                    self._add(doc)
+
+    def _add(self, doc):
+        suggestion = self._suggestion(doc)
+        keys = _entry_keys(suggestion["label"])
+        self._docs[doc.key] = (suggestion, keys, doc.college_id)
+        for key in keys:
+            insort(self._entries, (key, doc.entity, doc.id))
+
+    def _remove(self, doc_key):
+        item = self._docs.pop(doc_key, None)
+        if item is None:
+            return
+        for key in item[1]:
+            entry = (key, *doc_key)
+            i = bisect_left(self._entries, entry)
+            if i < len(self._entries) and self._entries[i] == entry:
+                del self._entries[i]
+
+    def suggest(self, prefix: str, limit: int = 8, types=None):
+        """
+        Titles with a word starting with `prefix`; titles that start with it
+        come first, then shorter titles.
+        """
+        self._maybe_refresh()
+        key = suggest_key(prefix)
+        if not key:
+            return []
+        wanted = {e.name for e in select_entities(types)}
+
+        best = {}
+        with self._lock:
+            i = bisect_left(self._entries, (key,))
+            end = min(len(self._entries), i + MAX_SCAN)
+            while i < end and self._entries[i][0].startswith(key):
+                entry_key, entity, doc_id = self._entries[i]
+                i += 1
+                if entity not in wanted:
+                    continue
+                suggestion, keys, _ = self._docs[(entity, doc_id)]
+                label = suggestion["label"]
+                # keys[0] is the whole title, i.e. the title starts with the prefix
+                rank = (entry_key != keys[0], len(label), label.lower(), entity, doc_id)
+                if (entity, doc_id) not in best or rank < best[(entity, doc_id)][0]:
+                    best[(entity, doc_id)] = (rank, suggestion)
+
+        return [suggestion for _, suggestion in sorted(best.values(), key=lambda item: item[0])[:limit]]
@@ -0,0 +1,60 @@
+"""
+Keeps the search index in step with committed writes.
+
+Documents for inserted/updated/deleted searchable rows are captured at
+flush time (while attribute values are loaded) and applied to the index
+only after the transaction commits.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.college import College
+from app.services.search.documents import ENTITIES_BY_MODEL, entity_for
+
+_CHANGES = "search_changes"
+_DELETED_COLLEGES = "search_deleted_colleges"
+_STALE = "search_stale"
+
+
+def register(*indexes):
+    """Wire session events so commits update each of `indexes`."""
+
+    @event.listens_for(Session, "after_flush")
+    def _collect_search_changes(session, flush_context):
+        changes = session.info.setdefault(_CHANGES, {})
+        for obj in (*session.new, *session.dirty):
+            entity = entity_for(obj)
+            if entity is not None:
+                changes[(entity.name, obj.id)] = entity.document(obj) if entity.is_indexed(obj) else None
+        for obj in session.deleted:
+            entity = entity_for(obj)
+            if entity is not None:
+                changes[(entity.name, obj.id)] = None
+                if isinstance(obj, College):
+                    session.info.setdefault(_DELETED_COLLEGES, set()).add(obj.id)
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _track_bulk_search_changes(orm_execute_state):
+        # update()/delete() statements don't say which rows changed; rebuild.
+        if orm_execute_state.is_update or orm_execute_state.is_delete:
+            mapper = orm_execute_state.bind_mapper
+            if mapper is None or mapper.class_ in ENTITIES_BY_MODEL:
+                orm_execute_state.session.info[_STALE] = True
+
+    @event.listens_for(Session, "after_commit")
+    def _apply_search_changes(session):
+        changes = session.info.pop(_CHANGES, None)
+        deleted_colleges = session.info.pop(_DELETED_COLLEGES, ())
+        stale = session.info.pop(_STALE, False)
+        if not (stale or changes or deleted_colleges):
+            return
+        for index in indexes:
+            if stale:
+                index.invalidate()
+            else:
+                index.apply(changes or {}, deleted_colleges)
+
+    @event.listens_for(Session, "after_soft_rollback")
+    def _discard_search_changes(session, previous_transaction):
+        for key in (_CHANGES, _DELETED_COLLEGES, _STALE):
+            session.info.pop(key, None)
@@ -0,0 +1,61 @@
+"""
+Text analysis shared by the search backends: tokenization, stop words and
+a light suffix-stripping stemmer.
+
+Indexing and querying go through the same `analyze`, so "Engineering",
+"engineers" and "engineer" all meet at the same term.
+"""
+import re
+import unicodedata
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# "B.Tech" / "M.B.A." -> "btech" / "mba" so abbreviations match as typed.
+_ABBREVIATION_DOT_RE = re.compile(r"(?<=[a-z0-9])\.(?=[a-z0-9])")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the to with".split()
+)
+
+# (suffix, replacement), first match wins; the stem keeps at least 3 letters.
+SUFFIX_RULES = (
+    ("sses", "ss"),
+    ("ies", "y"),
+    ("ments", "ment"),
+    ("ers", "er"),
+    ("ing", ""),
+    ("ed", ""),
+    ("s", ""),
+)
+
+# Words ending in these are left alone by the trailing "s" rule.
+_KEEP_S = ("ss", "us", "is")
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text or "")
+    text = text.encode("ascii", "ignore").decode().lower()
+    return _ABBREVIATION_DOT_RE.sub("", text)
+
+
+def stem(token: str) -> str:
+    if len(token) <= 3 or token.isdigit():
+        return token
+    for suffix, replacement in SUFFIX_RULES:
+        if not token.endswith(suffix):
+            continue
+        if suffix == "s" and token.endswith(_KEEP_S):
+            return token
+        stemmed = token[: -len(suffix)] + replacement
+        return stemmed if len(stemmed) >= 3 else token
+    return token
+
+
+def tokenize(text: str):
+    """Lower-cased tokens of `text` without stop words (not stemmed)."""
+    return [t for t in TOKEN_RE.findall(normalize(text)) if t not in STOPWORDS]
+
+
+def analyze(text: str):
+    """Index/query terms for `text`: tokenized and stemmed."""
+    return [stem(t) for t in tokenize(text)]
@@ -0,0 +1,270 @@
+"""
+Static pre-rendering of the public site.
+
+`publish_site` renders every active page to a fresh release directory and
+then atomically repoints the `current` symlink at it:
+
+    <STATIC_PUBLISH_DIR>/
+        current -> releases/<release>
+        releases/<release>/
+            index.html                               the `/` home page
+            <college_slug>/<page_slug>/index.html    server-rendered pages
+            api/v1/pages/<page_id>.json              `/api/v1/pages/{id}`
+            api/v1/<college_slug>/<page_slug>.json   `/api/v1/{college}/{page}`
+
+Readers (nginx, a CDN origin, or the StaticFiles mount in app.main) only
+ever see a complete release. When enabled, `static_publisher` republishes
+in a background thread shortly after content-changing commits; bursts of
+admin edits are coalesced into one publish.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.templates import template_env
+from app.models.college import College
+from app.schemas.schema import EffectivePage, Page, page_shared_sections
+from app.services.content_version import content_version
+from app.services.fragment_cache import render_fragments
+from app.services.page_assembly import (
+    cached_page_entry,
+    get_shared_sections,
+    load_home_page,
+    merge_shared_sections,
+    page_load_options,
+    sections_with_shared,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Pages loaded (with sections, items, SEO and college) per query batch
+PUBLISH_BATCH_SIZE = 200
+
+def _write(release: Path, relative: str, content: str):
+    path = release / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _render_html(db: Session, page, content_page=None):
+    sections = sections_with_shared(db, content_page or page) if page else []
+    return template_env.get_template("index.html").render(
+        page=page,
+        sections=sections,
+        fragments=render_fragments(template_env, page, sections) if page else None,
+        courses={},
+        faculty={},
+        placement={},
+        facilities={},
+        now=datetime.now(timezone.utc),
+    )
+
+
+def _dump(payload):
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":"))
+
+
+def _load_payloads(db: Session, page_ids, shared_refs, pages, payloads, active_only=True):
+    """Load pages in batches and build their merged `/pages/{id}` payloads."""
+    shared = get_shared_sections(db, {ref[0] for pid in page_ids for ref in shared_refs.get(pid, ())})
+    for offset in range(0, len(page_ids), PUBLISH_BATCH_SIZE):
+        q = db.query(Page).options(*page_load_options()).filter(Page.id.in_(page_ids[offset:offset + PUBLISH_BATCH_SIZE]))
+        if active_only:
+            q = q.filter(Page.is_active == True)
+        for page in q:
+            pages[page.id] = page
+            payloads[page.id] = merge_shared_sections(cached_page_entry(page, shared_refs.get(page.id, ())), shared)
+
+
+def _render_release(db: Session, release: Path, counts):
+    _write(release, "index.html", _render_html(db, load_home_page(db)))
+    counts["files"] += 1
+
+    shared_refs = {}
+    for page_id, section_id, sort_order in db.execute(
+        select(page_shared_sections.c.page_id, page_shared_sections.c.shared_section_id, page_shared_sections.c.sort_order)
+    ):
+        shared_refs.setdefault(page_id, []).append((section_id, sort_order))
+
+    pages, payloads = {}, {}
+    page_ids = db.execute(select(Page.id).where(Page.is_active == True).order_by(Page.id)).scalars().all()
+    _load_payloads(db, page_ids, shared_refs, pages, payloads)
+    for page_id, payload in payloads.items():
+        _write(release, f"api/v1/pages/{page_id}.json", _dump(payload))
+    counts["pages"] += len(payloads)
+    counts["files"] += len(payloads)
+
+    # Each college serves its effective pages (own or inherited) by slug;
+    # inherited copies without sections show their source page's content.
+    effective = db.execute(
+        select(College.slug, EffectivePage.slug, EffectivePage.page_id, EffectivePage.content_page_id)
+        .join(EffectivePage, EffectivePage.college_id == College.id)
+        .where(College.is_active == True)
+    ).all()
+    sources = sorted({row.content_page_id for row in effective} - payloads.keys())
+    _load_payloads(db, sources, shared_refs, pages, payloads, active_only=False)
+    for college_slug, page_slug, page_id, content_page_id in effective:
+        if page_id not in payloads:
+            continue
+        payload = payloads[page_id]
+        content_id = content_page_id if content_page_id in payloads else page_id
+        if content_id != page_id:
+            payload = {**payload, "data": {**payload["data"], "sections": payloads[content_id]["data"]["sections"]}}
+        _write(release, f"api/v1/{college_slug}/{page_slug}.json", _dump(payload))
+        _write(release, f"{college_slug}/{page_slug}/index.html", _render_html(db, pages[page_id], pages[content_id]))
+        counts["files"] += 2
+
+
+def _lock(lock_file):
+    """Block until this process holds the exclusive lock on `lock_file`."""
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            # LK_LOCK itself gives up after ten one-second attempts
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _remove_link(path: Path):
+    if not os.path.lexists(path):
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        os.rmdir(path)  # a Windows directory junction
+
+
+def _swap_current(root: Path, release: Path):
+    """Point `root/current` at `release` with a single rename."""
+    link = root / "current"
+    tmp_link = root / f".current-{os.getpid()}"
+    _remove_link(tmp_link)
+    try:
+        tmp_link.symlink_to(Path("releases") / release.name, target_is_directory=True)
+    except OSError:
+        if os.name != "nt":
+            raise
+        # Symlinks need a privilege on Windows; junctions do not, but a
+        # directory entry cannot be renamed over, so `current` briefly
+        # disappears. Fine for development machines.
+        import _winapi
+        _winapi.CreateJunction(str(release.resolve()), str(tmp_link))
+        _remove_link(link)
+    os.replace(tmp_link, link)
+
+
+def _prune_releases(root: Path, keep: int):
+    current = (root / "current").resolve()
+    releases = sorted(p for p in (root / "releases").iterdir() if p.is_dir() and not p.name.startswith("."))
+    for old in releases[:-keep] if keep > 0 else releases:
+        if old.resolve() != current:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def publish_site(db: Session, root=None, keep: int = None):
+    """
+    Render every active page into a new release under `root` (default
+    STATIC_PUBLISH_DIR), switch `current` to it and prune old releases
+    beyond `keep`. Returns a report with counts, the release path and timing.
+    """
+    root = Path(root or settings.STATIC_PUBLISH_DIR)
+    keep = settings.STATIC_PUBLISH_KEEP if keep is None else keep
+    (root / "releases").mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    version = content_version.current
+    with open(root / ".publish.lock", "w") as lock:
+        # One publisher at a time across worker processes
+        _lock(lock)
+        name = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{version}"
+        staging = root / "releases" / f".{name}"
+        counts = {"pages": 0, "files": 0}
+        try:
+            _render_release(db, staging, counts)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        release = staging.rename(root / "releases" / name)
+        _swap_current(root, release)
+        _prune_releases(root, keep)
+
+    report = {
+        **counts,
+        "release": str(release),
+        "content_version": version,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info(f"Published static site: {report}")
+    return report
+
+
+class StaticPublisher:
+    """Background thread republishing the site after content changes."""
+
+    def __init__(self, session_factory, delay: float):
+        self.session_factory = session_factory
+        self.delay = delay
+        self.last_report = None
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def request_publish(self, version=None):
+        """Schedule a publish; requests within `delay` seconds are coalesced."""
+        self._wakeup.set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        content_version.subscribe(self.request_publish)
+        self._thread = threading.Thread(target=self._run, name="static-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        content_version.unsubscribe(self.request_publish)
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            if self._stopping:
+                return
+            # Let a burst of commits settle before rendering.
+            time.sleep(self.delay)
+            self._wakeup.clear()
+            db = self.session_factory()
+            try:
+                self.last_report = publish_site(db)
+            except Exception:
+                logger.exception("Static publish failed")
+            finally:
+                db.close()
+
+
+static_publisher = StaticPublisher(SessionLocal, delay=settings.STATIC_PUBLISH_DELAY)
@@ -0,0 +1,178 @@
+"""
+Materialized paths for the college tree and the page inheritance tree.
+
+`colleges.path` and `pages.path` hold the ids from the root down to the row,
+e.g. "/1/4/9/", so all descendants of a node match `path LIKE '/1/4/%'` on
+an index and all ancestor ids are in the row itself. Session events keep
+the paths in step with inserts, reparenting and deletes inside the writing
+transaction; moving a node rewrites its whole subtree with one UPDATE.
+Bulk update()/delete() statements on these tables trigger a full rebuild
+before commit.
+"""
+from sqlalchemy import String, bindparam, event, func, inspect, literal, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.college import College
+from app.schemas.schema import Page
+
+# Tree models and the attribute holding each row's parent id
+PARENT_ATTRS = {College: "parent_id", Page: "parent_page_id"}
+
+_PENDING = "tree_paths_pending"
+_REBUILD = "tree_paths_rebuild"
+
+
+def path_ids(path):
+    """Ids on a materialized path, root first."""
+    return [int(part) for part in path.strip("/").split("/")] if path else []
+
+
+def subtree_clause(model, path):
+    """Filter matching the row with `path` and all its descendants."""
+    return model.path.like(f"{path}%")
+
+
+def _compute_paths(rows):
+    """{id: path} for (id, parent_id) rows; dangling parents and cycles become roots."""
+    parents = dict(rows)
+    paths = {}
+    for start in parents:
+        chain = []
+        node_id = start
+        while node_id in parents and node_id not in paths and node_id not in chain:
+            chain.append(node_id)
+            node_id = parents[node_id]
+        base = "/" if node_id in chain else paths.get(node_id, "/")
+        for chain_id in reversed(chain):
+            base = f"{base}{chain_id}/"
+            paths[chain_id] = base
+    return paths
+
+
+def rebuild_paths(connection, model):
+    """Recompute `model.path` for every row; returns the number of rows changed."""
+    parent = getattr(model, PARENT_ATTRS[model])
+    rows = connection.execute(select(model.id, parent, model.path)).all()
+    paths = _compute_paths([(row[0], row[1]) for row in rows])
+    changed = [{"node_id": row[0], "new_path": paths[row[0]]} for row in rows if row[2] != paths[row[0]]]
+    if changed:
+        table = model.__table__
+        connection.execute(
+            table.update().where(table.c.id == bindparam("node_id")).values(path=bindparam("new_path")),
+            changed,
+        )
+    return len(changed)
+
+
+def _move(connection, model, node_id, parent_id, known):
+    """Point `node_id` (and its subtree) below `parent_id`; returns the new path or None."""
+    table = model.__table__
+    parent_path = "/"
+    if parent_id is not None:
+        parent_path = known.get((model, parent_id)) or connection.execute(
+            select(table.c.path).where(table.c.id == parent_id)
+        ).scalar()
+        if parent_path is None:
+            return None
+        if f"/{node_id}/" in parent_path:
+            raise ValueError(f"{model.__name__} {node_id} cannot be moved below its own descendant {parent_id}")
+    new_path = f"{parent_path}{node_id}/"
+
+    old_path = connection.execute(select(table.c.path).where(table.c.id == node_id)).scalar()
+    if old_path == new_path:
+        return new_path
+    if old_path:
+        connection.execute(
+            table.update()
+            .where(table.c.path.like(f"{old_path}%"))
+            .values(path=literal(new_path, String) + func.substr(table.c.path, len(old_path) + 1))
+        )
+    else:
+        connection.execute(table.update().where(table.c.id == node_id).values(path=new_path))
+    return new_path
+
+
+def _tree_model(obj):
+    model = type(obj)
+    return model if model in PARENT_ATTRS else None
+
+
+def _collect_tree_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty):
+        model = _tree_model(obj)
+        if model is None:
+            continue
+        if obj in session.new or inspect(obj).attrs[PARENT_ATTRS[model]].history.has_changes():
+            session.info.setdefault(_PENDING, ([], []))[0].append((model, obj))
+    for obj in session.deleted:
+        model = _tree_model(obj)
+        if model is None:
+            continue
+        path = obj.__dict__.get("path")
+        if path:
+            session.info.setdefault(_PENDING, ([], []))[1].append((model, path))
+        else:
+            session.info.setdefault(_REBUILD, set()).add(model)
+
+
+def _apply_tree_changes(session, flush_context):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    moved, deleted = pending
+    connection = session.connection()
+    known = {}
+
+    # Parents before children when both changed in this flush.
+    waiting = {(model, obj.id) for model, obj in moved}
+    while moved:
+        ready = [
+            (model, obj) for model, obj in moved
+            if (model, getattr(obj, PARENT_ATTRS[model])) not in waiting
+        ] or moved[:1]
+        for model, obj in ready:
+            moved.remove((model, obj))
+            waiting.discard((model, obj.id))
+            new_path = _move(connection, model, obj.id, getattr(obj, PARENT_ATTRS[model]), known)
+            if new_path is None:
+                session.info.setdefault(_REBUILD, set()).add(model)
+                continue
+            known[(model, obj.id)] = new_path
+            set_committed_value(obj, "path", new_path)
+
+    # Rows left below a deleted node had their parent set to NULL: they become roots.
+    for model, path in deleted:
+        table = model.__table__
+        connection.execute(
+            table.update()
+            .where(table.c.path.like(f"{path}%"))
+            .values(path=literal("/", String) + func.substr(table.c.path, len(path) + 1))
+        )
+
+
+def _track_bulk_tree_writes(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in PARENT_ATTRS:
+            orm_execute_state.session.info.setdefault(_REBUILD, set()).add(mapper.class_)
+
+
+def _rebuild_after_bulk_writes(session):
+    session.flush()
+    for model in session.info.pop(_REBUILD, ()):
+        rebuild_paths(session.connection(), model)
+
+
+def _reset_on_rollback(session, previous_transaction):
+    session.info.pop(_PENDING, None)
+    session.info.pop(_REBUILD, None)
+
+
+def register():
+    """Wire session events that keep the paths in step with ORM writes."""
+    event.listen(Session, "after_flush", _collect_tree_changes)
+    event.listen(Session, "after_flush_postexec", _apply_tree_changes)
+    event.listen(Session, "do_orm_execute", _track_bulk_tree_writes)
+    event.listen(Session, "before_commit", _rebuild_after_bulk_writes)
+    event.listen(Session, "after_soft_rollback", _reset_on_rollback)
@@ -0,0 +1,124 @@
+"""
+Content-addressed storage for admin image uploads.
+
+An upload is copied in chunks to a temporary file next to its destination
+in a worker thread, hashing (SHA-256) as it goes, and then renamed to
+`<UPLOAD_DIR>/<kind>/<digest><ext>`. Identical images therefore share one
+file and one URL, names never collide, and the event loop never blocks on
+disk I/O. Uploads larger than UPLOAD_MAX_BYTES are rejected without being
+copied further; `check_upload_size` rejects oversized requests from their
+Content-Length before the multipart body is parsed at all, and requests
+without one (chunked bodies would otherwise be spooled whole). Stored images
+are queued for responsive derivatives (app.services.image_derivatives).
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.image_derivatives import derivative_pool
+
+CHUNK_SIZE = 1024 * 1024
+
+# Allowance for the non-file form fields sent along with an upload
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+IMAGE_EXTENSIONS = {".avif", ".gif", ".jpeg", ".jpg", ".png", ".svg", ".webp"}
+
+
+class UploadError(ValueError):
+    """Rejected upload; `status_code` is the HTTP status to answer with."""
+    status_code = 400
+
+
+class UploadTooLarge(UploadError):
+    status_code = 413
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit")
+        self.max_bytes = max_bytes
+
+
+class UploadLengthRequired(UploadError):
+    status_code = 411
+
+    def __init__(self):
+        super().__init__("Uploads must declare their size (Content-Length)")
+
+
+def has_upload(value):
+    """True for a form value that is a file actually chosen by the user."""
+    return bool(getattr(value, "filename", None))
+
+
+def check_upload_size(request, max_bytes: int = None):
+    """
+    Raise UploadTooLarge when the declared request body cannot fit the
+    limit, and UploadLengthRequired when the body size is not declared.
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    length = request.headers.get("content-length", "")
+    if not length.isdigit():
+        raise UploadLengthRequired()
+    if int(length) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise UploadTooLarge(max_bytes)
+
+
+def _extension(filename: str):
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext not in IMAGE_EXTENSIONS:
+        raise UploadError(f"Unsupported image type {ext or '(none)'}; use one of {', '.join(sorted(IMAGE_EXTENSIONS))}")
+    return ".jpg" if ext == ".jpeg" else ext
+
+
+def store_file(source, filename: str, kind: str, max_bytes: int = None, root=None):
+    """
+    Copy the binary file object `source` into the content-addressed store
+    and return its path relative to `root` (e.g. "hero/3f2a...9c.png").
+    Blocking; call through `save_upload` from async code.
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    ext = _extension(filename)
+    directory = Path(root or settings.UPLOAD_DIR) / kind
+    directory.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                tmp.write(chunk)
+        if not size:
+            raise UploadError("The uploaded file is empty")
+
+        name = f"{digest.hexdigest()[:32]}{ext}"
+        target = directory / name
+        if target.exists():
+            os.unlink(tmp_name)  # same content already stored
+        else:
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, target)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return f"{kind}/{name}"
+
+
+async def save_upload(upload, kind: str, max_bytes: int = None):
+    """Store an UploadFile off the event loop and return its public URL."""
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    await upload.seek(0)
+    relative = await run_in_threadpool(store_file, upload.file, upload.filename, kind, max_bytes)
+    derivative_pool.submit(relative)
+    return f"{settings.UPLOAD_URL_PREFIX.rstrip('/')}/{relative}"
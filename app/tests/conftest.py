@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+
+# Ensure the project root is on sys.path when running via pytest
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.college import College
+from app.schemas.schema import Page, PageSection, SectionItem, SEOMeta
+from app.services import derived_tables
+
+# The application installs these when app.main is imported.
+derived_tables.register()
+
+
+@pytest.fixture
+def make_session():
+    """Factory for `(engine, session)` pairs on fresh in-memory SQLite databases, closed after the test."""
+    created = []
+
+    def _make_session():
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine, autoflush=False)()
+        created.append((engine, db))
+        return engine, db
+
+    yield _make_session
+    for engine, db in created:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def seed_page():
+    """`seed_page(db, section_count)` adds a college with a home page of STATS/CARDS sections; returns the page id."""
+
+    def _seed_page(db, section_count):
+        college = College(name=f"College {section_count}", slug=f"college-{section_count}")
+        db.add(college)
+        db.flush()
+        page = Page(title="Home", slug="home", college_id=college.id)
+        db.add(page)
+        db.flush()
+        db.add(SEOMeta(page_id=page.id, meta_title="Home", meta_description="Welcome"))
+        for n in range(section_count):
+            section = PageSection(
+                page_id=page.id,
+                section_type="CARDS" if n % 2 else "STATS",
+                section_title=f"Section {n}",
+                sort_order=n,
+            )
+            db.add(section)
+            db.flush()
+            for m in range(3):
+                db.add(SectionItem(section_id=section.id, title=f"Item {n}.{m}", sort_order=m))
+        db.commit()
+        return page.id
+
+    return _seed_page
+
+
+@pytest.fixture
+def count_queries():
+    """`count_queries(engine, fn)` returns `(fn(), number of SQL statements it executed)`."""
+
+    def _count_queries(engine, fn):
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            result = fn()
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        return result, len(statements)
+
+    return _count_queries
@@ -0,0 +1,42 @@
+from sqlalchemy import event
+
+from app.models.college import College
+from app.services.college_cache import CollegeDirectory
+
+
+def test_expired_snapshot_answers_while_one_reload_runs(monkeypatch):
+    directory = CollegeDirectory(ttl=60)
+    loads, reloads = [], []
+
+    def _load(db=None):
+        loads.append(1)
+        directory._loaded = True
+        directory._expires_at = float("inf")
+
+    monkeypatch.setattr(directory, "_load", _load)
+    monkeypatch.setattr(directory, "_refresh_in_background", lambda: reloads.append(1))
+
+    # The first lookup has nothing to serve and loads inline.
+    assert directory.by_subdomain("engg") is None
+    assert len(loads) == 1
+
+    directory.invalidate()
+    for _ in range(3):
+        assert directory.roots() == []
+    assert len(loads) == 1
+    assert len(reloads) == 1
+
+
+def test_reload_racing_an_invalidation_stays_stale(make_session):
+    engine, db = make_session()
+    db.add(College(name="Engineering", slug="engg", subdomain="engg"))
+    db.commit()
+    directory = CollegeDirectory(ttl=60)
+
+    # A college commit lands while the snapshot is being read.
+    event.listen(db, "do_orm_execute", lambda orm_execute_state: directory.invalidate(), once=True)
+    directory.get(db, 1)
+    assert directory.is_stale
+
+    assert directory.get(db, 1).slug == "engg"
+    assert not directory.is_stale
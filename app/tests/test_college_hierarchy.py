@@ -0,0 +1,66 @@
+from app.core.college_middleware import get_all_colleges_for_dropdown
+from app.models.college import College
+from app.services.college_cache import college_directory
+from app.utils.college_context import get_all_colleges_in_hierarchy, get_root_college
+
+
+def _seed_tree(db):
+    """university -> (engineering -> civil, management), plus a second root."""
+    university = College(name="University", slug="university")
+    other = College(name="Other", slug="other")
+    db.add_all([university, other])
+    db.flush()
+    engineering = College(name="Engineering", slug="engineering", parent_id=university.id)
+    management = College(name="Management", slug="management", parent_id=university.id)
+    db.add_all([engineering, management])
+    db.flush()
+    civil = College(name="Civil", slug="civil", parent_id=engineering.id)
+    db.add(civil)
+    db.commit()
+    return university, engineering, management, civil, other
+
+
+def test_hierarchy_lookups_load_the_tree_once(make_session, count_queries):
+    engine, db = make_session()
+    try:
+        university, engineering, management, civil, other = (c.id for c in _seed_tree(db))
+        db.expunge_all()
+
+        root, queries = count_queries(engine, lambda: get_root_college(db, civil))
+        assert root.id == university
+        assert queries <= 2
+
+        colleges, queries = count_queries(engine, lambda: get_all_colleges_in_hierarchy(db, university))
+        assert [c.name for c in colleges] == ["University", "Engineering", "Civil", "Management"]
+        assert queries == 1
+
+        dropdown, queries = count_queries(engine, lambda: get_all_colleges_for_dropdown(db, civil))
+        assert queries == 0
+        assert [d["id"] for d in dropdown] == [university, engineering, civil, management, other]
+        assert dropdown[2]["name"] == "&nbsp;&nbsp;&nbsp;&nbsp;└─ Civil"
+        assert [d["id"] for d in dropdown if d["selected"]] == [civil]
+
+        assert db.get(College, civil).get_root_college().id == university
+        assert get_root_college(db, 9999) is None
+    finally:
+        college_directory.invalidate()
+
+
+def test_hierarchy_is_dropped_after_college_commits(make_session):
+    engine, db = make_session()
+    try:
+        university, engineering, _, civil, other = _seed_tree(db)
+        assert college_directory.root_id(db, civil.id) == university.id
+
+        engineering.parent_id = other.id
+        db.flush()
+        db.rollback()
+        assert college_directory.root_id(db, civil.id) == university.id
+
+        engineering = db.get(College, engineering.id)
+        engineering.parent_id = other.id
+        db.commit()
+        assert college_directory.root_id(db, civil.id) == other.id
+        assert college_directory.descendant_ids(db, other.id) == [other.id, engineering.id, civil.id]
+    finally:
+        college_directory.invalidate()
@@ -0,0 +1,130 @@
+from sqlalchemy import delete, update
+
+from app.models.college import College
+from app.schemas.schema import CollegeStats, Course, Faculty, Page, Placement
+from app.services.college_stats import get_college_stats, rebuild_college_stats
+
+
+def _snapshot(db, college_id):
+    db.expire_all()
+    stats = get_college_stats(db, college_id)
+    return None if stats is None else (
+        stats.pages_count,
+        stats.courses_count,
+        stats.active_courses_count,
+        stats.faculty_count,
+        stats.latest_placement_year,
+    )
+
+
+def test_stats_follow_writes_in_the_same_transaction(make_session):
+    engine, db = make_session()
+    a, b = College(name="A", slug="a"), College(name="B", slug="b")
+    db.add_all([a, b])
+    db.commit()
+    assert _snapshot(db, a.id) == (0, 0, 0, 0, None)
+
+    course = Course(name="Civil", slug="civil", college_id=a.id)
+    db.add_all([
+        course,
+        Page(title="Home", slug="home", college_id=a.id),
+        Faculty(name="Dr. Rao", college_id=a.id),
+        Placement(college_id=a.id, year=2024),
+        Placement(college_id=a.id, year=2025),
+    ])
+    db.commit()
+    assert _snapshot(db, a.id) == (1, 1, 1, 1, 2025)
+
+    course.is_active = False
+    db.commit()
+    assert _snapshot(db, a.id) == (1, 1, 0, 1, 2025)
+
+    course.college_id = b.id
+    db.commit()
+    assert _snapshot(db, a.id) == (1, 0, 0, 1, 2025)
+    assert _snapshot(db, b.id) == (0, 1, 0, 0, None)
+
+    db.add(Page(title="Draft", slug="draft", college_id=a.id))
+    db.flush()
+    db.rollback()
+    assert _snapshot(db, a.id) == (1, 0, 0, 1, 2025)
+
+    db.delete(course)
+    db.commit()
+    assert _snapshot(db, b.id) == (0, 0, 0, 0, None)
+
+    db.delete(b)
+    db.commit()
+    assert _snapshot(db, b.id) is None
+
+
+def test_bulk_writes_and_rebuild(make_session):
+    engine, db = make_session()
+    college = College(name="A", slug="a")
+    db.add(college)
+    db.flush()
+    db.add_all([Course(name=f"C{n}", slug=f"c{n}", college_id=college.id) for n in range(3)])
+    db.commit()
+
+    db.execute(update(Course).where(Course.slug == "c0").values(is_active=False))
+    db.commit()
+    assert _snapshot(db, college.id) == (0, 3, 2, 0, None)
+
+    before = _snapshot(db, college.id)
+    assert rebuild_college_stats(db) == 1
+    assert _snapshot(db, college.id) == before
+
+
+def test_writes_apply_deltas_to_the_stored_counts(make_session):
+    engine, db = make_session()
+    college = College(name="A", slug="a")
+    db.add(college)
+    db.commit()
+    # Stands in for a concurrent transaction's committed course: a flush
+    # adds to the stored count rather than recounting from its snapshot.
+    db.execute(update(CollegeStats).where(CollegeStats.college_id == college.id).values(courses_count=10))
+    db.commit()
+
+    db.add(Course(name="Civil", slug="civil", college_id=college.id))
+    db.commit()
+    assert _snapshot(db, college.id) == (0, 11, 1, 0, None)
+
+    db.add(Placement(college_id=college.id, year=2025))
+    db.commit()
+    assert _snapshot(db, college.id) == (0, 11, 1, 0, 2025)
+
+
+def test_bulk_writes_recount_only_the_colleges_they_touch(make_session, count_queries):
+    engine, db = make_session()
+    a, b = College(name="A", slug="a"), College(name="B", slug="b")
+    db.add_all([a, b])
+    db.flush()
+    db.add_all([Course(name=f"C{n}", slug=f"c{n}", college_id=a.id) for n in range(2)])
+    db.add(Course(name="Other", slug="other", college_id=b.id))
+    db.commit()
+
+    # Stands in for a concurrent transaction's committed course at B.
+    db.execute(update(CollegeStats).where(CollegeStats.college_id == b.id).values(courses_count=10))
+    db.commit()
+
+    db.execute(update(Course).where(Course.college_id == a.id).values(name="Renamed"))
+    _, statements = count_queries(engine, db.commit)
+    assert statements == 0
+
+    db.execute(update(Course).where(Course.slug == "c0").values(is_active=False))
+    db.commit()
+    assert _snapshot(db, a.id) == (0, 2, 1, 0, None)
+    assert _snapshot(db, b.id) == (0, 10, 1, 0, None)
+
+    db.execute(update(Course), [{"id": db.query(Course.id).filter_by(slug="c1").scalar(), "college_id": b.id}])
+    db.commit()
+    assert _snapshot(db, a.id) == (0, 1, 0, 0, None)
+    assert _snapshot(db, b.id) == (0, 2, 2, 0, None)
+
+    empty = College(name="C", slug="c")
+    db.add(empty)
+    db.commit()
+    empty_id = empty.id
+    db.execute(delete(College).where(College.id == empty_id))
+    db.commit()
+    assert _snapshot(db, empty_id) is None
@@ -0,0 +1,47 @@
+from app.models.college import College
+from app.schemas.schema import Activity, Admission, Course, Facility, Faculty, Placement
+from app.services.college_summary import get_college_summary
+
+
+def _seed_college(db, size):
+    college = College(name="IPS", slug=f"ips-{size}")
+    db.add(college)
+    db.flush()
+    for n in range(size):
+        db.add(Course(name=f"Course {n}", slug=f"course-{n}", college_id=college.id, is_active=n % 4 != 0))
+        db.add(Faculty(name=f"Faculty {n}", college_id=college.id))
+        db.add(Facility(name=f"Facility {n}", college_id=college.id))
+        db.add(Activity(title=f"Event {n}", college_id=college.id))
+    for year in (2023, 2025, 2024):
+        db.add(Placement(college_id=college.id, year=year, highest_package=float(year - 2000)))
+    db.add(Admission(college_id=college.id, procedure_text="Apply online"))
+    db.commit()
+    return college.id
+
+
+def test_college_summary_query_count_is_constant(make_session, count_queries):
+    counts = {}
+    for size in (3, 40):
+        engine, db = make_session()
+        college_id = _seed_college(db, size)
+        summary, counts[size] = count_queries(engine, lambda: get_college_summary(db, college_id))
+        assert summary["stats"]["events"] == size
+
+    assert counts[3] == counts[40] <= 7
+
+
+def test_college_summary_contents(make_session):
+    engine, db = make_session()
+    college_id = _seed_college(db, 12)
+    summary = get_college_summary(db, college_id)
+
+    assert summary["stats"] == {"courses": 9, "faculty": 12, "facilities": 12, "events": 12}
+    assert len(summary["courses"]) == 9
+    assert "Course 0" not in [c["name"] for c in summary["courses"]]
+    assert len(summary["faculty"]) == 8
+    assert len(summary["facilities"]) == 6
+    assert summary["placements"]["latest_year"] == 2025
+    assert summary["placements"]["highest_package"] == 25.0
+    assert summary["admission"]["procedure"] == "Apply online"
+
+    assert get_college_summary(db, college_id + 100) is None
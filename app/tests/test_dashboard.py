@@ -0,0 +1,56 @@
+from app.models.college import College
+from app.schemas.schema import Application, Course, Enquiry, Faculty, Page
+from app.services.dashboard import compute_dashboard_stats
+
+
+def _seed(db, college_count):
+    for n in range(college_count):
+        college = College(name=f"College {n}", slug=f"college-{n}")
+        db.add(college)
+        db.flush()
+        for m in range(n % 3 + 1):
+            db.add(Page(title=f"Page {n}.{m}", slug=f"page-{m}", college_id=college.id))
+        course = Course(name=f"Course {n}", slug=f"course-{n}", college_id=college.id)
+        db.add(course)
+        db.add(Faculty(name=f"Faculty {n}", college_id=college.id))
+        db.flush()
+        db.add(Application(name=f"Applicant {n}", email="a@example.com", college_id=college.id, course_id=course.id))
+    db.add(Page(title="General", slug="general"))
+    db.add(Enquiry(name="Visitor", email="v@example.com"))
+    db.commit()
+
+
+def test_dashboard_query_count_does_not_grow_with_colleges(make_session, count_queries):
+    counts = {}
+    for college_count in (2, 12):
+        engine, db = make_session()
+        _seed(db, college_count)
+        dashboard, counts[college_count] = count_queries(engine, lambda: compute_dashboard_stats(db))
+        assert dashboard["stats"]["total_colleges"] == college_count
+
+    assert counts[2] == counts[12]
+    assert counts[12] <= 8
+
+
+def test_dashboard_counts_and_names(make_session):
+    engine, db = make_session()
+    _seed(db, 4)
+    dashboard = compute_dashboard_stats(db)
+
+    by_name = {c["name"]: c for c in dashboard["colleges"]}
+    assert by_name["College 2"]["pages_count"] == 3
+    assert by_name["College 2"]["courses_count"] == 1
+    assert by_name["College 0"]["faculty_count"] == 1
+
+    stats = dashboard["stats"]
+    assert stats["total_pages"] == 1 + 2 + 3 + 1 + 1
+    assert stats["total_courses"] == stats["total_faculty"] == 4
+    assert stats["total_applications"] == 4
+    assert stats["total_enquiries"] == 1
+
+    assert dashboard["pages"][0]["title"] == "General"
+    assert dashboard["pages"][0]["college_name"] is None
+    assert dashboard["pages"][1]["college_name"] == "College 3"
+    assert {a["course_name"] for a in dashboard["recent_applications"]} == {
+        "Course 0", "Course 1", "Course 2", "Course 3"
+    }
@@ -0,0 +1,65 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.db_metrics import InstrumentedQueuePool, instrument_engine, pool_metrics
+
+
+def test_pool_metrics_track_checkouts_waits_and_lifetime():
+    with tempfile.TemporaryDirectory() as tmp:
+        bind = create_engine(
+            f"sqlite:///{Path(tmp) / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.1,
+        )
+        metrics = instrument_engine(bind, "test-pool")
+        try:
+            assert pool_metrics["test-pool"] is metrics
+
+            first = bind.connect()
+            second = bind.connect()
+            first.execute(text("SELECT 1"))
+            stats = metrics.stats()
+            assert stats["checked_out"] == 2
+            assert stats["overflow_in_use"] == 1
+
+            with pytest.raises(PoolTimeoutError):
+                bind.connect()
+
+            second.invalidate()
+            second.close()
+
+            stats = metrics.stats()
+            assert stats["checkouts"] == 2
+            assert stats["checkins"] == 1
+            assert stats["connects"] == 2
+            assert stats["checkout_timeouts"] == 1
+            assert stats["invalidations"] == 1
+            assert stats["peak_overflow"] == 1
+            assert stats["checkout_wait_ms"]["max"] >= 100
+            # Only the invalidated connection has been closed so far.
+            assert stats["connection_lifetime_s"]["closed"] == 1
+
+            first.close()
+
+            # dispose() recreates the pool; metrics keep following the engine.
+            bind.dispose()
+            with bind.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            assert metrics.stats()["checkouts"] == 3
+        finally:
+            pool_metrics.pop("test-pool", None)
+            bind.dispose()
+
+
+@pytest.mark.parametrize("path", ["/api/v1/metrics/cache", "/api/v1/metrics/pool"])
+def test_metrics_require_an_admin_session(path):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    assert TestClient(app).get(path).status_code == 401
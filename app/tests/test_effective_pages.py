@@ -0,0 +1,126 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, update
+
+from app.api.v1.public import get_page_by_college_and_slug
+from app.models.college import College
+from app.schemas.schema import EffectivePage, Page, PageSection
+from app.services.effective_pages import rebuild_effective_pages, resolve_page
+from app.services.page_assembly import invalidate_all_pages
+from app.utils.college_context import get_college_pages, inherit_page
+
+@pytest.fixture
+def tree(make_session):
+    engine, db = make_session()
+    university = College(name="University", slug="university")
+    db.add(university)
+    db.flush()
+    engineering = College(name="Engineering", slug="engineering", parent_id=university.id)
+    db.add(engineering)
+    db.flush()
+    civil = College(name="Civil", slug="civil", parent_id=engineering.id)
+    db.add(civil)
+    db.flush()
+    admissions = Page(title="Admissions", slug="admissions", college_id=university.id, is_inheritable=True)
+    db.add_all([admissions, Page(title="Home", slug="home", college_id=engineering.id)])
+    db.flush()
+    db.add(PageSection(page_id=admissions.id, section_type="TEXT", section_title="How to apply"))
+    db.commit()
+    invalidate_all_pages()
+    try:
+        yield db, engine, university, engineering, civil, admissions
+    finally:
+        invalidate_all_pages()
+
+
+def _snapshot(db):
+    db.expire_all()
+    return {
+        (row.college_id, row.slug): (row.page_id, row.content_page_id, row.depth)
+        for row in db.query(EffectivePage)
+    }
+
+
+def test_snapshot_resolves_inheritance_and_copies(tree, count_queries):
+    db, engine, university, engineering, civil, admissions = tree
+    assert _snapshot(db)[(civil.id, "admissions")] == (admissions.id, admissions.id, 2)
+    assert (civil.id, "home") not in _snapshot(db)
+
+    copy = inherit_page(db, admissions.id, engineering.id)
+    snapshot = _snapshot(db)
+    assert snapshot[(engineering.id, "admissions")] == (copy.id, admissions.id, 0)
+    # The copy is not inheritable, so civil still gets the university page.
+    assert snapshot[(civil.id, "admissions")] == (admissions.id, admissions.id, 2)
+
+    payload = get_page_by_college_and_slug("engineering", "admissions", db=db)
+    assert payload["data"]["page"]["id"] == copy.id
+    assert [s["title"] for s in payload["data"]["sections"]] == ["How to apply"]
+
+    (_, effective), queries = count_queries(engine, lambda: resolve_page(db, "civil", "admissions"))
+    assert effective.page_id == admissions.id and queries == 1
+
+    assert [p.slug for p in get_college_pages(db, engineering.id, include_inherited=True)] == ["home", "admissions"]
+
+
+def test_snapshot_follows_writes(tree):
+    db, _, university, engineering, civil, admissions = tree
+
+    db.get(Page, admissions.id).is_active = False
+    db.flush()
+    db.rollback()
+    assert (civil.id, "admissions") in _snapshot(db)
+
+    db.get(Page, admissions.id).is_active = False
+    db.commit()
+    assert not any(slug == "admissions" for _, slug in _snapshot(db))
+    with pytest.raises(HTTPException) as exc:
+        get_page_by_college_and_slug("civil", "admissions", db=db)
+    assert exc.value.detail == "Page not found for this college"
+
+    db.get(Page, admissions.id).is_active = True
+    db.get(College, civil.id).parent_id = None
+    db.commit()
+    snapshot = _snapshot(db)
+    assert (engineering.id, "admissions") in snapshot and (civil.id, "admissions") not in snapshot
+
+    before = _snapshot(db)
+    rebuild_effective_pages(db)
+    assert _snapshot(db) == before
+
+    with pytest.raises(HTTPException) as exc:
+        get_page_by_college_and_slug("nowhere", "admissions", db=db)
+    assert exc.value.detail == "College not found"
+
+
+def test_bulk_writes_refresh_only_the_colleges_they_touch(tree):
+    db, _, university, engineering, civil, admissions = tree
+    other = College(name="Other", slug="other")
+    db.add(other)
+    db.flush()
+    db.add(Page(title="Home", slug="home", college_id=other.id))
+    db.commit()
+    # Marks the unrelated college's row; a full rebuild would reset it.
+    db.execute(update(EffectivePage).where(EffectivePage.college_id == other.id).values(depth=9))
+    db.commit()
+
+    db.execute(update(Page).where(Page.id == admissions.id).values(title="Apply"))
+    db.commit()
+    assert _snapshot(db)[(civil.id, "admissions")] == (admissions.id, admissions.id, 2)
+
+    db.execute(update(Page).where(Page.id == admissions.id).values(is_active=False))
+    db.commit()
+    snapshot = _snapshot(db)
+    assert not any(slug == "admissions" for _, slug in snapshot)
+    assert snapshot[(other.id, "home")][2] == 9
+
+    db.execute(update(Page).where(Page.id == admissions.id).values(is_active=True))
+    db.execute(delete(PageSection).where(PageSection.page_id == admissions.id))
+    db.commit()
+    assert _snapshot(db)[(civil.id, "admissions")] == (admissions.id, admissions.id, 2)
+
+    civil_id = civil.id
+    db.execute(delete(College).where(College.id == civil_id))
+    db.commit()
+    snapshot = _snapshot(db)
+    assert not any(college_id == civil_id for college_id, _ in snapshot)
+    assert snapshot[(other.id, "home")][2] == 9
@@ -0,0 +1,42 @@
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from app.core.templates import TEMPLATES_DIR
+from app.schemas.schema import PageSection
+from app.services.fragment_cache import fragment_cache, fragment_stats, render_fragments
+from app.services.page_assembly import load_page
+
+env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), autoescape=select_autoescape())
+
+
+def test_fragments_cached_until_section_changes(make_session, seed_page):
+    engine, db = make_session()
+    try:
+        page_id = seed_page(db, 2)
+        fragment_cache.clear()
+        fragment_stats.clear()
+
+        page = load_page(db, page_id)
+        first = render_fragments(env, page, page.sections)
+        second = render_fragments(env, page, page.sections)
+        assert second == first
+        assert "Section 0" in first[0] and "Item 0.1" in first[0]
+        assert fragment_stats.stats()["STATS"]["hits"] == 1
+        assert fragment_stats.stats()["CARDS"]["misses"] == 1
+
+        db.query(PageSection).filter(PageSection.sort_order == 0).update({"section_title": "Edited"})
+        db.commit()
+        db.expunge_all()
+
+        page = load_page(db, page_id)
+        edited = render_fragments(env, page, page.sections)
+        assert "Edited" in edited[0]
+        assert edited[1] == first[1]
+        stats = fragment_stats.stats()["STATS"]
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 2, 0.3333)
+        assert stats["render_ms_avg"] > 0
+
+        html = env.get_template("index.html").render(page=page, fragments=edited)
+        assert html.index("Edited") < html.index("Section 1")
+    finally:
+        fragment_cache.clear()
+        fragment_stats.clear()
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.http_cache import CachedRoute, etag_index
+
+
+def _client():
+    router = APIRouter(route_class=CachedRoute)
+
+    @router.get("/pages/{page_id}")
+    def get_page_details(page_id: int, request: Request):
+        return {"page": page_id, "college": request.headers["host"].split(".")[0]}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_etags_are_remembered_per_host():
+    etag_index.clear()
+    client = _client()
+
+    first = client.get("/pages/1", headers={"host": "engineering.example.com"})
+    assert first.headers["Vary"] == "Host"
+    etag = first.headers["ETag"]
+    assert client.get("/pages/1", headers={"host": "engineering.example.com", "if-none-match": etag}).status_code == 304
+
+    # Another college's subdomain must not be answered with the first one's ETag.
+    other = client.get("/pages/1", headers={"host": "pharmacy.example.com", "if-none-match": etag})
+    assert other.status_code == 200
+    assert other.json()["college"] == "pharmacy"
+    etag_index.clear()
@@ -0,0 +1,110 @@
+import json
+from concurrent.futures import Future
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.schema import PageSection, SectionItem
+from app.services.content_version import content_version
+from app.services import image_derivatives
+from app.services.image_derivatives import derivative_pool, generate_derivatives, image_srcset, manifest_cache
+from app.services.page_assembly import get_page_payload, invalidate_all_pages, page_cache, serialize_section
+
+
+def _write_manifest(root, relative):
+    kind, name = relative.split("/")
+    directory = Path(root) / "derived" / kind / name.rsplit(".", 1)[0]
+    directory.mkdir(parents=True)
+    base = f"/static/uploads/derived/{kind}/{name.rsplit('.', 1)[0]}"
+    (directory / "manifest.json").write_text(json.dumps({
+        "width": 1600,
+        "height": 900,
+        "placeholder": "data:image/webp;base64,AAAA",
+        "variants": [
+            {"format": fmt, "width": width, "url": f"{base}/{width}.{fmt}"}
+            for fmt in ("webp", "avif")
+            for width in (320, 640)
+        ],
+    }))
+
+
+def test_srcset_exposed_for_images_with_derivatives(monkeypatch):
+    with tempfile.TemporaryDirectory() as root:
+        monkeypatch.setattr(settings, "UPLOAD_DIR", root)
+        manifest_cache.clear()
+        _write_manifest(root, "hero/abc.png")
+
+        srcset = image_srcset("/static/uploads/hero/abc.png")
+        assert (srcset["width"], srcset["height"]) == (1600, 900)
+        assert [s["type"] for s in srcset["sources"]] == ["image/avif", "image/webp"]
+        assert srcset["sources"][1]["srcset"] == (
+            "/static/uploads/derived/hero/abc/320.webp 320w, /static/uploads/derived/hero/abc/640.webp 640w"
+        )
+        assert image_srcset("/static/uploads/hero/missing.png") is None
+        assert image_srcset("https://cdn.example.com/hero.png") is None
+
+        hero = PageSection(id=1, section_type="HERO", extra_data={"images": [
+            "/static/uploads/hero/abc.png", "https://cdn.example.com/hero.png",
+        ]})
+        hero.items = []
+        payload = serialize_section(hero)
+        assert payload["srcsets"] == [srcset, None]
+
+        cards = PageSection(id=2, section_type="CARDS")
+        cards.items = [SectionItem(id=3, image_url="/static/uploads/hero/abc.png")]
+        assert serialize_section(cards)["items"][0]["image_srcset"] == srcset
+    manifest_cache.clear()
+
+
+def test_generate_derivatives_writes_variants_and_manifest():
+    Image = pytest.importorskip("PIL.Image")
+    with tempfile.TemporaryDirectory() as root:
+        (Path(root) / "hero").mkdir()
+        Image.new("RGB", (1000, 500), "red").save(Path(root) / "hero/abc.png")
+
+        manifest = generate_derivatives("hero/abc.png", root, "/static/uploads", [320, 640, 1920], ["webp"])
+
+        assert (manifest["width"], manifest["height"]) == (1000, 500)
+        assert [v["width"] for v in manifest["variants"]] == [320, 640]
+        assert manifest["placeholder"].startswith("data:image/webp;base64,")
+        with Image.open(Path(root) / "derived/hero/abc/320.webp") as variant:
+            assert variant.size == (320, 160)
+
+
+def test_placeholder_falls_back_to_png_without_webp(monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(image_derivatives, "_supported_formats", lambda formats: [])
+    with tempfile.TemporaryDirectory() as root:
+        (Path(root) / "hero").mkdir()
+        Image.new("RGB", (100, 50), "red").save(Path(root) / "hero/abc.png")
+
+        manifest = generate_derivatives("hero/abc.png", root, "/static/uploads", [320], ["webp"])
+
+        assert manifest["variants"] == []
+        assert manifest["placeholder"].startswith("data:image/png;base64,")
+
+
+def test_finished_derivatives_evict_only_payloads_showing_the_image(make_session, seed_page):
+    pytest.importorskip("PIL")
+    engine, db = make_session()
+    with_image, without_image = seed_page(db, 2), seed_page(db, 3)
+    item = db.query(SectionItem).join(PageSection).filter(
+        PageSection.page_id == with_image, PageSection.section_type == "CARDS"
+    ).first()
+    item.image_url = "/static/uploads/hero/abc.png"
+    db.commit()
+    invalidate_all_pages()
+    get_page_payload(db, with_image)
+    get_page_payload(db, without_image)
+    future = Future()
+    future.set_result({})
+    before = content_version.current
+
+    derivative_pool._done("hero/abc.png", future)
+
+    assert page_cache.get(with_image) is None
+    assert page_cache.get(without_image) is not None
+    assert content_version.current == before
+    invalidate_all_pages()
@@ -0,0 +1,107 @@
+import asyncio
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.schemas.schema import PageSection
+from app.services.page_assembly import (
+    aget_page_payload,
+    load_page,
+    build_page_payload,
+    get_page_payload,
+    invalidate_pages,
+    page_cache,
+)
+
+
+def test_page_assembly_query_count_is_flat(make_session, count_queries, seed_page):
+    """Loading and serializing a page costs the same number of queries for 1 or 15 sections."""
+    counts = {}
+    for section_count in (1, 5, 15):
+        engine, db = make_session()
+        page_id = seed_page(db, section_count)
+        db.expunge_all()
+
+        payload, count = count_queries(engine, lambda: build_page_payload(load_page(db, page_id)))
+        counts[section_count] = count
+
+        assert len(payload["data"]["sections"]) == section_count
+        assert payload["data"]["page"]["college_name"] == f"College {section_count}"
+        assert payload["data"]["seo"]["title"] == "Home"
+
+    assert counts[1] == counts[5] == counts[15]
+    assert counts[15] <= 3
+
+
+def test_page_assembly_skips_inactive_sections_and_orders_items(make_session, seed_page):
+    engine, db = make_session()
+    page_id = seed_page(db, 3)
+    db.query(PageSection).filter(PageSection.sort_order == 1).update({"is_active": False})
+    db.commit()
+    db.expunge_all()
+
+    payload = build_page_payload(load_page(db, page_id))
+    sections = payload["data"]["sections"]
+
+    assert [s["title"] for s in sections] == ["Section 0", "Section 2"]
+    assert [s["value"] for s in sections[0]["stats"]] == ["Item 0.0", "Item 0.1", "Item 0.2"]
+
+
+def test_page_payload_cache_hits_until_invalidated(make_session, count_queries, seed_page):
+    engine, db = make_session()
+    try:
+        page_id = seed_page(db, 2)
+        page_cache.clear()
+
+        first, first_count = count_queries(engine, lambda: get_page_payload(db, page_id))
+        second, second_count = count_queries(engine, lambda: get_page_payload(db, page_id))
+        assert first_count > 0
+        assert second_count == 0
+        assert second is first
+
+        db.query(PageSection).filter(PageSection.sort_order == 0).update({"section_title": "Edited"})
+        db.commit()
+        invalidate_pages(page_id)
+
+        refreshed = get_page_payload(db, page_id)
+        assert refreshed["data"]["sections"][0]["title"] == "Edited"
+    finally:
+        page_cache.clear()
+
+
+def test_async_page_payload_matches_sync(seed_page):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "pages.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            page_id = seed_page(db, 4)
+            page_cache.clear()
+            expected = get_page_payload(db, page_id)
+        finally:
+            db.close()
+            engine.dispose()
+
+        async def load():
+            async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+            try:
+                async with AsyncSession(async_engine) as adb:
+                    page_cache.clear()
+                    payload = await aget_page_payload(adb, page_id)
+                    missing = await aget_page_payload(adb, page_id + 1000)
+                    return payload, missing
+            finally:
+                await async_engine.dispose()
+
+        try:
+            payload, missing = asyncio.run(load())
+        finally:
+            page_cache.clear()
+
+        assert payload == expected
+        assert missing is None
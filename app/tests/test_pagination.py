@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.api.v1.public import ACTIVITY_ORDER, FACULTY_ORDER
+from app.models.college import College
+from app.schemas.schema import Activity, Faculty
+from app.utils.pagination import encode_cursor, paginate, page_results
+
+
+def _walk(fetch, keys, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = page_results(fetch(cursor), keys, limit)
+        seen.extend(rows)
+        pages += 1
+        if cursor is None:
+            return seen, pages
+
+
+def test_keyset_pages_cover_every_row_once_with_ties(make_session):
+    engine, db = make_session()
+    college = College(name="College", slug="college")
+    db.add(college)
+    db.flush()
+    # Duplicate names force the id tie-breaker to keep the order total.
+    for n in range(23):
+        db.add(Faculty(name=f"Name {n % 5}", college_id=college.id))
+    db.commit()
+
+    q = db.query(Faculty).filter(Faculty.college_id == college.id)
+    rows, pages = _walk(lambda cursor: paginate(q, FACULTY_ORDER, cursor, 5).all(), FACULTY_ORDER, 5)
+
+    assert pages == 5
+    assert [f.id for f in rows] == [f.id for f in q.order_by(Faculty.name, Faculty.id)]
+
+
+def test_keyset_descending_with_null_dates_on_select(make_session):
+    engine, db = make_session()
+    college = College(name="College", slug="college")
+    db.add(college)
+    db.flush()
+    dates = [datetime(2024, 1, d) for d in (5, 3, 3, 9)] + [None, None]
+    for n, date in enumerate(dates):
+        db.add(Activity(title=f"Event {n}", event_date=date, college_id=college.id))
+    db.commit()
+
+    expected = ["Event 3", "Event 0", "Event 2", "Event 1", "Event 5", "Event 4"]
+    # A page size of 1 also puts cursors on the undated rows.
+    for limit, page_count in ((4, 2), (1, 6)):
+        def fetch(cursor):
+            return db.execute(paginate(select(Activity), ACTIVITY_ORDER, cursor, limit)).scalars().all()
+
+        rows, pages = _walk(fetch, ACTIVITY_ORDER, limit)
+
+        assert pages == page_count
+        assert [a.title for a in rows] == expected
+
+    # Ordered and compared on the raw column, not an expression over it.
+    sql = str(paginate(select(Activity), ACTIVITY_ORDER, encode_cursor([datetime(2024, 1, 5), 1]), 4))
+    assert "coalesce" not in sql.lower()
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor([1, 2, 3])])
+def test_invalid_cursor_is_rejected(cursor, make_session):
+    engine, db = make_session()
+    with pytest.raises(HTTPException) as exc:
+        paginate(db.query(Faculty), FACULTY_ORDER, cursor, 5)
+    assert exc.value.status_code == 400
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import func
+
+from app.models.college import College
+from app.schemas.schema import CollegeStats, EffectivePage, Page, PageSection, SEOMeta
+from app.services.college_cache import college_directory
+from app.services.provisioning import STANDARD_SLUGS, parse_college_specs, provision_colleges
+from app.utils.college_context import create_standard_pages_for_college
+
+
+def _specs(count, **extra):
+    return [{"name": f"School {n}", "slug": f"school-{n}", **extra} for n in range(count)]
+
+
+def test_provisioning_uses_constant_statements_per_batch(make_session, count_queries):
+    counts = {}
+    for size in (2, 30):
+        engine, db = make_session()
+        report, counts[size] = count_queries(engine, lambda: provision_colleges(db, _specs(size)))
+        assert report["colleges"] == size
+        assert report["pages"] == report["sections"] == report["seo"] == size * len(STANDARD_SLUGS)
+        assert report["rows"] == size * (1 + 3 * len(STANDARD_SLUGS))
+        assert report["rows_per_second"] > 0
+    assert counts[2] == counts[30]
+
+
+def test_provisioning_fills_gaps_and_derived_tables(make_session):
+    engine, db = make_session()
+    db.add(College(name="University", slug="university"))
+    db.commit()
+    university = db.query(College).filter_by(slug="university").one()
+    db.add(Page(title="Custom home", slug="home", college_id=university.id))
+    db.commit()
+    assert college_directory.descendant_ids(db, university.id) == [university.id]
+
+    specs = parse_college_specs([
+        {"name": "Engineering", "slug": "engineering", "parent_slug": "university", "is_active": "yes"},
+        {"name": "Civil", "slug": "civil", "parent_slug": "engineering", "subdomain": " "},
+        {"name": "University", "slug": "university"},
+    ])
+    report = provision_colleges(db, specs, batch_size=2)
+    assert report["colleges"] == 2 and report["colleges_existing"] == 1
+    assert report["pages"] == 3 * len(STANDARD_SLUGS) - 1
+
+    civil = db.query(College).filter_by(slug="civil").one()
+    engineering = db.query(College).filter_by(slug="engineering").one()
+    assert civil.path == f"/{university.id}/{engineering.id}/{civil.id}/"
+    assert college_directory.root_id(db, civil.id) == university.id
+    assert civil.subdomain is None
+    assert db.get(CollegeStats, civil.id).pages_count == len(STANDARD_SLUGS)
+    assert db.query(func.count()).select_from(EffectivePage).filter_by(college_id=civil.id).scalar() == len(STANDARD_SLUGS)
+    home = db.query(Page).filter_by(college_id=university.id, slug="home").one()
+    assert home.title == "Custom home"
+    assert db.query(PageSection).filter_by(page_id=home.id).count() == 0
+    assert db.query(SEOMeta).count() == report["seo"]
+
+    again = provision_colleges(db, specs)
+    assert again["colleges"] == again["pages"] == again["rows"] == 0
+
+    with pytest.raises(ValueError):
+        provision_colleges(db, [{"name": "Orphan", "slug": "orphan", "parent_slug": "missing"}])
+    assert db.query(College).filter_by(slug="orphan").count() == 0
+
+
+def test_create_standard_pages_checks_existing_pages_at_once(make_session):
+    engine, db = make_session()
+    college = College(name="IPS", slug="ips")
+    db.add(college)
+    db.flush()
+    db.add(Page(title="Home", slug="home", college_id=college.id))
+    db.commit()
+
+    pages = create_standard_pages_for_college(db, college.id, "IPS")
+    assert [p.slug for p in pages] == STANDARD_SLUGS
+    assert pages[0].title == "Home"
+    assert db.query(Page).filter_by(college_id=college.id).count() == len(STANDARD_SLUGS)
@@ -0,0 +1,112 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import database
+from app.core.database import (
+    Base,
+    READ_PRIMARY_UNTIL_KEY,
+    REPLICAS_KEY,
+    REQUEST_KEY,
+    ReplicaSet,
+    RoutingSession,
+    process_reads_pinned_to_primary,
+    reads_pinned_to_primary,
+)
+from app.models.college import College
+from app.services.content_version import content_version
+
+@pytest.fixture
+def databases():
+    """Primary plus two replicas, each holding a differently named college."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {}
+        for name in ("primary", "replica1", "replica2"):
+            bind = create_engine(f"sqlite:///{Path(tmp) / name}.db")
+            Base.metadata.create_all(bind)
+            with sessionmaker(bind=bind)() as db:
+                db.add(College(name=name, slug="c"))
+                db.commit()
+            engines[name] = bind
+        yield engines
+        for bind in engines.values():
+            bind.dispose()
+
+
+def _college_name(db):
+    return db.query(College.name).filter(College.slug == "c").scalar()
+
+
+def test_reads_round_robin_and_writes_stay_on_primary(databases):
+    replicas = ReplicaSet([databases["replica1"], databases["replica2"]], eject_seconds=30)
+    Session = sessionmaker(bind=databases["primary"], class_=RoutingSession)
+
+    names = []
+    for _ in range(4):
+        with Session(info={REPLICAS_KEY: replicas}) as db:
+            names.append(_college_name(db))
+            # A session keeps the replica it started on.
+            assert _college_name(db) == names[-1]
+    assert names == ["replica1", "replica2", "replica1", "replica2"]
+
+    with Session(info={REPLICAS_KEY: replicas}) as db:
+        assert _college_name(db) == "replica1"
+        db.add(College(name="new", slug="new"))
+        db.flush()
+        # Once the session has written, it reads its own writes from the primary.
+        assert _college_name(db) == "primary"
+        db.commit()
+
+    with sessionmaker(bind=databases["primary"])() as db:
+        assert db.query(College).filter(College.slug == "new").count() == 1
+
+    with Session() as db:
+        assert _college_name(db) == "primary"
+
+
+def test_failed_replica_is_ejected(databases):
+    with tempfile.TemporaryDirectory() as tmp:
+        broken = create_engine(f"sqlite:///{Path(tmp) / 'missing' / 'replica.db'}")
+        replicas = ReplicaSet([broken, databases["replica2"]], eject_seconds=30)
+        Session = sessionmaker(bind=databases["primary"], class_=RoutingSession)
+
+        with Session(info={REPLICAS_KEY: replicas}) as db:
+            with pytest.raises(Exception):
+                _college_name(db)
+        assert not replicas.healthy(broken)
+
+        for _ in range(3):
+            with Session(info={REPLICAS_KEY: replicas}) as db:
+                assert _college_name(db) == "replica2"
+
+        replicas.eject(databases["replica2"])
+        assert replicas.choose() is None
+        with Session(info={REPLICAS_KEY: replicas}) as db:
+            assert _college_name(db) == "primary"
+
+
+def test_commit_pins_browser_session_to_primary(databases):
+    request = Request({"type": "http", "session": {}})
+    Session = sessionmaker(bind=databases["primary"], class_=RoutingSession)
+
+    with Session(info={REQUEST_KEY: request}) as db:
+        _college_name(db)
+        db.commit()
+    assert not reads_pinned_to_primary(request)
+
+    with Session(info={REQUEST_KEY: request}) as db:
+        db.add(College(name="edited", slug="edited"))
+        db.commit()
+    assert READ_PRIMARY_UNTIL_KEY in request.session
+    assert reads_pinned_to_primary(request)
+
+
+def test_content_change_pins_process_reads_to_primary(monkeypatch):
+    monkeypatch.setattr(database, "_primary_reads_until", 0.0)
+    assert not process_reads_pinned_to_primary()
+    content_version.bump()
+    assert process_reads_pinned_to_primary()
@@ -0,0 +1,219 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from app.models.college import College
+from app.schemas.schema import Course, Faculty, Page
+from app.services.search import ENTITIES_BY_NAME, search_index, suggest_index
+from app.services.search.mysql import boolean_query
+from app.services.search.results import SearchResultCache
+from app.services.search.text import analyze
+
+
+def test_analyze_stems_and_folds_abbreviations():
+    assert analyze("Engineering engineers ENGINEER") == ["engineer"] * 3
+    assert analyze("B.Tech in Computer Sciences") == ["btech", "computer", "science"]
+    assert analyze("M.B.A. Studies") == ["mba", "study"]
+    assert boolean_query("Civil Engineering") == "+civil* +engineer*"
+
+
+@pytest.fixture
+def indexed_db(make_session):
+    engine, db = make_session()
+    college = College(name="IPS Engineering College", slug="ies", short_description="Engineering and science")
+    db.add(college)
+    db.flush()
+    db.add_all([
+        Course(name="B.Tech Civil Engineering", slug="civil", college_id=college.id, overview="Structures"),
+        Course(name="MBA", slug="mba", college_id=college.id, overview="Business management for engineers"),
+        Course(name="Old Course", slug="old", college_id=college.id, is_active=False),
+        Faculty(name="Dr. Mehta", designation="Professor of Civil Engineering", college_id=college.id),
+        Page(title="Engineering Admissions", slug="admissions", college_id=college.id),
+    ])
+    db.commit()
+    search_index.build(db)
+    try:
+        yield db, college
+    finally:
+        search_index.invalidate()
+
+
+def test_ranked_results_across_types(indexed_db):
+    db, _ = indexed_db
+    hits = search_index.search(db, "engineering")
+
+    assert {h["type"] for h in hits} == {"colleges", "courses", "faculty", "pages"}
+    assert hits == sorted(hits, key=lambda h: -h["score"])
+    # A title match outranks a match in body text.
+    names = [h.get("name") for h in hits if h["type"] == "courses"]
+    assert names == ["B.Tech Civil Engineering", "MBA"]
+
+    assert [h["name"] for h in search_index.search(db, "civil engin", types=["courses"])] == [
+        "B.Tech Civil Engineering"
+    ]
+    assert search_index.search(db, "btech") and not search_index.search(db, "old course")
+    assert search_index.search(db, "civil mba") == []
+
+
+def test_index_follows_committed_writes(indexed_db):
+    db, college = indexed_db
+
+    course = Course(name="Hotel Management", slug="hotel", college_id=college.id)
+    db.add(course)
+    db.flush()
+    db.rollback()
+    assert search_index.search(db, "hotel") == []
+
+    course = Course(name="Hotel Management", slug="hotel", college_id=college.id)
+    db.add(course)
+    db.commit()
+    assert [h["id"] for h in search_index.search(db, "hotel")] == [course.id]
+    assert search_index.is_fresh()
+
+    course.is_active = False
+    db.commit()
+    assert search_index.search(db, "hotel") == []
+
+    db.delete(college)
+    db.commit()
+    assert search_index.search(db, "engineering") == []
+
+
+def test_stale_index_answers_while_one_rebuild_runs(indexed_db, monkeypatch):
+    db, _ = indexed_db
+    rebuilds = []
+    monkeypatch.setattr(search_index, "_refresh_in_background", lambda: rebuilds.append(1))
+
+    search_index.invalidate()
+    try:
+        for _ in range(3):
+            assert search_index.search(db, "mba")
+        assert len(rebuilds) == 1
+    finally:
+        search_index._refreshing = False
+
+
+def test_rebuild_keeps_patches_committed_while_it_reads(indexed_db):
+    db, college = indexed_db
+    hotel = ENTITIES_BY_NAME["courses"].document(
+        Course(id=999, name="Hotel Management", slug="hotel", college_id=college.id, is_active=True)
+    )
+
+    def commit_elsewhere(orm_execute_state):
+        # Another thread commits while the build is reading rows.
+        if not applied:
+            applied.append(1)
+            search_index.apply({hotel.key: hotel})
+
+    applied = []
+    event.listen(db, "do_orm_execute", commit_elsewhere)
+    try:
+        search_index.build(db)
+    finally:
+        event.remove(db, "do_orm_execute", commit_elsewhere)
+
+    assert [h["id"] for h in search_index.search(db, "hotel")] == [999]
+
+
+def test_suggest_prefixes_rank_title_starts_first(indexed_db):
+    db, college = indexed_db
+    suggest_index.build(db)
+
+    labels = [s["label"] for s in suggest_index.suggest("eng")]
+    assert labels[:2] == ["Engineering Admissions", "IPS Engineering College"]
+    assert "B.Tech Civil Engineering" in labels
+    assert [s["label"] for s in suggest_index.suggest("btech")] == ["B.Tech Civil Engineering"]
+    assert [s["label"] for s in suggest_index.suggest("meh", types=["faculty"])] == ["Dr. Mehta"]
+    assert suggest_index.suggest("meh", types=["courses"]) == []
+    assert suggest_index.suggest("old") == []
+    assert suggest_index.suggest("  ") == []
+
+    course = Course(name="Engineering Physics", slug="physics", college_id=college.id)
+    db.add(course)
+    db.commit()
+    assert suggest_index.suggest("engineering p")[0]["id"] == course.id
+
+    db.delete(course)
+    db.commit()
+    assert suggest_index.suggest("engineering p") == []
+
+
+def test_suggest_route_and_slug_route_do_not_collide(indexed_db):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    db, _ = indexed_db
+    suggest_index.build(db)
+    response = TestClient(app).get("/api/v1/search/suggest", params={"query": "mba"})
+
+    assert response.status_code == 200
+    assert [s["label"] for s in response.json()["data"]] == ["MBA"]
+
+
+def test_search_results_cache_coalesces_and_invalidates():
+    cache = SearchResultCache(maxsize=8, ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [{"type": "courses", "id": len(calls)}]
+
+    async def burst():
+        key = cache.key(" M.B.A. ", ["courses"])
+        assert key == cache.key("mba", ["courses"])
+        return await asyncio.gather(*(cache.get_or_compute(key, compute) for _ in range(20)))
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert cache.stats()["coalesced"] == 19
+
+    asyncio.run(burst())
+    assert len(calls) == 1
+
+    cache.apply({("courses", 1): None})
+    asyncio.run(burst())
+    assert len(calls) == 2
+
+
+def test_search_results_cache_does_not_store_failures():
+    cache = SearchResultCache(maxsize=8, ttl=60)
+
+    async def fail():
+        raise RuntimeError("database unavailable")
+
+    async def ok():
+        return []
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_compute(cache.key("hostel"), fail))
+    assert asyncio.run(cache.get_or_compute(cache.key("hostel"), ok)) == []
+
+
+def test_search_results_cache_survives_cancelled_leader():
+    cache = SearchResultCache(maxsize=8, ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [{"type": "courses", "id": len(calls)}]
+
+    async def burst():
+        key = cache.key("mba")
+        leader = asyncio.ensure_future(cache.get_or_compute(key, compute))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(cache.get_or_compute(key, compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        assert leader.cancelled()
+        return results
+
+    results = asyncio.run(burst())
+    # One waiter reran the search; the others shared its result.
+    assert len(calls) == 2
+    assert all(r == [{"type": "courses", "id": 2}] for r in results)
+    assert cache.stats()["in_flight"] == 0
@@ -0,0 +1,96 @@
+from sqlalchemy import insert
+
+from app.models.college import College
+from app.schemas.schema import Page, PageSection, SharedSection, SharedSectionItem, page_shared_sections
+from app.services.page_assembly import (
+    get_page_payload,
+    invalidate_shared_sections,
+    load_page,
+    page_cache,
+    sections_with_shared,
+    shared_section_cache,
+)
+
+
+def _seed(db):
+    college = College(name="Shared", slug="shared")
+    db.add(college)
+    db.flush()
+    pages = []
+    for slug in ("home", "about"):
+        page = Page(title=slug.title(), slug=slug, college_id=college.id)
+        db.add(page)
+        db.flush()
+        for n in (0, 2):
+            db.add(PageSection(page_id=page.id, section_type="TEXT", section_title=f"{slug} {n}", sort_order=n))
+        pages.append(page.id)
+
+    carousel = SharedSection(section_type="CARDS", section_title="Carousel", sort_order=1)
+    footer = SharedSection(section_type="TEXT", section_title="Footer", sort_order=9)
+    hidden = SharedSection(section_type="TEXT", section_title="Hidden", sort_order=0, is_active=False)
+    db.add_all([carousel, footer, hidden])
+    db.flush()
+    db.add(SharedSectionItem(shared_section_id=carousel.id, title="Slide", sort_order=0))
+    links = []
+    for page_id in pages:
+        links += [
+            {"page_id": page_id, "shared_section_id": carousel.id, "sort_order": 0},
+            {"page_id": page_id, "shared_section_id": footer.id, "sort_order": 0},
+            {"page_id": page_id, "shared_section_id": hidden.id, "sort_order": 0},
+        ]
+    db.execute(insert(page_shared_sections), links)
+    db.commit()
+    return pages, carousel.id
+
+
+def _titles(payload):
+    return [s["title"] for s in payload["data"]["sections"]]
+
+
+def test_shared_sections_merged_by_sort_order(make_session):
+    engine, db = make_session()
+    try:
+        (home_id, _), _ = _seed(db)
+        page_cache.clear()
+        shared_section_cache.clear()
+
+        payload = get_page_payload(db, home_id)
+        assert _titles(payload) == ["home 0", "Carousel", "home 2", "Footer"]
+        carousel = payload["data"]["sections"][1]
+        assert carousel["shared"] is True
+        assert [i["title"] for i in carousel["items"]] == ["Slide"]
+
+        page = load_page(db, home_id)
+        assert [s.section_title for s in sections_with_shared(db, page)] == _titles(payload)
+    finally:
+        page_cache.clear()
+        shared_section_cache.clear()
+
+
+def test_shared_section_cached_once_and_invalidated_alone(make_session, count_queries):
+    engine, db = make_session()
+    try:
+        (home_id, about_id), carousel_id = _seed(db)
+        page_cache.clear()
+        shared_section_cache.clear()
+
+        get_page_payload(db, home_id)
+        # The second page only loads itself; its shared sections are cached.
+        _, about_count = count_queries(engine, lambda: get_page_payload(db, about_id))
+        _, warm_count = count_queries(engine, lambda: get_page_payload(db, about_id))
+        assert about_count == 4
+        assert warm_count == 0
+
+        section = db.get(SharedSection, carousel_id)
+        section.section_title = "Edited carousel"
+        db.commit()
+        invalidate_shared_sections(carousel_id)
+
+        assert page_cache.get(home_id) is not None
+        payload, count = count_queries(engine, lambda: get_page_payload(db, home_id))
+        assert count == 2  # the shared section and its items, not the page
+        assert _titles(payload)[1] == "Edited carousel"
+        assert _titles(get_page_payload(db, about_id))[1] == "Edited carousel"
+    finally:
+        page_cache.clear()
+        shared_section_cache.clear()
@@ -0,0 +1,56 @@
+import json
+import tempfile
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+from starlette.testclient import TestClient
+
+from app.models.college import College
+from app.schemas.schema import Page, PageSection
+from app.services.page_assembly import get_page_payload, page_cache, shared_section_cache
+from app.services.static_publisher import publish_site
+
+
+def test_publish_writes_release_and_swaps_current(make_session, seed_page):
+    engine, db = make_session()
+    try:
+        page_id = seed_page(db, 2)
+        parent = db.get(Page, page_id).college
+        child = College(name="Child", slug="child", parent_id=parent.id)
+        db.add(child)
+        db.get(Page, page_id).is_inheritable = True
+        db.commit()
+        page_cache.clear()
+        shared_section_cache.clear()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            first = publish_site(db, root, keep=1)
+            current = root / "current"
+            assert current.resolve() == Path(first["release"]).resolve()
+
+            payload = json.loads((current / f"api/v1/pages/{page_id}.json").read_text())
+            assert payload == get_page_payload(db, page_id)
+            # The child college serves the inherited page under its own slug.
+            inherited = json.loads((current / "api/v1/child/home.json").read_text())
+            assert inherited["data"]["page"]["id"] == page_id
+            assert "Section 1" in (current / "child/home/index.html").read_text()
+            assert "Section 0" in (current / "index.html").read_text()
+
+            app = Starlette(routes=[Mount("/site", StaticFiles(directory=str(current), html=True))])
+            client = TestClient(app)
+            assert client.get("/site/college-2/home/").status_code == 200
+
+            db.query(PageSection).filter(PageSection.sort_order == 0).update({"section_title": "Republished"})
+            db.commit()
+            second = publish_site(db, root, keep=1)
+
+            # The swap is visible through the same mount; old releases are pruned.
+            assert "Republished" in client.get("/site/college-2/home/").text
+            assert not Path(first["release"]).exists()
+            assert [p.name for p in (root / "releases").iterdir()] == [Path(second["release"]).name]
+    finally:
+        page_cache.clear()
+        shared_section_cache.clear()
@@ -0,0 +1,30 @@
+from jinja2 import FileSystemBytecodeCache
+
+from app.api.v1 import admin, admin_examples, public
+from app.core import templates as templates_module
+from app.core.templates import TEMPLATES_DIR, template_env, templates, warm_templates
+
+
+def test_routers_share_one_template_environment():
+    assert admin.templates is public.templates is admin_examples.templates is templates
+    assert templates.env is template_env
+    assert template_env.bytecode_cache is not None
+
+
+def test_warm_templates_compiles_admin_ui():
+    admin_templates = sorted(p.name for p in (TEMPLATES_DIR / "admin").glob("*.html"))
+    template_env.cache.clear()
+
+    assert warm_templates(("admin/*.html",)) == len(admin_templates)
+    cached = {name for _, name in template_env.cache.keys()}
+    assert {f"admin/{name}" for name in admin_templates} <= cached
+
+
+def test_unusable_bytecode_cache_dir_falls_back(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(templates_module.settings, "TEMPLATE_BYTECODE_CACHE_DIR", str(blocker / "cache"))
+
+    cache = templates_module._bytecode_cache()
+    assert isinstance(cache, FileSystemBytecodeCache)
+    assert cache.directory != str(blocker / "cache")
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import update
+
+from app.models.college import College
+from app.schemas.schema import Page
+from app.services.tree_paths import rebuild_paths, subtree_clause
+from app.utils.college_context import get_college_pages
+
+
+def _paths(db, model=College):
+    db.expire_all()
+    return {row.slug: row.path for row in db.query(model.slug, model.path)}
+
+
+def test_college_paths_follow_inserts_moves_and_deletes(make_session):
+    engine, db = make_session()
+    university = College(name="University", slug="university")
+    other = College(name="Other", slug="other")
+    db.add_all([university, other])
+    db.flush()
+    engineering = College(name="Engineering", slug="engineering", parent_id=university.id)
+    db.add(engineering)
+    db.flush()
+    civil = College(name="Civil", slug="civil", parent_id=engineering.id)
+    db.add(civil)
+    db.commit()
+    u, o, e, c = university.id, other.id, engineering.id, civil.id
+    assert _paths(db) == {
+        "university": f"/{u}/", "other": f"/{o}/",
+        "engineering": f"/{u}/{e}/", "civil": f"/{u}/{e}/{c}/",
+    }
+
+    db.get(College, e).parent_id = o
+    db.commit()
+    assert _paths(db)["civil"] == f"/{o}/{e}/{c}/"
+
+    db.get(College, e).parent_id = c
+    with pytest.raises(ValueError):
+        db.flush()
+    db.rollback()
+    assert _paths(db)["engineering"] == f"/{o}/{e}/"
+
+    subtree = db.query(College.slug).filter(subtree_clause(College, f"/{o}/")).order_by(College.id)
+    assert [row.slug for row in subtree] == ["other", "engineering", "civil"]
+
+    db.execute(update(College).where(College.id == e).values(parent_id=None))
+    db.commit()
+    assert _paths(db)["civil"] == f"/{e}/{c}/"
+    assert rebuild_paths(db.connection(), College) == 0
+
+
+def test_page_paths_and_inheritance(make_session):
+    engine, db = make_session()
+    university = College(name="University", slug="university")
+    db.add(university)
+    db.flush()
+    engineering = College(name="Engineering", slug="engineering", parent_id=university.id)
+    db.add(engineering)
+    db.flush()
+    civil = College(name="Civil", slug="civil", parent_id=engineering.id)
+    db.add(civil)
+    db.flush()
+    source = Page(title="Rules", slug="rules", college_id=university.id, is_inheritable=True)
+    db.add_all([
+        source,
+        Page(title="Fees", slug="fees", college_id=university.id, is_inheritable=True),
+        Page(title="Engineering fees", slug="fees", college_id=engineering.id, is_inheritable=True),
+        Page(title="Home", slug="home", college_id=civil.id),
+    ])
+    db.flush()
+    copy = Page(title="Rules", slug="rules", college_id=engineering.id, parent_page_id=source.id)
+    db.add(copy)
+    db.flush()
+    copy_of_copy = Page(title="Rules", slug="rules-copy", college_id=civil.id, parent_page_id=copy.id)
+    db.add(copy_of_copy)
+    db.commit()
+
+    assert copy_of_copy.path == f"/{source.id}/{copy.id}/{copy_of_copy.id}/"
+    derived = db.query(Page.id).filter(subtree_clause(Page, source.path), Page.id != source.id)
+    assert {row.id for row in derived} == {copy.id, copy_of_copy.id}
+
+    pages = get_college_pages(db, civil.id, include_inherited=True)
+    assert [(p.slug, p.title) for p in pages] == [
+        ("home", "Home"), ("rules-copy", "Rules"), ("fees", "Engineering fees"), ("rules", "Rules")
+    ]
+
+    db.delete(db.get(Page, copy.id))
+    db.commit()
+    assert db.get(Page, copy_of_copy.id).path == f"/{copy_of_copy.id}/"
@@ -0,0 +1,60 @@
+import asyncio
+import io
+import tempfile
+from pathlib import Path
+
+import pytest
+from starlette.datastructures import UploadFile
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.services.uploads import (
+    UploadError,
+    UploadLengthRequired,
+    UploadTooLarge,
+    check_upload_size,
+    save_upload,
+    store_file,
+)
+
+
+def test_identical_uploads_share_one_content_addressed_file():
+    with tempfile.TemporaryDirectory() as root:
+        first = store_file(io.BytesIO(b"png bytes"), "Banner.PNG", "hero", root=root)
+        second = store_file(io.BytesIO(b"png bytes"), "other.png", "hero", root=root)
+        other = store_file(io.BytesIO(b"other bytes"), "banner.png", "hero", root=root)
+
+        assert first == second != other
+        assert first.startswith("hero/") and first.endswith(".png")
+        assert sorted(p.name for p in (Path(root) / "hero").iterdir()) == sorted({Path(first).name, Path(other).name})
+
+
+def test_upload_limits_leave_no_partial_files():
+    with tempfile.TemporaryDirectory() as root:
+        with pytest.raises(UploadTooLarge):
+            store_file(io.BytesIO(b"x" * 5000), "big.jpg", "items", max_bytes=4096, root=root)
+        with pytest.raises(UploadError):
+            store_file(io.BytesIO(b"#!/bin/sh"), "script.sh", "items", root=root)
+        assert list((Path(root) / "items").iterdir()) == []
+
+
+def test_save_upload_returns_public_url(monkeypatch):
+    with tempfile.TemporaryDirectory() as root:
+        monkeypatch.setattr(settings, "UPLOAD_DIR", root)
+        upload = UploadFile(io.BytesIO(b"gif bytes"), filename="slide.gif")
+
+        url = asyncio.run(save_upload(upload, "items"))
+
+        assert url.startswith("/static/uploads/items/") and url.endswith(".gif")
+        assert (Path(root) / url.removeprefix("/static/uploads/")).read_bytes() == b"gif bytes"
+
+
+def test_upload_requests_must_declare_a_fitting_size():
+    def request(headers):
+        return Request({"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers.items()]})
+
+    check_upload_size(request({"content-length": "1024"}), max_bytes=4096)
+    with pytest.raises(UploadTooLarge):
+        check_upload_size(request({"content-length": str(10 * 1024 * 1024)}), max_bytes=4096)
+    with pytest.raises(UploadLengthRequired):
+        check_upload_size(request({"transfer-encoding": "chunked"}), max_bytes=4096)
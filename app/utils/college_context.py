@@ -4,7 +4,9 @@ Handles college selection, filtering, and hierarchy management.
 """
 from sqlalchemy.orm import Session
 from app.models.college import College
-from app.schemas.schema import Page, Course, Faculty, Placement, Activity, Facility, Admission, Application, Enquiry, MenuItem
+from app.schemas.schema import EffectivePage, Page, Course, Faculty, Placement, Activity, Facility, Admission, Application, Enquiry, MenuItem
+from app.services.college_cache import college_directory
+from app.services.provisioning import standard_pages
 
 
 def get_college_hierarchy(db: Session, college_id: int = None):
@@ -25,24 +27,19 @@ def get_child_colleges(db: Session, college_id: int):
 
 def get_root_college(db: Session, college_id: int):
     """Get the root/parent college in hierarchy."""
-    college = db.query(College).filter(College.id == college_id).first()
-    if not college:
+    root_id = college_directory.root_id(db, college_id)
+    if root_id is None:
         return None
-    if college.parent_id:
-        return get_root_college(db, college.parent_id)
-    return college
+    return db.get(College, root_id)
 
 
 def get_all_colleges_in_hierarchy(db: Session, college_id: int):
-    """Get college and all its descendants."""
-    result = []
-    college = db.query(College).filter(College.id == college_id).first()
-    if college:
-        result.append(college)
-        children = db.query(College).filter(College.parent_id == college_id).all()
-        for child in children:
-            result.extend(get_all_colleges_in_hierarchy(db, child.id))
-    return result
+    """Get college and all its descendants (depth first)."""
+    ids = college_directory.descendant_ids(db, college_id)
+    if not ids:
+        return []
+    by_id = {c.id: c for c in db.query(College).filter(College.id.in_(ids))}
+    return [by_id[i] for i in ids if i in by_id]
 
 
 # ========== COLLEGE-SCOPED QUERIES ==========
@@ -50,21 +47,18 @@ def get_all_colleges_in_hierarchy(db: Session, college_id: int):
 def get_college_pages(db: Session, college_id: int, include_inherited: bool = False):
     """
     Get pages for a specific college.
-    If include_inherited=True, also get pages inherited from parent colleges.
+    If include_inherited=True, return the college's effective page set from
+    the precomputed snapshot: its own pages plus inheritable pages of ancestor
+    colleges, nearer colleges winning when slugs collide.
     """
-    pages = db.query(Page).filter(Page.college_id == college_id, Page.is_active == True).all()
-    
     if include_inherited:
-        college = db.query(College).filter(College.id == college_id).first()
-        if college and college.parent_id:
-            parent_pages = db.query(Page).filter(
-                Page.college_id == college.parent_id,
-                Page.is_inheritable == True,
-                Page.is_active == True
-            ).all()
-            pages.extend(parent_pages)
-    
-    return pages
+        return db.query(Page).join(
+            EffectivePage, EffectivePage.page_id == Page.id
+        ).filter(
+            EffectivePage.college_id == college_id
+        ).order_by(EffectivePage.depth, Page.id).all()
+
+    return db.query(Page).filter(Page.college_id == college_id, Page.is_active == True).all()
 
 
 def get_college_courses(db: Session, college_id: int):
@@ -166,25 +160,21 @@ def inherit_page(db: Session, parent_page_id: int, child_college_id: int):
 def create_standard_pages_for_college(db: Session, college_id: int, college_name: str):
     """
     Create standard page structure for a new college.
+    Existing pages are found with one query; see app.services.provisioning
+    for onboarding many colleges at once.
     """
-    standard_pages = [
-        {"slug": "home", "title": f"{college_name} - Home", "page_type": "HOME", "template_type": "HERO_SECTION"},
-        {"slug": "about", "title": f"About {college_name}", "page_type": "ABOUT", "template_type": "BLANK"},
-        {"slug": "courses", "title": f"Programs at {college_name}", "page_type": "COURSES", "template_type": "COURSES_LIST"},
-        {"slug": "faculty", "title": f"Faculty - {college_name}", "page_type": "FACULTY", "template_type": "FACULTY_LIST"},
-        {"slug": "placements", "title": f"Placements - {college_name}", "page_type": "PLACEMENTS", "template_type": "PLACEMENTS"},
-        {"slug": "facilities", "title": f"Facilities - {college_name}", "page_type": "FACILITIES", "template_type": "FACILITIES_LIST"},
-        {"slug": "admissions", "title": f"Admissions - {college_name}", "page_type": "ADMISSIONS", "template_type": "BLANK"},
-        {"slug": "contact", "title": f"Contact {college_name}", "page_type": "CONTACT", "template_type": "BLANK"},
-    ]
+    standard = standard_pages(college_name)
+    existing = {
+        page.slug: page
+        for page in db.query(Page).filter(
+            Page.college_id == college_id,
+            Page.slug.in_([page_data["slug"] for page_data in standard])
+        )
+    }
     
     created_pages = []
-    for page_data in standard_pages:
-        page = db.query(Page).filter(
-            Page.college_id == college_id,
-            Page.slug == page_data["slug"]
-        ).first()
-        
+    for page_data in standard:
+        page = existing.get(page_data["slug"])
         if not page:
             page = Page(college_id=college_id, is_active=True, **page_data)
             db.add(page)
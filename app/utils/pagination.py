@@ -0,0 +1,116 @@
+"""
+Keyset (cursor) pagination for public list endpoints.
+
+Each list orders by a fixed tuple of sort keys ending in the primary key,
+so the order is total and stable. The cursor is an opaque URL-safe token
+holding the sort key values of the last row returned; the next page is the
+rows strictly after it, which the database can read from an index instead
+of scanning and discarding OFFSET rows.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import and_, false, or_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    One column of a keyset ordering.
+
+    `attribute` names the mapped attribute read from result rows. Nullable
+    columns set `nulls_last`: rows without a value follow all others, by an
+    explicit `column IS NULL` branch rather than a substitute value, so the
+    ORDER BY and the comparison stay on the raw column an index can serve.
+    """
+    column: Any
+    attribute: str
+    descending: bool = False
+    nulls_last: bool = False
+
+    def order_by(self):
+        order = [self.column.desc() if self.descending else self.column.asc()]
+        if self.nulls_last:
+            order.insert(0, self.column.is_(None).asc())
+        return order
+
+    def equal(self, value):
+        return self.column.is_(None) if value is None else self.column == value
+
+    def beyond(self, value):
+        """Rows strictly after `value` in this key's order."""
+        if value is None:
+            return false()  # NULLs come last
+        beyond = self.column < value if self.descending else self.column > value
+        return or_(beyond, self.column.is_(None)) if self.nulls_last else beyond
+
+    def value(self, row):
+        return getattr(row, self.attribute)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int):
+    """Decode a cursor produced by `encode_cursor`; 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor does not match this listing")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(keys, values):
+    # (k1, k2, ...) > (v1, v2, ...) in the listing's order, expanded so that
+    # mixed ASC/DESC keys work on every backend.
+    clauses = []
+    for n, key in enumerate(keys):
+        equal = [keys[m].equal(values[m]) for m in range(n)]
+        clauses.append(and_(*equal, key.beyond(values[n])))
+    return or_(*clauses)
+
+
+def paginate(query, keys, cursor: str = None, limit: int = DEFAULT_LIMIT):
+    """
+    Apply keyset ordering, the cursor position and LIMIT to a Query or
+    select(). One extra row is fetched so `page_results` can tell whether
+    another page exists.
+    """
+    if cursor:
+        query = query.filter(_after(keys, decode_cursor(cursor, len(keys))))
+    order = [clause for k in keys for clause in k.order_by()]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def page_results(rows, keys, limit: int):
+    """Split the fetched rows into (page, next_cursor)."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([k.value(rows[-1]) for k in keys])
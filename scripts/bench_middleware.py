@@ -0,0 +1,89 @@
+"""Throughput benchmark for the request middleware stack.
+
+Runs the full FastAPI app in-process against a throwaway SQLite database and
+reports requests/second for a few representative endpoints:
+
+    python scripts/bench_middleware.py [--requests 2000] [--concurrency 20]
+
+APP_NAME / ENV / DATABASE_URL still have to be set (any values work; the
+database URL is replaced by a temporary SQLite file).
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path so `import app` works when running this script directly
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx
+from sqlalchemy import create_engine
+
+from app.core.database import Base, SessionLocal
+from app.models.college import College
+from app.schemas.schema import Page, PageSection, SectionItem
+from app.services import derived_tables
+
+
+def setup_database(path: str) -> int:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    SessionLocal.configure(bind=engine)
+    derived_tables.register()
+
+    db = SessionLocal()
+    try:
+        for n in range(10):
+            db.add(College(name=f"College {n}", slug=f"college-{n}", subdomain=f"college{n}"))
+        db.commit()
+        page = Page(title="Home", slug="home", college_id=1)
+        db.add(page)
+        db.commit()
+        for n in range(15):
+            section = PageSection(page_id=page.id, section_type="CARDS", section_title=f"Section {n}", sort_order=n)
+            db.add(section)
+            db.commit()
+            for m in range(4):
+                db.add(SectionItem(section_id=section.id, title=f"Item {m}", sort_order=m))
+        db.commit()
+        return page.id
+    finally:
+        db.close()
+
+
+async def run(path: str, total: int, concurrency: int) -> float:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://college1.ipsacademy.test") as client:
+        await client.get(path)  # warm caches / lazy imports
+        queue = iter(range(total))
+
+        async def worker():
+            for _ in queue:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        page_id = setup_database(str(Path(tmp) / "bench.db"))
+        for path in ("/health", "/api/v1/colleges", f"/api/v1/pages/{page_id}"):
+            rps = asyncio.run(run(path, args.requests, args.concurrency))
+            print(f"{path:<24} {rps:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
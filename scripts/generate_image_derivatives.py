@@ -0,0 +1,43 @@
+"""Generate responsive derivatives for every stored upload that lacks them.
+
+New uploads are processed automatically; run this after importing images
+or changing IMAGE_DERIVATIVE_WIDTHS / IMAGE_DERIVATIVE_FORMATS (delete
+<UPLOAD_DIR>/derived first to regenerate existing ones):
+
+    python scripts/generate_image_derivatives.py
+"""
+import sys
+import time
+from concurrent.futures import as_completed
+from pathlib import Path
+
+# Ensure project root is on sys.path so `import app` works when running this script directly
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.config import settings
+from app.services.image_derivatives import DERIVED_DIR, derivative_pool, derivatives_available
+
+
+def generate():
+    if not derivatives_available():
+        sys.exit("Pillow is not installed; pip install Pillow")
+    root = Path(settings.UPLOAD_DIR)
+    start = time.perf_counter()
+    futures = []
+    for path in sorted(root.glob("*/*")):
+        relative = path.relative_to(root).as_posix()
+        if path.is_file() and not relative.startswith(f"{DERIVED_DIR}/") and not path.name.startswith("."):
+            future = derivative_pool.submit(relative)
+            if future is not None:
+                futures.append(future)
+    failed = 0
+    for future in as_completed(futures):
+        if future.exception() is not None:
+            failed += 1
+    derivative_pool.shutdown()
+    print(f"Processed {len(futures)} images ({failed} failed) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    generate()
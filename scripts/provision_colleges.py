@@ -0,0 +1,53 @@
+"""Onboard a batch of colleges with their standard pages.
+
+Reads a CSV file (header row with name, slug and optionally subdomain,
+short_description, logo_url, theme_primary_color, theme_secondary_color,
+is_active, parent_slug) or a JSON list of objects with the same keys:
+
+    python scripts/provision_colleges.py colleges.csv [--batch-size 200]
+
+Existing colleges (matched by slug) only get their missing standard pages.
+Prints row counts and throughput.
+"""
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path so `import app` works when running this script directly
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.database import SessionLocal
+from app.services import derived_tables
+from app.services.provisioning import DEFAULT_BATCH_SIZE, parse_college_specs, provision_colleges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="CSV or JSON file describing the colleges")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    text = args.path.read_text(encoding="utf-8")
+    if args.path.suffix.lower() == ".json":
+        specs = parse_college_specs(json.loads(text))
+    else:
+        specs = parse_college_specs(csv.DictReader(text.splitlines()))
+
+    derived_tables.register()
+    db = SessionLocal()
+    try:
+        report = provision_colleges(db, specs, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(
+        f"Colleges: {report['colleges']} created, {report['colleges_existing']} existing; "
+        f"pages: {report['pages']}, sections: {report['sections']}, SEO rows: {report['seo']}"
+    )
+    print(f"{report['rows']} rows in {report['seconds']:.2f}s ({report['rows_per_second']} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Pre-render the public site into STATIC_PUBLISH_DIR (or the given directory).
+
+Writes a new release and atomically switches `current` to it; use from cron
+or a deploy step, or point nginx/a CDN origin at `<dir>/current`:
+
+    python scripts/publish_static.py [output_dir]
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path so `import app` works when running this script directly
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.static_publisher import publish_site
+
+
+def publish(root=None):
+    root = root or settings.STATIC_PUBLISH_DIR
+    if not root:
+        sys.exit("Set STATIC_PUBLISH_DIR or pass an output directory")
+    db = SessionLocal()
+    try:
+        report = publish_site(db, root)
+        print(f"Published {report['pages']} pages ({report['files']} files) to {report['release']} in {report['seconds']:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    publish(sys.argv[1] if len(sys.argv) > 1 else None)
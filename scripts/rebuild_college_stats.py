@@ -0,0 +1,31 @@
+"""Rebuild the materialized college_stats table from scratch.
+
+The table is kept current on every ORM write; run this after raw SQL
+imports or other changes made outside the application:
+
+    python scripts/rebuild_college_stats.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path so `import app` works when running this script directly
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.database import SessionLocal
+from app.services.college_stats import rebuild_college_stats
+
+
+def rebuild():
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        rows = rebuild_college_stats(db)
+        print(f"Rebuilt college_stats: {rows} colleges in {time.perf_counter() - start:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild()
@@ -0,0 +1,31 @@
+"""Rebuild the effective_pages inheritance snapshot from scratch.
+
+The snapshot is kept current on every ORM write; run this after raw SQL
+imports or other changes made outside the application:
+
+    python scripts/rebuild_effective_pages.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path so `import app` works when running this script directly
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.database import SessionLocal
+from app.services.effective_pages import rebuild_effective_pages
+
+
+def rebuild():
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        rows = rebuild_effective_pages(db)
+        print(f"Rebuilt effective_pages: {rows} rows in {time.perf_counter() - start:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild()